@@ -1,6 +1,11 @@
+import base64
+import json
+
+from django.db.models import Q
 from rest_framework.pagination import PageNumberPagination
 from rest_framework.response import Response
-from rest_framework.exceptions import NotFound
+from rest_framework.exceptions import NotFound, ValidationError
+from rest_framework.utils.urls import replace_query_param
 
 class DefaultPagination(PageNumberPagination):
     page_size = 10
@@ -42,4 +47,126 @@ class DefaultPagination(PageNumberPagination):
             'has_previous': self.page.has_previous(),
             'next_page': self.get_next_link(),
             'previous_page': self.get_previous_link(),
-        }
\ No newline at end of file
+        }
+
+class KeysetPagination(DefaultPagination):
+    cursor_query_param = 'cursor'
+    ordering_query_param = 'ordering'
+    keyset_field = '-date'
+    invalid_cursor_message = 'Invalid cursor'
+
+    def paginate_queryset(self, queryset, request, view=None):
+        if self.cursor_query_param not in request.query_params:
+            self.keyset = False
+            return super().paginate_queryset(queryset, request, view)
+
+        self.keyset = True
+        self.request = request
+        self.page_size_value = self.get_page_size(request)
+        self.field, self.descending = self.get_keyset_ordering(request, view)
+        self.nullable = queryset.model._meta.get_field(self.field).null
+
+        position = self.decode_cursor(request, queryset.model)
+        results = []
+        for segment in self.keyset_segments(queryset, position):
+            results.extend(segment[:self.page_size_value + 1 - len(results)])
+            if len(results) > self.page_size_value:
+                break
+
+        self.has_next = len(results) > self.page_size_value
+        results = results[:self.page_size_value]
+        self.next_cursor = self.encode_cursor(results[-1]) if self.has_next else None
+        self.has_previous = position is not None
+        return results
+
+    def get_keyset_ordering(self, request, view):
+        name = getattr(view, 'keyset_field', self.keyset_field)
+        field, descending = name.lstrip('-'), name.startswith('-')
+        requested = request.query_params.get(self.ordering_query_param)
+        if requested:
+            if requested.lstrip('-') != field:
+                raise ValidationError({
+                    self.ordering_query_param: [f"Cursor pagination only supports ordering by '{field}' or '-{field}'"]
+                })
+            descending = requested.startswith('-')
+        return field, descending
+
+    def keyset_segments(self, queryset, position):
+        field = self.field
+        queryset = queryset.order_by(f'-{field}' if self.descending else field, '-pk' if self.descending else 'pk')
+        if position is None:
+            return [queryset]
+
+        value, pk = position
+        after_pk = Q(pk__lt=pk) if self.descending else Q(pk__gt=pk)
+        nulls = queryset.filter(**{f'{field}__isnull': True})
+        if value is None:
+            segments = [nulls.filter(after_pk)]
+            if not self.descending:
+                segments.append(queryset.filter(**{f'{field}__isnull': False}))
+            return segments
+
+        bound, strict = ('lte', 'lt') if self.descending else ('gte', 'gt')
+        seek = queryset.filter(
+            Q(**{f'{field}__{bound}': value}),
+            Q(**{f'{field}__{strict}': value}) | (Q(**{field: value}) & after_pk),
+        )
+        if self.descending and self.nullable:
+            return [seek, nulls]
+        return [seek]
+
+    def encode_cursor(self, instance):
+        value = getattr(instance, self.field)
+        if hasattr(value, 'isoformat'):
+            value = value.isoformat()
+        raw = json.dumps([value, instance.pk], separators=(',', ':')).encode()
+        return base64.urlsafe_b64encode(raw).decode().rstrip('=')
+
+    def decode_cursor(self, request, model):
+        encoded = request.query_params.get(self.cursor_query_param)
+        if not encoded:
+            return None
+        try:
+            raw = base64.urlsafe_b64decode(encoded + '=' * (-len(encoded) % 4))
+            value, pk = json.loads(raw)
+            if value is not None:
+                value = model._meta.get_field(self.field).to_python(value)
+            return value, int(pk)
+        except Exception:
+            raise NotFound(self.invalid_cursor_message)
+
+    def get_next_link(self):
+        if not self.keyset:
+            return super().get_next_link()
+        if not self.has_next:
+            return None
+        return replace_query_param(self.request.build_absolute_uri(), self.cursor_query_param, self.next_cursor)
+
+    def get_previous_link(self):
+        if not self.keyset:
+            return super().get_previous_link()
+        if not self.has_previous:
+            return None
+        return replace_query_param(self.request.build_absolute_uri(), self.cursor_query_param, '')
+
+    def get_paginated_response(self, data):
+        if not self.keyset:
+            return super().get_paginated_response(data)
+        return Response({
+            'result_count': len(data),
+            'next_page': self.get_next_link(),
+            'next_cursor': self.next_cursor,
+            'has_next': self.has_next,
+            'has_previous': self.has_previous,
+            'results': data,
+        })
+
+    def get_page_metadata(self):
+        if not self.keyset:
+            return super().get_page_metadata()
+        return {
+            'has_next': self.has_next,
+            'has_previous': self.has_previous,
+            'next_page': self.get_next_link(),
+            'next_cursor': self.next_cursor,
+        }
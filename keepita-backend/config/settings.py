@@ -81,6 +81,9 @@ DATABASES = {
     'default': {
         'ENGINE': 'django.db.backends.sqlite3',
         'NAME': BASE_DIR / 'db.sqlite3',
+        'OPTIONS': {
+            'timeout': int(os.environ.get('SQLITE_TIMEOUT', 30)),
+        },
     }
 }
 
@@ -207,9 +210,40 @@ LOGGING = {
 }
 
 BACKUP_EXTRACT_PATH = BASE_DIR / 'temp' / 'extracted_backups'
+BACKUP_EXTRACTOR_WORKERS = int(os.environ.get('BACKUP_EXTRACTOR_WORKERS', 4))
+BACKUP_SELECTIVE_EXTRACTION = os.environ.get('BACKUP_SELECTIVE_EXTRACTION', 'True').lower() == 'true'
+BACKUP_EXTRACT_CHUNK_SIZE = int(os.environ.get('BACKUP_EXTRACT_CHUNK_SIZE', 1024 * 1024))
+UPLOAD_PIPELINE_WORKERS = int(os.environ.get('UPLOAD_PIPELINE_WORKERS', 4))
+BACKUP_FILE_INDEX_PERSIST = os.environ.get('BACKUP_FILE_INDEX_PERSIST', 'False').lower() == 'true'
+PROGRESS_FLUSH_INTERVAL = float(os.environ.get('PROGRESS_FLUSH_INTERVAL', 2.0))
+PROGRESS_STREAM_POLL_INTERVAL = float(os.environ.get('PROGRESS_STREAM_POLL_INTERVAL', 1.0))
+PROGRESS_STREAM_HEARTBEAT = float(os.environ.get('PROGRESS_STREAM_HEARTBEAT', 15.0))
+PROGRESS_STREAM_TIMEOUT = int(os.environ.get('PROGRESS_STREAM_TIMEOUT', 300))
+PROGRESS_STREAM_DB_POLL_INTERVAL = float(os.environ.get('PROGRESS_STREAM_DB_POLL_INTERVAL', 3.0))
+IOS_SELECTIVE_DECRYPTION = os.environ.get('IOS_SELECTIVE_DECRYPTION', 'True').lower() == 'true'
+IOS_DECRYPT_MEDIA = os.environ.get('IOS_DECRYPT_MEDIA', 'True').lower() == 'true'
+IOS_DECRYPT_WORKERS = int(os.environ.get('IOS_DECRYPT_WORKERS', os.cpu_count() or 1))
+IOS_SQLITE_SNIFF_WORKERS = int(os.environ.get('IOS_SQLITE_SNIFF_WORKERS', 16))
+
+INGEST_JOB_LEASE_SECONDS = int(os.environ.get('INGEST_JOB_LEASE_SECONDS', 300))
+INGEST_JOB_HEARTBEAT_SECONDS = int(os.environ.get('INGEST_JOB_HEARTBEAT_SECONDS', 30))
+INGEST_JOB_MAX_ATTEMPTS = int(os.environ.get('INGEST_JOB_MAX_ATTEMPTS', 3))
+INGEST_WORKERS = int(os.environ.get('INGEST_WORKERS', 1))
+INGEST_WORKER_POLL_SECONDS = float(os.environ.get('INGEST_WORKER_POLL_SECONDS', 2))
+INGEST_MEMORY_BUDGET_BYTES = int(os.environ.get('INGEST_MEMORY_BUDGET_BYTES', 512 * 1024 * 1024))
+INGEST_MEMORY_WAIT_TIMEOUT = float(os.environ.get('INGEST_MEMORY_WAIT_TIMEOUT', 30))
+INGEST_RECORD_ESTIMATE_BYTES = int(os.environ.get('INGEST_RECORD_ESTIMATE_BYTES', 2048))
 
 MAIN_SERVER_URL = os.environ.get('MAIN_SERVER_URL', 'http://localhost:8000')
 MAIN_SERVER_API_KEY = os.environ.get('MAIN_SERVER_API_KEY', '')
+MAIN_SERVER_MAX_CONCURRENCY = int(os.environ.get('MAIN_SERVER_MAX_CONCURRENCY', 8))
+SELF_HOSTED_CALLBACK_URL = os.environ.get('SELF_HOSTED_CALLBACK_URL', '')
+
+TASK_WATCH_TIMEOUT = int(os.environ.get('TASK_WATCH_TIMEOUT', 600))
+TASK_WATCH_INITIAL_INTERVAL = float(os.environ.get('TASK_WATCH_INITIAL_INTERVAL', 0.5))
+TASK_WATCH_MAX_INTERVAL = float(os.environ.get('TASK_WATCH_MAX_INTERVAL', 10))
+TASK_WATCH_BACKOFF = float(os.environ.get('TASK_WATCH_BACKOFF', 1.6))
+TASK_WATCH_CALLBACK_CHECK_INTERVAL = float(os.environ.get('TASK_WATCH_CALLBACK_CHECK_INTERVAL', 1))
 
 REST_FRAMEWORK = {
     'DEFAULT_AUTHENTICATION_CLASSES': [
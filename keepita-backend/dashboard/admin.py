@@ -242,6 +242,24 @@ class BackupLogAdmin(admin.ModelAdmin):
         return obj.timestamp.strftime('%Y-%m-%d %H:%M:%S')
     timestamp.short_description = 'Timestamp'
 
+@admin.register(models.IngestJob)
+class IngestJobAdmin(admin.ModelAdmin):
+    list_display = ('id', 'backup', 'status', 'attempts', 'worker_id', 'heartbeat_at', 'created_at')
+    list_filter = ('status', 'created_at')
+    readonly_fields = ('id', 'created_at', 'updated_at', 'heartbeat_at', 'lease_expires_at', 'last_error')
+
+@admin.register(models.Blob)
+class BlobAdmin(admin.ModelAdmin):
+    list_display = ('sha256', 'file', 'size', 'ref_count', 'created_at')
+    search_fields = ('sha256', 'file')
+    readonly_fields = ('sha256', 'file', 'size', 'ref_count', 'created_at')
+
+@admin.register(models.BackupStats)
+class BackupStatsAdmin(admin.ModelAdmin):
+    list_display = ('backup', 'contacts_count', 'messages_count', 'call_logs_count', 'files_count', 'files_bytes', 'updated_at')
+    search_fields = ('backup__name',)
+    readonly_fields = ('updated_at',)
+
 admin.site.register(models.Notification)
 admin.site.register(models.DecryptedFile)
 admin.site.register(models.ClientInstance)
@@ -1,7 +1,7 @@
 from collections import Counter
 from urllib.parse import urlparse
 
-from config.pagination import DefaultPagination
+from config.pagination import DefaultPagination, KeysetPagination
 from django.db.models import Avg, Count, Q, Sum
 from django.shortcuts import get_object_or_404
 from django_filters.rest_framework import DjangoFilterBackend
@@ -72,7 +72,8 @@ class BrowserHistoryViewSet(viewsets.ReadOnlyModelViewSet):
     search_fields = ['title', 'url']
     ordering_fields = ['last_visit_time', 'visit_count', 'title']
     ordering = ['-last_visit_time']
-    pagination_class = DefaultPagination
+    pagination_class = KeysetPagination
+    keyset_field = '-last_visit_time'
 
     def get_queryset(self):
         
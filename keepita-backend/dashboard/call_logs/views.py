@@ -1,4 +1,4 @@
-from config.pagination import DefaultPagination
+from config.pagination import KeysetPagination
 from django.db.models import Avg, Count, Q, Sum
 from django.shortcuts import get_object_or_404
 from django_filters.rest_framework import DjangoFilterBackend
@@ -35,7 +35,8 @@ class CallLogViewSet(viewsets.ReadOnlyModelViewSet):
     search_fields = ['number', 'name']
     ordering_fields = ['created_at', 'date', 'duration', 'type']
     ordering = ['-date']
-    pagination_class = DefaultPagination
+    pagination_class = KeysetPagination
+    keyset_field = '-date'
 
     def get_queryset(self):
         if getattr(self, 'swagger_fake_view', False):
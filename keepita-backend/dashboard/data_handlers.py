@@ -1,27 +1,29 @@
 
+import io
 import logging
-from datetime import datetime
+from datetime import datetime, time
 from typing import Any, Dict, List, Optional
 
-from django.core.files.base import ContentFile
-from django.core.files.storage import default_storage
-from django.db import transaction
 from django.utils.timezone import make_aware, now
 
+from .ingestion import DEFAULT_BATCH_SIZE, BulkIngestor, IngestResult
 from .models import (
     Alarm, ApkList, Backup, BluetoothDevice, BrowserHistory, CalendarEvent, CallLog, ChatThread, 
     Contact, File, HomeScreenItem, HomeScreenLayout, Message, Note, WifiNetwork
 )
+from .utils.blob_store import blob_reference, discard_unreferenced_blobs
 
 logger = logging.getLogger(__name__)
 
 class DataHandler:
     
-    def __init__(self, backup_id: int):
+    def __init__(self, backup_id: int, batch_size: int = DEFAULT_BATCH_SIZE):
         self.backup_id = backup_id
         self.backup = Backup.objects.get(id=backup_id)
+        self.batch_size = batch_size
+        self.results: Dict[str, IngestResult] = {}
         
-        self._contacts_cache = {}
+        self._contacts_cache = None
         
     def _parse_date(self, date_str: str) -> Optional[datetime]:
         if not date_str:
@@ -40,23 +42,30 @@ class DataHandler:
             return ''
         return ''.join(filter(str.isdigit, str(number)))
     
+    def _load_contacts(self) -> Dict[str, Contact]:
+        if self._contacts_cache is None:
+            self._contacts_cache = {}
+            for contact in Contact.objects.filter(backup_id=self.backup_id):
+                normalized = self._normalize_phone(contact.phone_number)
+                if normalized:
+                    self._contacts_cache.setdefault(normalized, contact)
+        return self._contacts_cache
+
     def _get_contact_by_phone(self, phone_number: str) -> Optional[Contact]:
         normalized = self._normalize_phone(phone_number)
         
         if not normalized:
             return None
             
-        if normalized not in self._contacts_cache:
-            try:
-                contact = Contact.objects.filter(
-                    backup_id=self.backup_id,
-                    phone_number=normalized
-                ).first()
-                self._contacts_cache[normalized] = contact
-            except:
-                return None
-                
-        return self._contacts_cache.get(normalized)
+        return self._load_contacts().get(normalized)
+
+    def _ingestor(self, model, key_fields=(), label=None) -> BulkIngestor:
+        return BulkIngestor(model, self.backup_id, key_fields=key_fields, batch_size=self.batch_size, label=label)
+
+    def _finish(self, data_type: str, result: IngestResult) -> int:
+        self.results[data_type] = result
+        logger.info(f"Saved {result} for backup {self.backup_id}")
+        return result.inserted
     
     def save_data(self, data_type: str, data: List[Dict]) -> int:
         handlers = {
@@ -81,417 +90,351 @@ class DataHandler:
             
         return handler(data)
     
-    @transaction.atomic
     def save_contacts(self, contacts: List[Dict]) -> int:
-        count = 0
+        contacts_cache = self._load_contacts()
         
-        for contact_data in contacts:
-            try:
-                phone_number = self._normalize_phone(contact_data.get('phone_number', ''))
-                
-                if not phone_number:
-                    continue
-                
-                existing = Contact.objects.filter(
-                    backup_id=self.backup_id,
-                    phone_number=phone_number
-                ).first()
-                
-                if existing:
+        with self._ingestor(Contact, key_fields=('phone_number',), label='contacts') as ingestor:
+            for contact_data in contacts:
+                try:
+                    phone_number = self._normalize_phone(contact_data.get('phone_number', ''))
+                    
+                    if not phone_number:
+                        ingestor.skip()
+                        continue
+                    
+                    contact = Contact(
+                        backup_id=self.backup_id,
+                        name=contact_data.get('name', ''),
+                        phone_number=phone_number,
+                        is_favorite=contact_data.get('is_favorite', False),
+                        date_of_birth=self._parse_date(contact_data.get('date_of_birth'))
+                    )
+                    
+                    if ingestor.add(contact):
+                        contacts_cache[phone_number] = contact
+                    
+                except Exception as e:
+                    logger.error(f"Error saving contact: {e}")
+                    ingestor.skip()
                     continue
-                
-                contact = Contact.objects.create(
+        
+        return self._finish('contacts', ingestor.result)
+    
+    def _resolve_threads(self, addresses) -> Dict[str, int]:
+        threads = dict(
+            ChatThread.objects.filter(backup_id=self.backup_id, address__in=addresses)
+            .values_list('address', 'id')
+        )
+        
+        missing = [address for address in addresses if address not in threads]
+        if missing:
+            ChatThread.objects.bulk_create([
+                ChatThread(
                     backup_id=self.backup_id,
-                    name=contact_data.get('name', ''),
-                    phone_number=phone_number,
-                    is_favorite=contact_data.get('is_favorite', False),
-                    date_of_birth=self._parse_date(contact_data.get('date_of_birth'))
-                )
-                
-                self._contacts_cache[phone_number] = contact
-                count += 1
-                
-            except Exception as e:
-                logger.error(f"Error saving contact: {e}")
-                continue
+                    address=address,
+                    contact=self._get_contact_by_phone(address)
+                ) for address in missing
+            ], batch_size=self.batch_size)
+            threads.update(
+                ChatThread.objects.filter(backup_id=self.backup_id, address__in=missing)
+                .values_list('address', 'id')
+            )
         
-        logger.info(f"Saved {count} contacts for backup {self.backup_id}")
-        return count
+        return threads
     
-    @transaction.atomic
     def save_messages(self, messages: List[Dict]) -> int:
-        count = 0
-        threads_cache = {}
-        
-        for msg_data in messages:
-            try:
-                address = msg_data.get('address', '')
-                if not address:
-                    continue
-                
-                thread_key = address
-                if thread_key not in threads_cache:
-                    contact = self._get_contact_by_phone(address)
+        with self._ingestor(Message, label='messages') as ingestor:
+            addresses = {msg_data.get('address', '') for msg_data in messages} - {''}
+            threads = self._resolve_threads(addresses)
+            
+            for msg_data in messages:
+                try:
+                    address = msg_data.get('address', '')
+                    if not address:
+                        ingestor.skip()
+                        continue
                     
-                    chat_thread, _ = ChatThread.objects.get_or_create(
+                    ingestor.add(Message(
                         backup_id=self.backup_id,
-                        address=address,
-                        defaults={
-                            'contact': contact
-                        }
-                    )
-                    threads_cache[thread_key] = chat_thread.id
-                
-                chat_thread_id = threads_cache[thread_key]
-                
-                Message.objects.create(
-                    backup_id=self.backup_id,
-                    chat_thread_id=chat_thread_id,
-                    body=msg_data.get('body', ''),
-                    date=self._parse_date(msg_data.get('date')),
-                    status=msg_data.get('status', -1) or -1,
-                    seen=msg_data.get('seen', False),
-                    sim_slot=msg_data.get('sim_slot', 0) or 0
-                )
-                
-                count += 1
-                
-            except Exception as e:
-                logger.error(f"Error saving message: {e}")
-                continue
+                        chat_thread_id=threads[address],
+                        body=msg_data.get('body', ''),
+                        date=self._parse_date(msg_data.get('date')),
+                        status=msg_data.get('status', -1) or -1,
+                        seen=msg_data.get('seen', False),
+                        sim_slot=msg_data.get('sim_slot', 0) or 0
+                    ))
+                    
+                except Exception as e:
+                    logger.error(f"Error saving message: {e}")
+                    ingestor.skip()
+                    continue
         
-        logger.info(f"Saved {count} messages for backup {self.backup_id}")
-        return count
+        ChatThread.refresh_summaries(self.backup_id)
+        return self._finish('messages', ingestor.result)
     
-    @transaction.atomic
     def save_call_logs(self, call_logs: List[Dict]) -> int:
-        count = 0
-        
-        type_map = {
-            'INCOMING': CallLog.CallType.INCOMING,
-            'OUTGOING': CallLog.CallType.OUTGOING,
-            'MISSED': CallLog.CallType.MISSED,
-            'REJECTED': CallLog.CallType.REJECTED,
-        }
+        type_map = dict(CallLog.CALL_TYPES)
         
-        for call_data in call_logs:
-            try:
-                number = call_data.get('number', '')
-                
-                call_type_str = call_data.get('type', 'INCOMING')
-                call_type = type_map.get(call_type_str, CallLog.CallType.INCOMING)
-                
-                CallLog.objects.create(
-                    backup_id=self.backup_id,
-                    number=number,
-                    name=call_data.get('name', ''),
-                    date=self._parse_date(call_data.get('date')),
-                    duration=call_data.get('duration', 0) or 0,
-                    call_type=call_type
-                )
-                
-                count += 1
-                
-            except Exception as e:
-                logger.error(f"Error saving call log: {e}")
-                continue
+        with self._ingestor(CallLog, label='call logs') as ingestor:
+            for call_data in call_logs:
+                try:
+                    call_date = self._parse_date(call_data.get('date'))
+                    if not call_date:
+                        ingestor.skip()
+                        continue
+                    
+                    call_type = call_data.get('type', 'INCOMING')
+                    if call_type not in type_map:
+                        call_type = 'INCOMING'
+                    
+                    ingestor.add(CallLog(
+                        backup_id=self.backup_id,
+                        number=call_data.get('number', ''),
+                        name=call_data.get('name', ''),
+                        date=call_date,
+                        duration=call_data.get('duration', 0) or 0,
+                        type=call_type
+                    ))
+                    
+                except Exception as e:
+                    logger.error(f"Error saving call log: {e}")
+                    ingestor.skip()
+                    continue
         
-        logger.info(f"Saved {count} call logs for backup {self.backup_id}")
-        return count
+        return self._finish('call_logs', ingestor.result)
     
-    @transaction.atomic
     def save_apps(self, apps: List[Dict]) -> int:
-        count = 0
-        
-        for app_data in apps:
-            try:
-                package_name = app_data.get('package_name', '')
-                
-                if ApkList.objects.filter(
-                    backup_id=self.backup_id,
-                    package_name=package_name
-                ).exists():
+        with self._ingestor(ApkList, key_fields=('apk_name',), label='apps') as ingestor:
+            for app_data in apps:
+                try:
+                    apk_name = app_data.get('apk_name') or app_data.get('package_name', '')
+                    
+                    ingestor.add(ApkList(
+                        backup_id=self.backup_id,
+                        apk_name=apk_name,
+                        version_name=app_data.get('version_name', ''),
+                        size=app_data.get('size', 0)
+                    ))
+                    
+                except Exception as e:
+                    logger.error(f"Error saving app: {e}")
+                    ingestor.skip()
                     continue
-                
-                ApkList.objects.create(
-                    backup_id=self.backup_id,
-                    apk_name=app_data.get('apk_name', ''),
-                    package_name=package_name,
-                    version_name=app_data.get('version_name', ''),
-                    size=app_data.get('size', 0)
-                )
-                
-                count += 1
-                
-            except Exception as e:
-                logger.error(f"Error saving app: {e}")
-                continue
         
-        logger.info(f"Saved {count} apps for backup {self.backup_id}")
-        return count
+        return self._finish('apps', ingestor.result)
     
-    @transaction.atomic
     def save_bluetooth(self, devices: List[Dict]) -> int:
-        count = 0
-        
-        for device_data in devices:
-            try:
-                address = device_data.get('address', '')
-                
-                if BluetoothDevice.objects.filter(
-                    backup_id=self.backup_id,
-                    address=address
-                ).exists():
+        with self._ingestor(BluetoothDevice, key_fields=('address',), label='bluetooth devices') as ingestor:
+            for device_data in devices:
+                try:
+                    device_class = device_data.get('device_class')
+                    
+                    ingestor.add(BluetoothDevice(
+                        backup_id=self.backup_id,
+                        address=device_data.get('address', ''),
+                        name=device_data.get('name', ''),
+                        device_class=int(device_class) if str(device_class or '').isdigit() else None
+                    ))
+                    
+                except Exception as e:
+                    logger.error(f"Error saving bluetooth device: {e}")
+                    ingestor.skip()
                     continue
-                
-                BluetoothDevice.objects.create(
-                    backup_id=self.backup_id,
-                    address=address,
-                    name=device_data.get('name', ''),
-                    device_class=device_data.get('device_class', '')
-                )
-                
-                count += 1
-                
-            except Exception as e:
-                logger.error(f"Error saving bluetooth device: {e}")
-                continue
         
-        logger.info(f"Saved {count} bluetooth devices for backup {self.backup_id}")
-        return count
+        return self._finish('bluetooth', ingestor.result)
     
-    @transaction.atomic
     def save_wifi(self, networks: List[Dict]) -> int:
-        count = 0
-        
-        for network_data in networks:
-            try:
-                ssid = network_data.get('ssid', '')
-                password = network_data.get('password', '')
-                
-                if WifiNetwork.objects.filter(
-                    backup_id=self.backup_id,
-                    ssid=ssid,
-                    password=password
-                ).exists():
+        with self._ingestor(WifiNetwork, key_fields=('ssid', 'password'), label='wifi networks') as ingestor:
+            for network_data in networks:
+                try:
+                    ingestor.add(WifiNetwork(
+                        backup_id=self.backup_id,
+                        ssid=network_data.get('ssid', ''),
+                        password=network_data.get('password', ''),
+                        security_type=network_data.get('security_type', 'WPA_PSK')
+                    ))
+                    
+                except Exception as e:
+                    logger.error(f"Error saving wifi network: {e}")
+                    ingestor.skip()
                     continue
-                
-                WifiNetwork.objects.create(
-                    backup_id=self.backup_id,
-                    ssid=ssid,
-                    password=network_data.get('password', ''),
-                    security_type=network_data.get('security_type', 'WPA_PSK')
-                )
-                
-                count += 1
-                
-            except Exception as e:
-                logger.error(f"Error saving wifi network: {e}")
-                continue
         
-        logger.info(f"Saved {count} wifi networks for backup {self.backup_id}")
-        return count
+        return self._finish('wifi', ingestor.result)
     
-    @transaction.atomic
     def save_alarms(self, alarms: List[Dict]) -> int:
-        count = 0
-        
-        for alarm_data in alarms:
-            try:
-                alarm_time = None
-                time_str = alarm_data.get('time')
-                if time_str:
-                    try:
-                        if isinstance(time_str, str) and ':' in time_str:
-                            parts = time_str.split(':')
-                            from datetime import time
-                            alarm_time = time(int(parts[0]), int(parts[1]))
-                    except:
-                        pass
-                
-                Alarm.objects.create(
-                    backup_id=self.backup_id,
-                    name=alarm_data.get('name', ''),
-                    time=alarm_time,
-                    active=alarm_data.get('active', False),
-                    repeat_type=alarm_data.get('repeat_type', 0)
-                )
-                count += 1
-                
-            except Exception as e:
-                logger.error(f"Error saving alarm: {e}")
-                continue
+        with self._ingestor(Alarm, label='alarms') as ingestor:
+            for alarm_data in alarms:
+                try:
+                    alarm_time = None
+                    time_str = alarm_data.get('time')
+                    if time_str:
+                        try:
+                            if isinstance(time_str, str) and ':' in time_str:
+                                parts = time_str.split(':')
+                                alarm_time = time(int(parts[0]), int(parts[1]))
+                        except:
+                            pass
+                    
+                    ingestor.add(Alarm(
+                        backup_id=self.backup_id,
+                        name=alarm_data.get('name', ''),
+                        time=alarm_time,
+                        active=alarm_data.get('active', False),
+                        repeat_type=alarm_data.get('repeat_type', 0)
+                    ))
+                    
+                except Exception as e:
+                    logger.error(f"Error saving alarm: {e}")
+                    ingestor.skip()
+                    continue
         
-        logger.info(f"Saved {count} alarms for backup {self.backup_id}")
-        return count
+        return self._finish('alarms', ingestor.result)
     
-    @transaction.atomic
     def save_notes(self, notes: List[Dict]) -> int:
-        count = 0
-        
-        for note_data in notes:
-            try:
-                Note.objects.create(
-                    backup_id=self.backup_id,
-                    note_id=note_data.get('note_id'),
-                    title=note_data.get('title', ''),
-                    body=note_data.get('body', ''),
-                    creation_date=self._parse_date(note_data.get('creation_date'))
-                )
-                count += 1
-                
-            except Exception as e:
-                logger.error(f"Error saving note: {e}")
-                continue
+        with self._ingestor(Note, label='notes') as ingestor:
+            for note_data in notes:
+                try:
+                    ingestor.add(Note(
+                        backup_id=self.backup_id,
+                        note_id=note_data.get('note_id'),
+                        title=note_data.get('title', ''),
+                        body=note_data.get('body', ''),
+                        creation_date=self._parse_date(note_data.get('creation_date'))
+                    ))
+                    
+                except Exception as e:
+                    logger.error(f"Error saving note: {e}")
+                    ingestor.skip()
+                    continue
         
-        logger.info(f"Saved {count} notes for backup {self.backup_id}")
-        return count
+        return self._finish('notes', ingestor.result)
     
-    @transaction.atomic
     def save_calendar(self, events: List[Dict]) -> int:
-        count = 0
-        
-        for event_data in events:
-            try:
-                CalendarEvent.objects.create(
-                    backup_id=self.backup_id,
-                    summary=event_data.get('summary', ''),
-                    start_date=self._parse_date(event_data.get('start_date')),
-                    end_date=self._parse_date(event_data.get('end_date')),
-                    location=event_data.get('location', '')
-                )
-                count += 1
-                
-            except Exception as e:
-                logger.error(f"Error saving calendar event: {e}")
-                continue
+        with self._ingestor(CalendarEvent, label='calendar events') as ingestor:
+            for event_data in events:
+                try:
+                    ingestor.add(CalendarEvent(
+                        backup_id=self.backup_id,
+                        summary=event_data.get('summary', ''),
+                        start_date=self._parse_date(event_data.get('start_date')),
+                        end_date=self._parse_date(event_data.get('end_date')),
+                        location=event_data.get('location', '')
+                    ))
+                    
+                except Exception as e:
+                    logger.error(f"Error saving calendar event: {e}")
+                    ingestor.skip()
+                    continue
         
-        logger.info(f"Saved {count} calendar events for backup {self.backup_id}")
-        return count
+        return self._finish('calendar', ingestor.result)
     
-    @transaction.atomic
     def save_files(self, files: List[Dict]) -> int:
-        count = 0
-        
-        for file_data in files:
-            try:
-                file_name = file_data.get('name', '')
-                file_path = file_data.get('path', '')
-                file_content = file_data.get('content')
-                
-                if not file_content:
-                    continue
-                
-                storage_path = f"Users Backups/{self.backup.user.username}/{self.backup.name} {self.backup_id}/Files/{file_path}"
-                
-                saved_path = default_storage.save(storage_path, ContentFile(file_content))
-                
-                File.objects.create(
-                    backup_id=self.backup_id,
-                    name=file_name,
-                    path=saved_path,
-                    size=len(file_content),
-                    file_type=file_data.get('file_type', 'OTHER')
-                )
-                
-                count += 1
-                
-            except Exception as e:
-                logger.error(f"Error saving file: {e}")
-                continue
+        stored = []
+        try:
+            with self._ingestor(File, label='files') as ingestor:
+                for file_data in files:
+                    try:
+                        file_name = file_data.get('name', '')
+                        file_path = file_data.get('path', '')
+                        file_content = file_data.get('content')
+                        
+                        if not file_content:
+                            ingestor.skip()
+                            continue
+                        
+                        if isinstance(file_content, str):
+                            file_content = file_content.encode('utf-8')
+
+                        with blob_reference(io.BytesIO(file_content), file_name or file_path) as saved_path:
+                            file_obj = File(
+                                backup_id=self.backup_id,
+                                file_name=file_name,
+                                file=saved_path,
+                                file_size=len(file_content),
+                                category=file_data.get('file_type', 'OTHER')
+                            )
+                        stored.append(saved_path)
+                        
+                    except Exception as e:
+                        logger.error(f"Error saving file: {e}")
+                        ingestor.skip()
+                        continue
+                    
+                    ingestor.add(file_obj)
+        except Exception:
+            discard_unreferenced_blobs(stored)
+            raise
         
-        logger.info(f"Saved {count} files for backup {self.backup_id}")
-        return count
+        return self._finish('files', ingestor.result)
     
-    @transaction.atomic
     def save_browser(self, browser_data: List[Dict]) -> int:
-        count = 0
-        
-        for item in browser_data:
-            try:
-                item_type = item.get('type', 'history')
-                
-                if item_type == 'history':
-                    url = item.get('url', '')
-                    
-                    if BrowserHistory.objects.filter(
-                        backup_id=self.backup_id,
-                        url=url
-                    ).exists():
+        with self._ingestor(BrowserHistory, key_fields=('url',), label='browser history items') as ingestor:
+            for item in browser_data:
+                try:
+                    if item.get('type', 'history') != 'history':
+                        ingestor.skip()
                         continue
                     
-                    BrowserHistory.objects.create(
+                    ingestor.add(BrowserHistory(
                         backup_id=self.backup_id,
-                        url=url,
+                        url=item.get('url', ''),
                         title=item.get('title', ''),
                         visit_count=item.get('visit_count', 1),
-                        last_visit_time=self._parse_date(item.get('date')),
+                        last_visit_time=self._parse_date(item.get('date')) or now(),
                         source='samsung_browser'
-                    )
-                    count += 1
-                    
-            except Exception as e:
-                logger.error(f"Error saving browser item: {e}")
-                continue
+                    ))
+                        
+                except Exception as e:
+                    logger.error(f"Error saving browser item: {e}")
+                    ingestor.skip()
+                    continue
         
-        logger.info(f"Saved {count} browser history items for backup {self.backup_id}")
-        return count
+        return self._finish('browser', ingestor.result)
     
-    @transaction.atomic
     def save_homescreen(self, homescreen_data: List[Dict]) -> int:
-        count = 0
-        
-        layout, _ = HomeScreenLayout.objects.get_or_create(
-            backup_id=self.backup_id,
-            defaults={
-                'rows': 4,
-                'columns': 4,
-                'page_count': 1,
-                'has_zero_page': False,
-                'is_portrait_only': False,
-                'notification_panel_enabled': True,
-                'layout_locked': False,
-                'quick_access_enabled': True,
-                'badge_enabled': True
-            }
-        )
-        
-        for item in homescreen_data:
-            try:
-                package_name = item.get('package', '')
-                class_name = item.get('class', '')
-                
-                if not package_name and not class_name:
-                    continue
-                
-                if HomeScreenItem.objects.filter(
-                    backup_id=self.backup_id,
-                    package_name=package_name,
-                    class_name=class_name
-                ).exists():
+        with self._ingestor(HomeScreenItem, key_fields=('package_name', 'class_name'), label='homescreen items') as ingestor:
+            layout, _ = HomeScreenLayout.objects.get_or_create(
+                backup_id=self.backup_id,
+                defaults={
+                    'rows': 4,
+                    'columns': 4,
+                    'page_count': 1,
+                    'has_zero_page': False,
+                    'is_portrait_only': False,
+                    'notification_panel_enabled': True,
+                    'layout_locked': False,
+                    'quick_access_enabled': True,
+                    'badge_enabled': True
+                }
+            )
+            
+            for item in homescreen_data:
+                try:
+                    package_name = item.get('package', '')
+                    class_name = item.get('class', '')
+                    
+                    if not package_name and not class_name:
+                        ingestor.skip()
+                        continue
+                    
+                    ingestor.add(HomeScreenItem(
+                        backup_id=self.backup_id,
+                        layout=layout,
+                        item_type=item.get('type', 'app'),
+                        screen_index=item.get('screen', 0),
+                        x=item.get('x', 0),
+                        y=item.get('y', 0),
+                        package_name=package_name,
+                        class_name=class_name,
+                        location='home'
+                    ))
+                    
+                except Exception as e:
+                    logger.error(f"Error saving homescreen item: {e}")
+                    ingestor.skip()
                     continue
-                
-                item_type = item.get('type', 'app')
-                
-                HomeScreenItem.objects.create(
-                    backup_id=self.backup_id,
-                    layout=layout,
-                    item_type=item_type,
-                    screen_index=item.get('screen', 0),
-                    x=item.get('x', 0),
-                    y=item.get('y', 0),
-                    package_name=package_name,
-                    class_name=class_name,
-                    location='home'
-                )
-                count += 1
-                
-            except Exception as e:
-                logger.error(f"Error saving homescreen item: {e}")
-                continue
         
-        logger.info(f"Saved {count} homescreen items for backup {self.backup_id}")
-        return count
+        return self._finish('homescreen', ingestor.result)
 
 def save_extracted_data(backup_id: int, data_type: str, data: List[Dict]) -> int:
     handler = DataHandler(backup_id)
@@ -1,11 +1,11 @@
 import logging
 import mimetypes
 from pathlib import Path
-from django.core.files.base import ContentFile
 from django.utils.timezone import datetime
 
 from ..base_extractor import BaseExtractor
 from ...models import File
+from ...utils.blob_store import blob_reference, release_queryset_blobs
 
 logger = logging.getLogger(__name__)
 
@@ -18,7 +18,9 @@ class AndroidFileExtractor(BaseExtractor):
         media_folders = ["photos", "videos", "audios", "documents"]
         file_count = 0
         
-        File.objects.filter(backup_id=self.backup_id).delete()
+        existing = File.objects.filter(backup_id=self.backup_id)
+        release_queryset_blobs(existing, 'file')
+        existing.delete()
         
         for category in media_folders:
             folder_path = self.backup_root / category
@@ -34,24 +36,22 @@ class AndroidFileExtractor(BaseExtractor):
                     continue
                     
                 try:
-                    with open(file_path, 'rb') as f_content:
-                        django_file = ContentFile(f_content.read(), name=file_path.name)
-                        
-                        file_stat = file_path.stat()
-                        
+                    file_stat = file_path.stat()
+
+                    with blob_reference(file_path) as blob_name:
                         File.objects.create(
                             backup_id=self.backup_id,
                             file_name=file_path.name,
                             file_size=file_stat.st_size,
                             file_extension=file_path.suffix[1:].lower() if file_path.suffix else '',
                             mime_type=mimetypes.guess_type(file_path.name)[0],
-                            category=category[:-1], 
+                            category=category[:-1],
                             created_date=datetime.fromtimestamp(file_stat.st_ctime),
                             modified_date=datetime.fromtimestamp(file_stat.st_mtime),
-                            file=django_file
+                            file=blob_name
                         )
-                        file_count += 1
-                        
+                    file_count += 1
+
                 except Exception as e:
                     self.log_error(f"Error processing file {file_path.name}: {e}")
 
@@ -8,7 +8,7 @@ from pathlib import Path
 from django.db import transaction
 from django.utils.timezone import make_aware
 
-from ..base_extractor import BaseExtractor
+from ..base_extractor import JSON_MEMORY_FACTOR, BaseExtractor
 from ...models import ChatThread, Message, Contact
 
 logger = logging.getLogger(__name__)
@@ -52,10 +52,11 @@ class AndroidMessageExtractor(BaseExtractor):
         self.log_info(f"Found SMS file: {sms_file}")
         
         try:
-            compressed_data = sms_file.read_bytes()
-            decompressed_data = zlib.decompress(compressed_data)
-            json_text = decompressed_data.decode("utf-8", errors="ignore")
-            sms_list = json.loads(json_text)
+            with self.reserve_memory(sms_file.stat().st_size):
+                decompressed_data = zlib.decompress(sms_file.read_bytes())
+            with self.reserve_memory(len(decompressed_data) * JSON_MEMORY_FACTOR):
+                sms_list = json.loads(decompressed_data.decode("utf-8", errors="ignore"))
+            del decompressed_data
         except Exception as e:
             self.log_error(f"Failed to read/decompress/parse SMS file: {e}")
             self.update_progress(step_number, step_name, 'Failed to parse SMS file.', 0, 'failed')
@@ -110,6 +111,7 @@ class AndroidMessageExtractor(BaseExtractor):
                 except Exception as e:
                     self.log_error(f"Error saving SMS entry: {e}")
 
+        ChatThread.refresh_summaries(self.backup_id)
         self.log_info(f"Successfully imported {message_count} messages.")
         self.update_progress(step_number, step_name, f"Successfully extracted {message_count} messages.", 100, 'completed')
         return message_count
\ No newline at end of file
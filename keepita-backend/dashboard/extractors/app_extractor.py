@@ -7,7 +7,7 @@ from django.core.files import File as DjangoFile
 from django.utils.timezone import datetime
 
 from ..models import ApkList, ApkPermission, Backup
-from .base_extractor import BaseExtractor
+from .base_extractor import JSON_MEMORY_FACTOR, BaseExtractor
 
 logger = logging.getLogger(__name__)
 
@@ -38,7 +38,8 @@ class AppExtractor(BaseExtractor):
         try:
             with open(app_list_file, encoding="utf-8") as f:
                 try:
-                    data = json.load(f)
+                    with self.reserve_memory(os.fstat(f.fileno()).st_size * JSON_MEMORY_FACTOR):
+                        data = json.load(f)
                     apps = data.get("Apks", [])
                     total_apps = len(apps)
                     self.log_info(f"Found {total_apps} applications in file")
@@ -1,7 +1,6 @@
 import logging
 import os
 import json
-import time
 import base64
 import socket
 import platform
@@ -12,6 +11,10 @@ from dotenv import set_key, find_dotenv
 from django.conf import settings
 from getmac import get_mac_address
 
+from .file_index import BackupFileIndex
+from ..task_watcher import TaskWatcher
+from ..memory_budget import get_memory_accountant
+
 try:
     from ..progress_manager import ProgressManager
 except ImportError:
@@ -19,12 +22,21 @@ except ImportError:
 
 logger = logging.getLogger('dashboard.extractors')
 
+JSON_MEMORY_FACTOR = 4
+
 class BaseExtractor:
-    def __init__(self, backup_dir: str, backup_id: int):
+
+    ARCHIVE_PATTERNS = None
+    archive_manifest = None
+
+    def __init__(self, backup_dir: str, backup_id: int, file_index: Optional[BackupFileIndex] = None):
         self.backup_dir = Path(backup_dir)
         self.backup_id = backup_id
         self.extracted_count = 0
         self.logger = logging.getLogger('dashboard.extractors')
+        if file_index is None or file_index.relative(self.backup_dir) is None:
+            file_index = BackupFileIndex(self.backup_dir)
+        self.file_index = file_index
         self.backup_root = self._find_backup_root()
         self.log = self._get_log()
 
@@ -39,22 +51,24 @@ class BaseExtractor:
     def _find_backup_root(self) -> Path:
         self.log_debug(f"Starting backup root search in: {self.backup_dir}")
 
+        index = self.file_index
+
         def is_ios_backup_dir(p: Path) -> bool:
-            return p.is_dir() and (p / 'Manifest.plist').exists() and (p / 'Manifest.db').exists()
+            return index.is_file(p / 'Manifest.plist') and index.is_file(p / 'Manifest.db')
 
         if is_ios_backup_dir(self.backup_dir):
             self.log_info(f"iOS Backup root found at the base level: {self.backup_dir}")
             return self.backup_dir
 
-        if (self.backup_dir / 'HomeDomain').is_dir():
+        if index.is_dir(self.backup_dir / 'HomeDomain'):
             self.log_info("Decrypted iOS backup structure detected. Using current directory as root.")
             return self.backup_dir
-            
-        for root, dirs, files in os.walk(self.backup_dir):
-            if 'Manifest.plist' in files and 'Manifest.db' in files:
-                found_path = Path(root)
-                self.log_info(f"iOS Backup root found via deep search: {found_path}")
-                return found_path
+
+        manifest_dirs = [p.parent for p in index.find('Manifest.plist', under=self.backup_dir) if is_ios_backup_dir(p.parent)]
+        if manifest_dirs:
+            found_path = min(manifest_dirs, key=lambda p: len(p.parts))
+            self.log_info(f"iOS Backup root found via index lookup: {found_path}")
+            return found_path
 
         try:
             contents = [p for p in self.backup_dir.iterdir() if p.is_dir() and not p.name.startswith('.')]
@@ -73,18 +87,15 @@ class BaseExtractor:
             return self.backup_root
 
         direct_path = self.backup_root.joinpath(*path_parts)
-        if direct_path.exists():
+        if self.file_index.exists(direct_path) or direct_path.exists():
             self.log_debug(f"File path found directly at: {direct_path}")
             return direct_path
 
         filename = path_parts[-1]
-        try:
-            search_results = list(self.backup_root.rglob(filename))
-            if search_results:
-                self.log_debug(f"File path found via recursive search for '{filename}': {search_results[0]}")
-                return search_results[0]
-        except Exception as e:
-            self.log_warning(f"Error during recursive search for '{filename}': {e}")
+        search_results = self.file_index.find(filename, under=self.backup_root)
+        if search_results:
+            self.log_debug(f"File path found via index lookup for '{filename}': {search_results[0]}")
+            return search_results[0]
         
         self.log_debug(f"File path for '{'/'.join(path_parts)}' not found. Returning theoretical path.")
         return direct_path
@@ -108,6 +119,15 @@ class BaseExtractor:
             except Exception as e:
                 self.logger.debug(f"Failed to update progress log: {e}")
 
+    def reserve_memory(self, size: int, category: str = 'files'):
+        return get_memory_accountant().reserve(size, category, self.backup_id)
+
+    def load_json_file(self, path, errors='strict'):
+        path = Path(path)
+        with self.reserve_memory(path.stat().st_size * JSON_MEMORY_FACTOR, 'files'):
+            with open(path, 'r', encoding='utf-8', errors=errors) as f:
+                return json.load(f)
+
     def extract(self) -> int:
         raise NotImplementedError("Subclasses must implement the extract() method.")
 
@@ -176,48 +196,12 @@ class BaseExtractor:
             self.log_error(f"FATAL: Client registration failed. Error: {e}", exc_info=True)
             raise
 
-    def _poll_task_status(self, task_id):
-        status_url = self.get_api_url(f"tasks/{task_id}/status")
-        timeout_seconds = 600
-        start_time = time.time()
-        
-        while time.time() - start_time < timeout_seconds:
-            try:
-                headers = {'X-API-KEY': settings.MAIN_SERVER_API_KEY}
-                response = requests.get(status_url, headers=headers, timeout=10)
-                
-                if response.status_code != 200:
-                    self.log_warning(f"Poll returned status {response.status_code}")
-                    time.sleep(5)
-                    continue
+    def _watch_tasks(self, task_ids=()) -> TaskWatcher:
+        return TaskWatcher(task_ids)
 
-                response_json = response.json()
-                result = response_json
-                
-                if 'data' in result and isinstance(result.get('data'), dict):
-                    result = result['data']
-                
-                if 'data' in result and isinstance(result.get('data'), dict):
-                    inner = result['data']
-                    if 'status' in inner or 'download_url' in inner or 'task_id' in inner:
-                        result = inner
-                
-                status = result.get('status')
-                
-                if status == 'success':
-                    self.log_info(f"Task {task_id} completed successfully.")
-                    return result.get('result', result)
-                elif status == 'failed':
-                    error = result.get('result', {}).get('error', 'Unknown error')
-                    self.log_error(f"Task {task_id} failed on the main server: {error}")
-                    return None
-                    
-                time.sleep(5)
-            except requests.RequestException as e:
-                self.log_debug(f"Volatile connection while polling {task_id}: {e}")
-                time.sleep(10)
-                
-        self.log_error(f"Polling for task {task_id} timed out.")
+    def _poll_task_status(self, task_id):
+        for _, result in self._watch_tasks([task_id]):
+            return result
         return None
 
     def _handle_decryption_result(self, result):
@@ -1,4 +1,3 @@
-import json
 import logging
 import sqlite3
 from datetime import datetime, timedelta, timezone
@@ -331,11 +330,10 @@ class BrowserExtractor(BaseExtractor):
 
         if downloads_json.exists():
             try:
-                with open(downloads_json, "r", encoding="utf-8") as f:
-                    downloads_data = json.load(f)
-                    downloads_list = downloads_data.get("downloads", [])
-                    total_downloads = len(downloads_list)
-                    self.log_info(f"Found {total_downloads} downloads")
+                downloads_data = self.load_json_file(downloads_json)
+                downloads_list = downloads_data.get("downloads", [])
+                total_downloads = len(downloads_list)
+                self.log_info(f"Found {total_downloads} downloads")
 
                 for i, download in enumerate(downloads_list):
                     try:
@@ -409,11 +407,10 @@ class BrowserExtractor(BaseExtractor):
 
         if tabs_json.exists():
             try:
-                with open(tabs_json, "r", encoding="utf-8") as f:
-                    tabs_data = json.load(f)
-                    tabs_list = tabs_data.get("current_tabs", [])
-                    total_tabs = len(tabs_list)
-                    self.log_info(f"Found {total_tabs} open tabs")
+                tabs_data = self.load_json_file(tabs_json)
+                tabs_list = tabs_data.get("current_tabs", [])
+                total_tabs = len(tabs_list)
+                self.log_info(f"Found {total_tabs} open tabs")
 
                 for i, tab in enumerate(tabs_list):
                     try:
@@ -0,0 +1,265 @@
+import bisect
+import json
+import logging
+import os
+import threading
+from fnmatch import fnmatchcase
+from pathlib import Path, PurePosixPath
+from typing import Dict, List, Optional, Tuple, Union
+
+from django.conf import settings
+
+logger = logging.getLogger('dashboard.extractors')
+
+GLOB_CHARS = frozenset('*?[')
+
+def sidecar_path(root: Union[str, Path], kind: str) -> Path:
+    root = Path(root)
+    return root.with_name(f"{root.name}.{kind}.json")
+
+def index_file_path(root: Union[str, Path]) -> Path:
+    return sidecar_path(root, 'index')
+
+def _is_pattern(part: str) -> bool:
+    return any(ch in GLOB_CHARS for ch in part)
+
+def _match_parts(parts: List[str], patterns: List[str]) -> bool:
+    if not patterns:
+        return not parts
+    head, rest = patterns[0], patterns[1:]
+    if head == '**':
+        while rest and rest[0] == '**':
+            rest = rest[1:]
+        return any(_match_parts(parts[i:], rest) for i in range(len(parts) + 1))
+    return bool(parts) and fnmatchcase(parts[0], head) and _match_parts(parts[1:], rest)
+
+class BackupFileIndex:
+
+    def __init__(self, root: Union[str, Path], persist: Optional[bool] = None):
+        self.root = Path(root)
+        self.persist = getattr(settings, 'BACKUP_FILE_INDEX_PERSIST', False) if persist is None else persist
+        self._lock = threading.RLock()
+        self._stale = True
+        self._files: Dict[str, Tuple[int, float]] = {}
+        self._dirs = set()
+        self._paths: List[str] = []
+        self._by_name: Dict[str, List[str]] = {}
+
+        if self.persist:
+            self._load()
+
+    def _walk(self):
+        files = {}
+        dirs = {''}
+        stack = ['']
+        while stack:
+            rel_dir = stack.pop()
+            try:
+                with os.scandir(self.root / rel_dir if rel_dir else self.root) as it:
+                    for entry in it:
+                        rel = f"{rel_dir}/{entry.name}" if rel_dir else entry.name
+                        try:
+                            if entry.is_dir(follow_symlinks=False):
+                                dirs.add(rel)
+                                stack.append(rel)
+                            elif entry.is_file():
+                                st = entry.stat()
+                                files[rel] = (st.st_size, st.st_mtime)
+                        except OSError as e:
+                            logger.debug(f"Skipping unreadable entry {rel}: {e}")
+            except OSError as e:
+                logger.debug(f"Could not scan {rel_dir or self.root}: {e}")
+        return files, dirs
+
+    def _install(self, files: Dict[str, Tuple[int, float]], dirs):
+        by_name = {}
+        paths = sorted(set(files) | {d for d in dirs if d})
+        for rel in paths:
+            by_name.setdefault(rel.rsplit('/', 1)[-1], []).append(rel)
+        self._files = files
+        self._dirs = set(dirs)
+        self._paths = paths
+        self._by_name = by_name
+        self._stale = False
+
+    def refresh(self):
+        with self._lock:
+            files, dirs = self._walk()
+            self._install(files, dirs)
+            logger.debug(f"Indexed {len(files)} files in {len(dirs)} directories under {self.root}")
+            if self.persist:
+                self.save()
+
+    def invalidate(self):
+        with self._lock:
+            self._stale = True
+
+    def _ensure(self):
+        if self._stale:
+            with self._lock:
+                if self._stale:
+                    self.refresh()
+
+    def save(self):
+        target = index_file_path(self.root)
+        tmp = target.with_name(target.name + '.tmp')
+        try:
+            with open(tmp, 'w', encoding='utf-8') as f:
+                json.dump({
+                    'root': str(self.root),
+                    'files': [[rel, size, mtime] for rel, (size, mtime) in self._files.items()],
+                    'dirs': sorted(self._dirs),
+                }, f)
+            os.replace(tmp, target)
+        except OSError as e:
+            logger.warning(f"Could not persist file index for {self.root}: {e}")
+
+    def _load(self):
+        target = index_file_path(self.root)
+        if not target.exists():
+            return
+        try:
+            with open(target, 'r', encoding='utf-8') as f:
+                data = json.load(f)
+            if data.get('root') != str(self.root):
+                return
+            files = {rel: (size, mtime) for rel, size, mtime in data.get('files', [])}
+            with self._lock:
+                self._install(files, data.get('dirs', ['']))
+            logger.debug(f"Loaded persisted file index for {self.root} ({len(files)} files)")
+        except (OSError, ValueError, TypeError) as e:
+            logger.warning(f"Ignoring unreadable file index {target}: {e}")
+
+    def relative(self, path: Union[str, Path]) -> Optional[str]:
+        path = Path(path)
+        try:
+            rel = path.relative_to(self.root).as_posix()
+        except ValueError:
+            if path.is_absolute():
+                return None
+            rel = PurePosixPath(*path.parts).as_posix() if path.parts else ''
+        return '' if rel == '.' else rel
+
+    def _abs(self, rel: str) -> Path:
+        return self.root / rel if rel else self.root
+
+    def __len__(self):
+        self._ensure()
+        return len(self._files)
+
+    def __contains__(self, path):
+        return self.exists(path)
+
+    def exists(self, path: Union[str, Path]) -> bool:
+        self._ensure()
+        rel = self.relative(path)
+        return rel is not None and (rel in self._files or rel in self._dirs)
+
+    def is_file(self, path: Union[str, Path]) -> bool:
+        self._ensure()
+        return self.relative(path) in self._files
+
+    def is_dir(self, path: Union[str, Path]) -> bool:
+        self._ensure()
+        return self.relative(path) in self._dirs
+
+    def stat(self, path: Union[str, Path]) -> Optional[Tuple[int, float]]:
+        self._ensure()
+        return self._files.get(self.relative(path))
+
+    def size(self, path: Union[str, Path]) -> int:
+        entry = self.stat(path)
+        return entry[0] if entry else 0
+
+    def get(self, path: Union[str, Path]) -> Optional[Path]:
+        self._ensure()
+        rel = self.relative(path)
+        if rel is not None and rel in self._files:
+            return self._abs(rel)
+        return None
+
+    def files(self, under: Optional[Union[str, Path]] = None) -> List[Path]:
+        self._ensure()
+        prefix = self._prefix(under)
+        if prefix is None:
+            return []
+        return [self._abs(rel) for rel in self._under(prefix) if rel in self._files]
+
+    def children(self, directory: Union[str, Path] = '') -> List[Path]:
+        self._ensure()
+        rel = self.relative(directory) or ''
+        prefix = f"{rel}/" if rel else ''
+        return [self._abs(p) for p in self._under(prefix) if '/' not in p[len(prefix):]]
+
+    def _under(self, prefix: str) -> List[str]:
+        if not prefix:
+            return self._paths
+        start = bisect.bisect_left(self._paths, prefix)
+        end = bisect.bisect_left(self._paths, prefix[:-1] + chr(ord(prefix[-1]) + 1))
+        return self._paths[start:end]
+
+    def _prefix(self, under) -> Optional[str]:
+        if under is None:
+            return ''
+        rel = self.relative(under)
+        if rel is None:
+            return None
+        return f"{rel}/" if rel else ''
+
+    def find(self, name: str, under: Optional[Union[str, Path]] = None) -> List[Path]:
+        self._ensure()
+        prefix = self._prefix(under)
+        if prefix is None:
+            return []
+        return [self._abs(rel) for rel in self._by_name.get(name, ()) if rel.startswith(prefix)]
+
+    def glob(self, pattern: str, under: Optional[Union[str, Path]] = None) -> List[Path]:
+        self._ensure()
+        prefix = self._prefix(under)
+        if prefix is None:
+            return []
+        parts = pattern.strip('/').split('/')
+
+        literal = []
+        for part in parts[:-1]:
+            if _is_pattern(part):
+                break
+            literal.append(part)
+        base = prefix + ''.join(f"{part}/" for part in literal)
+
+        if len(literal) == len(parts) - 1 and not _is_pattern(parts[-1]):
+            rel = base + parts[-1]
+            return [self._abs(rel)] if rel in self._files or rel in self._dirs else []
+
+        remaining = parts[len(literal):]
+        matches = []
+        for rel in self._under(base):
+            if _match_parts(rel[len(base):].split('/'), remaining):
+                matches.append(self._abs(rel))
+        return matches
+
+    def rglob(self, pattern: str, under: Optional[Union[str, Path]] = None) -> List[Path]:
+        self._ensure()
+        prefix = self._prefix(under)
+        if prefix is None:
+            return []
+        parts = pattern.strip('/').split('/')
+        name_pattern, parents = parts[-1], parts[:-1]
+
+        if _is_pattern(name_pattern):
+            candidates = [
+                rel for name, rels in self._by_name.items() if fnmatchcase(name, name_pattern)
+                for rel in rels
+            ]
+            candidates.sort()
+        else:
+            candidates = self._by_name.get(name_pattern, [])
+
+        matches = []
+        for rel in candidates:
+            if not rel.startswith(prefix):
+                continue
+            if parents and not _match_parts(rel[len(prefix):].split('/')[:-1], ['**'] + parents):
+                continue
+            matches.append(self._abs(rel))
+        return matches
@@ -1,17 +1,16 @@
 
-import json
 import logging
-from pathlib import Path
-from typing import Optional
 
 from django.db import transaction
 
 from ...models import BluetoothDevice
-from ..base_extractor import BaseExtractor
+from .ios_decryption_proxy import IOSExtractor
 
 logger = logging.getLogger(__name__)
 
-class IOSBluetoothExtractor(BaseExtractor):
+class IOSBluetoothExtractor(IOSExtractor):
+
+    ARCHIVE_PATTERNS = ()
 
     def extract(self) -> int:
         step_number = 17
@@ -65,15 +64,3 @@ class IOSBluetoothExtractor(BaseExtractor):
         self.log_info(f"Successfully imported {device_count} bluetooth devices.")
         self.update_progress(step_number, step_name, f"Successfully imported {device_count} devices", 100, 'completed')
         return device_count
-
-    def _load_server_json(self, data_type: str) -> Optional[dict]:
-        json_path = Path(self.backup_root) / '_extracted_json' / f'{data_type}.json'
-        if json_path.exists():
-            try:
-                with open(json_path, 'r', encoding='utf-8') as f:
-                    data = json.load(f)
-                    self.log_info(f"Loaded {data_type} data from server JSON: {data.get('count', 0)} items")
-                    return data
-            except Exception as e:
-                self.log_error(f"Failed to load server JSON for {data_type}: {e}")
-        return None
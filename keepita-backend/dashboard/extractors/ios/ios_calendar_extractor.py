@@ -1,18 +1,18 @@
 
-import json
 import logging
 from datetime import datetime
-from pathlib import Path
 from typing import Optional
 
 from django.db import transaction
 
 from ...models import CalendarEvent
-from ..base_extractor import BaseExtractor
+from .ios_decryption_proxy import IOSExtractor
 
 logger = logging.getLogger(__name__)
 
-class IOSCalendarExtractor(BaseExtractor):
+class IOSCalendarExtractor(IOSExtractor):
+
+    ARCHIVE_PATTERNS = ()
 
     def extract(self) -> int:
         step_number = 10
@@ -78,16 +78,4 @@ class IOSCalendarExtractor(BaseExtractor):
             else:
                 return datetime.fromisoformat(str(date_val).replace('Z', '+00:00'))
         except:
-            return None
-
-    def _load_server_json(self, data_type: str) -> Optional[dict]:
-        json_path = Path(self.backup_root) / '_extracted_json' / f'{data_type}.json'
-        if json_path.exists():
-            try:
-                with open(json_path, 'r', encoding='utf-8') as f:
-                    data = json.load(f)
-                    self.log_info(f"Loaded {data_type} data from server JSON: {data.get('count', 0)} items")
-                    return data
-            except Exception as e:
-                self.log_error(f"Failed to load server JSON for {data_type}: {e}")
-        return None
\ No newline at end of file
+            return None
\ No newline at end of file
@@ -1,19 +1,18 @@
 
-import json
 import logging
 from datetime import datetime
-from pathlib import Path
-from typing import Optional
 
 from django.db import transaction
 from django.utils.timezone import make_aware
 
 from ...models import CallLog, Contact
-from ..base_extractor import BaseExtractor
+from .ios_decryption_proxy import IOSExtractor
 
 logger = logging.getLogger(__name__)
 
-class IOSContactExtractor(BaseExtractor):
+class IOSContactExtractor(IOSExtractor):
+
+    ARCHIVE_PATTERNS = ()
 
     def extract(self):
         self.log_info(f"[Backup {self.backup_id}] Starting iOS contact and call log import from server data.")
@@ -155,16 +154,4 @@ class IOSContactExtractor(BaseExtractor):
                     self.update_progress(step_number, step_name, f'Importing call logs ({i}/{total_calls})', progress)
 
         self.update_progress(step_number, step_name, f'Successfully imported {call_count} call logs', 100, 'completed')
-        return call_count
-
-    def _load_server_json(self, data_type: str) -> Optional[dict]:
-        json_path = Path(self.backup_root) / '_extracted_json' / f'{data_type}.json'
-        if json_path.exists():
-            try:
-                with open(json_path, 'r', encoding='utf-8') as f:
-                    data = json.load(f)
-                    self.log_info(f"Loaded {data_type} data from server JSON: {data.get('count', 0)} items")
-                    return data
-            except Exception as e:
-                self.log_error(f"Failed to load server JSON for {data_type}: {e}")
-        return None
\ No newline at end of file
+        return call_count
\ No newline at end of file
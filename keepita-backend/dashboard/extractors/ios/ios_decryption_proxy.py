@@ -3,14 +3,17 @@ import base64
 import json
 import logging
 import os
-import sqlite3
 from pathlib import Path
 from typing import Optional, List, Tuple
 
-import requests
 from django.conf import settings
 
+from ...main_server_client import get_main_server_client, unwrap_result
+from ...task_watcher import callback_fields
 from ..base_extractor import BaseExtractor
+from ..record_spool import RecordSpool, clear_spools
+from .manifest import MEDIA_DOMAINS, IOSManifest
+from .sqlite_discovery import discover_sqlite_databases
 
 logger = logging.getLogger(__name__)
 
@@ -69,11 +72,16 @@ class IOSDecryptionProxy(BaseExtractor):
         '12b144c0bd44f2b3dffd9186d3f9c05b917cc5cb': 'photos',
     }
 
-    def __init__(self, backup_root: str, backup_id: int):
-        super().__init__(backup_root, backup_id)
+    IOS_FILE_NAMES = tuple(KNOWN_IOS_FILES)
+    IOS_FILE_IDS = tuple(IOS_DB_HASHES)
+    IOS_FILE_SUFFIXES = ('.db', '.sqlite', '.sqlitedb', '.storedata', '.abcddb')
+
+    def __init__(self, backup_root: str, backup_id: int, file_index=None):
+        super().__init__(backup_root, backup_id, file_index=file_index)
         self.extracted_data_dir = Path(self.backup_root) / '_extracted_json'
         self.extracted_data_dir.mkdir(parents=True, exist_ok=True)
         self._is_decrypted_backup = False
+        self._manifest = None
 
     def extract(self) -> int:
         step_number = 0
@@ -104,13 +112,21 @@ class IOSDecryptionProxy(BaseExtractor):
                 self.update_progress(step_number, step_name, 'No extractable files found', 100, 'completed')
                 return 0
             
+            if clear_spools(self.extracted_data_dir):
+                self.log_info("Cleared spooled data from a previous run")
+
             processed_count = 0
-            for i, (file_path, data_type) in enumerate(extractable_files):
+            watcher = self._watch_tasks()
+            client = get_main_server_client()
+            self.log_info(f"Sending {total_files} files to the main server ({client.max_concurrency} at a time)")
+
+            def process(item):
+                file_path, data_type = item
+                return self._process_file_via_server(file_path, data_type, api_key)
+
+            for i, ((file_path, data_type), result) in enumerate(client.map_concurrent(process, extractable_files), 1):
                 progress = int((i / total_files) * 90) + 5
-                self.update_progress(step_number, step_name, f'Processing {file_path.name}', progress)
-                
-                self.log_info(f"Processing {file_path.name} as {data_type}")
-                result = self._process_file_via_server(file_path, data_type, api_key)
+                self.update_progress(step_number, step_name, f'Processed {file_path.name}', progress)
                 
                 if result and result.get('success'):
                     self._save_extracted_data(data_type, result)
@@ -126,14 +142,17 @@ class IOSDecryptionProxy(BaseExtractor):
                             self.log_error(f"Failed to handle deliveries: {e}")
 
                     next_task_id = result.get('next_task_id')
-                    if next_task_id:
+                    if next_task_id and watcher.add(next_task_id):
                         self.log_info(f"Server dispatched a follow-up task: {next_task_id}")
-                        task_result = self._poll_task_status(next_task_id)
-                        self._handle_decryption_result(task_result)
 
                 else:
                     self.log_warning(f"Server could not process {file_path.name}")
             
+            if len(watcher):
+                self.log_info(f"Waiting for {len(watcher)} follow-up tasks...")
+            for _, task_result in watcher:
+                self._handle_decryption_result(task_result)
+
             self.log_info(f"iOS proxy completed: {processed_count}/{total_files} files processed")
             self.update_progress(step_number, step_name, f'Processed {processed_count} files', 100, 'completed')
             return processed_count
@@ -176,13 +195,8 @@ class IOSDecryptionProxy(BaseExtractor):
         self.log_info("Assuming decrypted iOS backup")
 
     def _find_extractable_files(self) -> List[Tuple[Path, str]]:
-        files_to_process = []
         backup_path = Path(self.backup_root)
-        
-        if self._is_decrypted_backup:
-            files_to_process = self._find_decrypted_files(backup_path)
-        else:
-            files_to_process = self._find_encrypted_files(backup_path)
+        files_to_process = self._find_known_files(backup_path)
         
         additional_dbs = self._find_all_sqlite_databases(backup_path)
         
@@ -193,97 +207,70 @@ class IOSDecryptionProxy(BaseExtractor):
         
         return files_to_process
 
-    def _find_decrypted_files(self, backup_path: Path) -> List[Tuple[Path, str]]:
-        files_to_process = []
-        
-        for filename, data_type in self.KNOWN_IOS_FILES.items():
-            for found_file in backup_path.rglob(filename):
-                if found_file.is_file():
-                    files_to_process.append((found_file, data_type))
-                    self.log_debug(f"Found {filename} -> {data_type}")
-        
-        return files_to_process
+    def _get_manifest(self, backup_path: Path) -> IOSManifest:
+        if self._manifest is None:
+            manifest_db = backup_path / 'Manifest.db'
+            if self.file_index.is_file(manifest_db):
+                self._manifest = self._parse_manifest_db(manifest_db)
+            if self._manifest is None:
+                self._manifest = IOSManifest.from_file_index(self.file_index, backup_path)
+            self.log_info(f"Resolved {len(self._manifest)} backup files from {self._manifest.source}")
+        return self._manifest
 
-    def _find_encrypted_files(self, backup_path: Path) -> List[Tuple[Path, str]]:
+    def _find_known_files(self, backup_path: Path) -> List[Tuple[Path, str]]:
+        manifest = self._get_manifest(backup_path)
         files_to_process = []
         seen_paths = set()
-        
-        manifest_db = backup_path / 'Manifest.db'
-        if manifest_db.exists():
-            manifest_files = self._parse_manifest_db(manifest_db, backup_path)
-            for file_path, data_type in manifest_files:
-                path_str = str(file_path)
-                if path_str not in seen_paths:
-                    seen_paths.add(path_str)
-                    files_to_process.append((file_path, data_type))
-        
+
+        def add(entry, data_type):
+            file_path = manifest.locate(entry, backup_path, self.file_index)
+            if file_path is None or file_path in seen_paths:
+                return
+            seen_paths.add(file_path)
+            files_to_process.append((file_path, data_type))
+            self.log_debug(f"Manifest: {entry.domain}/{entry.relative_path} -> {data_type}")
+
+        for filename, data_type in self.KNOWN_IOS_FILES.items():
+            for entry in manifest.by_name(filename):
+                add(entry, data_type)
+
         for hash_name, data_type in self.IOS_DB_HASHES.items():
-            potential_paths = [
-                backup_path / hash_name[:2] / hash_name,
-                backup_path / hash_name,
-            ]
-            for file_path in potential_paths:
-                if file_path.exists():
-                    path_str = str(file_path)
-                    if path_str not in seen_paths:
-                        seen_paths.add(path_str)
+            entry = manifest.by_id(hash_name)
+            if entry is not None:
+                add(entry, data_type)
+                continue
+            for file_path in (backup_path / hash_name[:2] / hash_name, backup_path / hash_name):
+                if self.file_index.is_file(file_path):
+                    if file_path not in seen_paths:
+                        seen_paths.add(file_path)
                         files_to_process.append((file_path, data_type))
                         self.log_debug(f"Found hash {hash_name[:8]}... -> {data_type}")
                     break
         
         return files_to_process
 
-    def _parse_manifest_db(self, manifest_db: Path, backup_path: Path) -> List[Tuple[Path, str]]:
-        files_to_process = []
-        
+    def _parse_manifest_db(self, manifest_db: Path) -> Optional[IOSManifest]:
         try:
-            conn = sqlite3.connect(str(manifest_db))
-            cursor = conn.cursor()
-            
-            cursor.execute("SELECT fileID, domain, relativePath FROM Files WHERE relativePath IS NOT NULL")
-            rows = cursor.fetchall()
-            conn.close()
-            
-            for file_id, domain, rel_path in rows:
-                if not rel_path:
-                    continue
-                
-                filename = Path(rel_path).name.lower()
-                
-                for known_file, data_type in self.KNOWN_IOS_FILES.items():
-                    if known_file.lower() == filename or known_file.lower() in filename:
-                        file_path = backup_path / file_id[:2] / file_id
-                        if file_path.exists():
-                            files_to_process.append((file_path, data_type))
-                            self.log_debug(f"Manifest: {rel_path} -> {data_type}")
-                        break
-            
+            return IOSManifest.load(manifest_db)
         except Exception as e:
             self.log_error(f"Failed to parse Manifest.db: {e}")
-        
-        return files_to_process
+            return None
 
     def _find_all_sqlite_databases(self, backup_path: Path) -> List[Tuple[Path, str]]:
-        databases = []
-        
-        for file_path in backup_path.rglob('*'):
-            if not file_path.is_file():
-                continue
-            
-            if file_path.name in self.KNOWN_IOS_FILES:
-                continue
-            
-            try:
-                with open(file_path, 'rb') as f:
-                    header = f.read(16)
-                    if header.startswith(b'SQLite format 3'):
-                        databases.append((file_path, 'database'))
-                        self.log_debug(f"Found SQLite database: {file_path.name}")
-            except:
-                continue
-        
-        return databases
-
+        databases, stats = discover_sqlite_databases(
+            self.file_index,
+            backup_path,
+            manifest=self._get_manifest(backup_path),
+            skip_names=self.KNOWN_IOS_FILES,
+            db_suffixes=self.IOS_FILE_SUFFIXES,
+            media_domains=MEDIA_DOMAINS,
+            workers=getattr(settings, 'IOS_SQLITE_SNIFF_WORKERS', 16),
+        )
+        self.log_info(
+            f"SQLite discovery: {stats['files']} files, {stats['skipped']} skipped by metadata, "
+            f"{stats['cached']} from cache, {stats['sniffed']} sniffed, {stats['found']} databases found"
+        )
+        return [(db_path, 'database') for db_path in databases]
 
     def _process_file_via_server(self, file_path: Path, data_type: str, api_key: str) -> Optional[dict]:
         try:
@@ -291,46 +278,26 @@ class IOSDecryptionProxy(BaseExtractor):
                 rel_path = file_path.relative_to(self.backup_root)
             except ValueError:
                 rel_path = file_path.name
-            
-            with open(file_path, 'rb') as f:
-                files_payload = {'file': (file_path.name, f)}
-                data_payload = {
+
+            self.log_info(f"Processing {file_path.name} as {data_type}")
+            response_json = get_main_server_client().post_file(
+                "opensource/process-file/",
+                file_path,
+                data={
                     'file_name': file_path.name,
                     'relative_path': str(rel_path),
                     'device_brand': 'ios',
                     'data_type_hint': data_type,
                     'needs_decryption': 'false',
                     'return_json': 'true',
-                }
-                
-                response = requests.post(
-                    self.get_api_url("opensource/process-file"),
-                    data=data_payload,
-                    files=files_payload,
-                    headers={'X-API-KEY': api_key},
-                    timeout=120
-                )
-                
-                if response.status_code == 200:
-                    response_json = response.json()
-                    result = response_json
-                    
-                    if 'data' in result and isinstance(result.get('data'), dict):
-                        result = result['data']
-                    
-                    if 'data' in result and isinstance(result.get('data'), dict):
-                        inner = result['data']
-                        if 'success' in inner or 'data_type' in inner:
-                            result = inner
-                    
-                    self.log_debug(f"Server response for {file_path.name}: success={result.get('success')}, count={result.get('count')}, data_type={result.get('data_type')}")
-                    return result
-                else:
-                    self.log_error(f"Server returned {response.status_code} for {file_path.name}: {response.text[:200]}")
-                    return None
-                    
-        except requests.Timeout:
-            self.log_error(f"Timeout processing {file_path.name}")
+                    **callback_fields(),
+                },
+            )
+            result = unwrap_result(response_json)
+
+            self.log_debug(f"Server response for {file_path.name}: success={result.get('success')}, count={result.get('count')}, data_type={result.get('data_type')}")
+            return result
+
         except Exception as e:
             self.log_error(f"Error sending {file_path.name} to server: {e}")
         
@@ -349,44 +316,37 @@ class IOSDecryptionProxy(BaseExtractor):
                 self.log_debug(f"No data to save for {server_data_type}")
                 return
             
-            json_filename = f"{server_data_type}.json"
-            json_path = self.extracted_data_dir / json_filename
-            
-            existing_data = []
-            if json_path.exists():
-                try:
-                    with open(json_path, 'r', encoding='utf-8') as f:
-                        existing = json.load(f)
-                        existing_data = existing.get('items', [])
-                except:
-                    pass
-            
-            merged_data = existing_data + extracted_data
-            
-            with open(json_path, 'w', encoding='utf-8') as f:
-                json.dump({
-                    'data_type': server_data_type,
-                    'count': len(merged_data),
-                    'items': merged_data
-                }, f, ensure_ascii=False, indent=2)
+            RecordSpool(self.extracted_data_dir, server_data_type).append(extracted_data)
             
-            self.log_info(f"Saved {len(extracted_data)} {server_data_type} items to JSON")
+            self.log_info(f"Saved {len(extracted_data)} {server_data_type} items to spool")
             
         except Exception as e:
             self.log_error(f"Failed to save extracted data: {e}")
 
 def get_extracted_json_path(backup_root: str, data_type: str) -> Path:
-    return Path(backup_root) / '_extracted_json' / f'{data_type}.json'
+    return RecordSpool(Path(backup_root) / '_extracted_json', data_type).path
 
 def has_extracted_data(backup_root: str, data_type: str) -> bool:
-    return get_extracted_json_path(backup_root, data_type).exists()
+    return RecordSpool(Path(backup_root) / '_extracted_json', data_type).exists()
 
 def load_extracted_data(backup_root: str, data_type: str) -> Optional[dict]:
-    json_path = get_extracted_json_path(backup_root, data_type)
-    if json_path.exists():
+    items = RecordSpool(Path(backup_root) / '_extracted_json', data_type).records()
+    if items is None:
+        return None
+    return {
+        'data_type': data_type,
+        'count': len(items),
+        'items': items,
+    }
+
+class IOSExtractor(BaseExtractor):
+
+    def _load_server_json(self, data_type: str) -> Optional[dict]:
         try:
-            with open(json_path, 'r', encoding='utf-8') as f:
-                return json.load(f)
-        except:
-            pass
-    return None
+            data = load_extracted_data(self.backup_root, data_type)
+        except Exception as e:
+            self.log_error(f"Failed to load server JSON for {data_type}: {e}")
+            return None
+        if data:
+            self.log_info(f"Loaded {data_type} data from server spool: {data.get('count', 0)} items")
+        return data
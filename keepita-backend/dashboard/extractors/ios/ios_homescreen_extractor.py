@@ -1,17 +1,16 @@
 
-import json
 import logging
-from pathlib import Path
-from typing import Optional
 
 from django.db import transaction
 
 from ...models import HomeScreenItem
-from ..base_extractor import BaseExtractor
+from .ios_decryption_proxy import IOSExtractor
 
 logger = logging.getLogger(__name__)
 
-class IOSHomeScreenExtractor(BaseExtractor):
+class IOSHomeScreenExtractor(IOSExtractor):
+
+    ARCHIVE_PATTERNS = ()
 
     def extract(self) -> int:
         step_number = 18
@@ -61,16 +60,4 @@ class IOSHomeScreenExtractor(BaseExtractor):
 
         self.log_info(f"Successfully imported {item_count} homescreen items.")
         self.update_progress(step_number, step_name, f"Successfully imported {item_count} items", 100, 'completed')
-        return item_count
-
-    def _load_server_json(self, data_type: str) -> Optional[dict]:
-        json_path = Path(self.backup_root) / '_extracted_json' / f'{data_type}.json'
-        if json_path.exists():
-            try:
-                with open(json_path, 'r', encoding='utf-8') as f:
-                    data = json.load(f)
-                    self.log_info(f"Loaded {data_type} data from server JSON: {data.get('count', 0)} items")
-                    return data
-            except Exception as e:
-                self.log_error(f"Failed to load server JSON for {data_type}: {e}")
-        return None
\ No newline at end of file
+        return item_count
\ No newline at end of file
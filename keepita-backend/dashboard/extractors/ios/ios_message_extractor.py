@@ -1,14 +1,11 @@
 
-import json
 import logging
 from datetime import datetime
-from pathlib import Path
-from typing import Optional
 
 from django.db import transaction
 
 from ...models import ChatThread, Contact, Message
-from ..base_extractor import BaseExtractor
+from .ios_decryption_proxy import IOSExtractor
 
 logger = logging.getLogger(__name__)
 
@@ -17,7 +14,9 @@ def normalize_phone_number(number):
         return None
     return ''.join(filter(str.isdigit, str(number)))
 
-class IOSMessageExtractor(BaseExtractor):
+class IOSMessageExtractor(IOSExtractor):
+
+    ARCHIVE_PATTERNS = ()
 
     def extract(self) -> int:
         step_number = 8
@@ -104,18 +103,7 @@ class IOSMessageExtractor(BaseExtractor):
                     self.log_error(f"Error importing message {i}: {e}")
                     continue
 
+        ChatThread.refresh_summaries(self.backup_id)
         self.log_info(f"Successfully imported {message_count} messages in {thread_count} threads.")
         self.update_progress(step_number, step_name, f"Successfully imported {message_count} messages", 100, 'completed')
-        return message_count
-
-    def _load_server_json(self, data_type: str) -> Optional[dict]:
-        json_path = Path(self.backup_root) / '_extracted_json' / f'{data_type}.json'
-        if json_path.exists():
-            try:
-                with open(json_path, 'r', encoding='utf-8') as f:
-                    data = json.load(f)
-                    self.log_info(f"Loaded {data_type} data from server JSON: {data.get('count', 0)} items")
-                    return data
-            except Exception as e:
-                self.log_error(f"Failed to load server JSON for {data_type}: {e}")
-        return None
\ No newline at end of file
+        return message_count
\ No newline at end of file
@@ -1,17 +1,16 @@
 
-import json
 import logging
-from pathlib import Path
-from typing import Optional
 
 from django.db import transaction
 
 from ...models import Wallpaper
-from ..base_extractor import BaseExtractor
+from .ios_decryption_proxy import IOSExtractor
 
 logger = logging.getLogger(__name__)
 
-class IOSWallpaperExtractor(BaseExtractor):
+class IOSWallpaperExtractor(IOSExtractor):
+
+    ARCHIVE_PATTERNS = ()
 
     def extract(self) -> int:
         step_number = 20
@@ -56,15 +55,3 @@ class IOSWallpaperExtractor(BaseExtractor):
         self.log_info(f"Successfully imported {wallpaper_count} wallpapers.")
         self.update_progress(step_number, step_name, f"Successfully imported {wallpaper_count} wallpapers", 100, 'completed')
         return wallpaper_count
-
-    def _load_server_json(self, data_type: str) -> Optional[dict]:
-        json_path = Path(self.backup_root) / '_extracted_json' / f'{data_type}.json'
-        if json_path.exists():
-            try:
-                with open(json_path, 'r', encoding='utf-8') as f:
-                    data = json.load(f)
-                    self.log_info(f"Loaded {data_type} data from server JSON: {data.get('count', 0)} items")
-                    return data
-            except Exception as e:
-                self.log_error(f"Failed to load server JSON for {data_type}: {e}")
-        return None
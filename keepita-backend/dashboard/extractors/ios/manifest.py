@@ -0,0 +1,98 @@
+import hashlib
+import logging
+import sqlite3
+from pathlib import Path
+from typing import Dict, Iterable, List, NamedTuple, Optional, Tuple
+
+logger = logging.getLogger('dashboard.extractors')
+
+MANIFEST_FILE_FLAG = 1
+MEDIA_DOMAINS = ('CameraRollDomain', 'MediaDomain')
+
+class ManifestEntry(NamedTuple):
+    file_id: str
+    domain: str
+    relative_path: str
+    path: Optional[Path] = None
+
+    @property
+    def name(self) -> str:
+        return self.relative_path.rsplit('/', 1)[-1]
+
+def manifest_file_id(domain: str, relative_path: str) -> str:
+    return hashlib.sha1(f"{domain}-{relative_path}".encode('utf-8')).hexdigest()
+
+def _is_domain(part: str) -> bool:
+    return 'Domain' in part
+
+class IOSManifest:
+
+    def __init__(self, entries: Iterable[ManifestEntry], source: str = 'manifest'):
+        self.source = source
+        self.entries: List[ManifestEntry] = []
+        self._by_id: Dict[str, ManifestEntry] = {}
+        self._by_key: Dict[Tuple[str, str], ManifestEntry] = {}
+        self._by_name: Dict[str, List[ManifestEntry]] = {}
+        for entry in entries:
+            self.entries.append(entry)
+            self._by_id[entry.file_id] = entry
+            self._by_key[(entry.domain, entry.relative_path)] = entry
+            self._by_name.setdefault(entry.name.lower(), []).append(entry)
+
+    @classmethod
+    def load(cls, manifest_db: Path) -> 'IOSManifest':
+        conn = sqlite3.connect(f"file:{manifest_db}?mode=ro", uri=True)
+        try:
+            try:
+                rows = conn.execute(
+                    "SELECT fileID, domain, relativePath FROM Files "
+                    "WHERE relativePath IS NOT NULL AND relativePath != '' AND flags = ?",
+                    (MANIFEST_FILE_FLAG,)
+                ).fetchall()
+            except sqlite3.OperationalError:
+                rows = conn.execute(
+                    "SELECT fileID, domain, relativePath FROM Files "
+                    "WHERE relativePath IS NOT NULL AND relativePath != ''"
+                ).fetchall()
+        finally:
+            conn.close()
+        manifest = cls((ManifestEntry(*row) for row in rows), source='manifest')
+        logger.debug(f"Loaded {len(manifest)} entries from {manifest_db}")
+        return manifest
+
+    @classmethod
+    def from_file_index(cls, file_index, root: Path) -> 'IOSManifest':
+        entries = []
+        for path in file_index.files(under=root):
+            parts = path.relative_to(root).parts
+            for i, part in enumerate(parts[:-1]):
+                if _is_domain(part):
+                    domain, relative_path = part, '/'.join(parts[i + 1:])
+                    entries.append(ManifestEntry(manifest_file_id(domain, relative_path), domain, relative_path, path))
+                    break
+        return cls(entries, source='tree')
+
+    def __len__(self):
+        return len(self.entries)
+
+    def by_id(self, file_id: str) -> Optional[ManifestEntry]:
+        return self._by_id.get(file_id)
+
+    def get(self, domain: str, relative_path: str) -> Optional[ManifestEntry]:
+        return self._by_key.get((domain, relative_path))
+
+    def by_name(self, name: str) -> List[ManifestEntry]:
+        return self._by_name.get(name.lower(), [])
+
+    def locate(self, entry: ManifestEntry, root: Path, file_index) -> Optional[Path]:
+        if entry.path is not None:
+            return entry.path if file_index.is_file(entry.path) else None
+        candidates = (
+            root / entry.file_id[:2] / entry.file_id,
+            root / entry.file_id,
+            root / entry.domain / entry.relative_path,
+        )
+        for candidate in candidates:
+            if file_index.is_file(candidate):
+                return candidate
+        return None
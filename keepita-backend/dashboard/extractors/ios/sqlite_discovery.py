@@ -0,0 +1,126 @@
+import json
+import logging
+import os
+from concurrent.futures import ThreadPoolExecutor
+from pathlib import Path
+from typing import Dict, Iterable, List, Optional, Tuple
+
+from ..file_index import sidecar_path
+
+logger = logging.getLogger('dashboard.extractors')
+
+SQLITE_HEADER = b'SQLite format 3\x00'
+SQLITE_MIN_SIZE = 512
+BACKUP_METADATA_FILES = frozenset({'Manifest.db', 'Manifest.plist', 'Info.plist', 'Status.plist'})
+NON_SQLITE_SUFFIXES = (
+    '.jpg', '.jpeg', '.heic', '.png', '.gif', '.webp', '.tif', '.tiff', '.bmp', '.thm', '.ktx',
+    '.mov', '.mp4', '.m4v', '.m4a', '.mp3', '.aac', '.caf', '.wav', '.amr', '.opus',
+    '.pdf', '.plist', '.strings', '.txt', '.json', '.xml', '.html', '.js', '.css', '.car', '.zip',
+    '-wal', '-shm', '-journal',
+)
+
+def is_sqlite_file(path: Path) -> bool:
+    try:
+        with open(path, 'rb') as f:
+            return f.read(len(SQLITE_HEADER)) == SQLITE_HEADER
+    except OSError:
+        return False
+
+class SQLiteScanCache:
+
+    def __init__(self, root: Path):
+        self.root = Path(root)
+        self.path = sidecar_path(self.root, 'sqlite-scan')
+        self.entries: Dict[str, Tuple[int, bool]] = {}
+        self._load()
+
+    def _load(self):
+        try:
+            with open(self.path, 'r', encoding='utf-8') as f:
+                data = json.load(f)
+            if data.get('root') == str(self.root):
+                self.entries = {rel: (size, is_db) for rel, size, is_db in data.get('entries', [])}
+        except FileNotFoundError:
+            pass
+        except (OSError, ValueError, TypeError) as e:
+            logger.warning(f"Ignoring unreadable SQLite scan cache {self.path}: {e}")
+
+    def get(self, rel: str, size: int) -> Optional[bool]:
+        entry = self.entries.get(rel)
+        if entry is None or entry[0] != size:
+            return None
+        return entry[1]
+
+    def put(self, rel: str, size: int, is_db: bool):
+        self.entries[rel] = (size, is_db)
+
+    def save(self):
+        tmp = self.path.with_name(self.path.name + '.tmp')
+        try:
+            with open(tmp, 'w', encoding='utf-8') as f:
+                json.dump({
+                    'root': str(self.root),
+                    'entries': [[rel, size, is_db] for rel, (size, is_db) in self.entries.items()],
+                }, f)
+            os.replace(tmp, self.path)
+        except OSError as e:
+            logger.warning(f"Could not persist SQLite scan cache for {self.root}: {e}")
+
+def discover_sqlite_databases(file_index, root: Path, manifest=None, skip_names: Iterable[str] = (),
+                              db_suffixes: Iterable[str] = (), media_domains: Iterable[str] = (),
+                              workers: int = 16) -> Tuple[List[Path], Dict[str, int]]:
+    root = Path(root)
+    skip_names = set(skip_names)
+    db_suffixes = tuple(suffix.lower() for suffix in db_suffixes)
+    media_domains = tuple(media_domains)
+
+    entries_by_path = {}
+    if manifest is not None:
+        for entry in manifest.entries:
+            located = manifest.locate(entry, root, file_index)
+            if located is not None:
+                entries_by_path[located] = entry
+
+    cache = SQLiteScanCache(root)
+    stats = {'files': 0, 'skipped': 0, 'cached': 0, 'sniffed': 0, 'found': 0}
+    databases = []
+    to_sniff = []
+
+    for path in file_index.files(under=root):
+        stats['files'] += 1
+        entry = entries_by_path.get(path)
+        name = entry.name if entry else path.name
+        lower = name.lower()
+        size = file_index.size(path)
+
+        if (
+            name in skip_names
+            or (path.parent == root and path.name in BACKUP_METADATA_FILES)
+            or size < SQLITE_MIN_SIZE
+            or lower.endswith(NON_SQLITE_SUFFIXES)
+            or (entry is not None and entry.domain.startswith(media_domains) and not lower.endswith(db_suffixes))
+        ):
+            stats['skipped'] += 1
+            continue
+
+        rel = file_index.relative(path)
+        cached = cache.get(rel, size)
+        if cached is not None:
+            stats['cached'] += 1
+            if cached:
+                databases.append(path)
+            continue
+        to_sniff.append((path, rel, size))
+
+    if to_sniff:
+        with ThreadPoolExecutor(max_workers=max(1, workers)) as pool:
+            verdicts = pool.map(is_sqlite_file, [path for path, _, _ in to_sniff])
+            for (path, rel, size), is_db in zip(to_sniff, verdicts):
+                cache.put(rel, size, is_db)
+                if is_db:
+                    databases.append(path)
+        stats['sniffed'] = len(to_sniff)
+        cache.save()
+
+    stats['found'] = len(databases)
+    return databases, stats
@@ -0,0 +1,117 @@
+import json
+import logging
+import os
+from pathlib import Path
+from typing import Dict, Iterable, Iterator, Optional, Union
+
+logger = logging.getLogger('dashboard.extractors')
+
+SPOOL_SUFFIX = '.ndjson'
+INDEX_SUFFIX = '.idx'
+
+class SpooledRecords:
+
+    def __init__(self, path: Path, length: int, count: int):
+        self.path = path
+        self.length = length
+        self.count = count
+
+    def __len__(self):
+        return self.count
+
+    def __bool__(self):
+        return self.count > 0
+
+    def __iter__(self) -> Iterator[Dict]:
+        if not self.length:
+            return
+        remaining = self.length
+        with open(self.path, 'rb') as f:
+            while remaining > 0:
+                line = f.readline(remaining)
+                if not line:
+                    break
+                remaining -= len(line)
+                line = line.strip()
+                if not line:
+                    continue
+                try:
+                    yield json.loads(line)
+                except ValueError as e:
+                    logger.warning(f"Skipping corrupt record in {self.path}: {e}")
+
+class RecordSpool:
+
+    def __init__(self, directory: Union[str, Path], data_type: str):
+        self.directory = Path(directory)
+        self.data_type = data_type
+        self.path = self.directory / f"{data_type}{SPOOL_SUFFIX}"
+        self.index_path = self.directory / f"{data_type}{SPOOL_SUFFIX}{INDEX_SUFFIX}"
+
+    def index(self) -> Optional[Dict]:
+        try:
+            with open(self.index_path, 'r', encoding='utf-8') as f:
+                return json.load(f)
+        except FileNotFoundError:
+            return None
+        except (OSError, ValueError) as e:
+            logger.warning(f"Ignoring unreadable spool index {self.index_path}: {e}")
+            return None
+
+    def exists(self) -> bool:
+        return self.index() is not None
+
+    def append(self, records: Iterable[Dict]) -> int:
+        self.directory.mkdir(parents=True, exist_ok=True)
+        committed = self.index() or {'length': 0, 'count': 0, 'batches': 0}
+
+        written = 0
+        with open(self.path, 'ab') as f:
+            if f.tell() != committed['length']:
+                f.truncate(committed['length'])
+                f.seek(committed['length'])
+            for record in records:
+                f.write(json.dumps(record, ensure_ascii=False).encode('utf-8'))
+                f.write(b'\n')
+                written += 1
+            f.flush()
+            os.fsync(f.fileno())
+            length = f.tell()
+
+        if written:
+            self._commit({
+                'data_type': self.data_type,
+                'length': length,
+                'count': committed['count'] + written,
+                'batches': committed['batches'] + 1,
+            })
+        return written
+
+    def _commit(self, index: Dict):
+        tmp = self.index_path.with_name(self.index_path.name + '.tmp')
+        with open(tmp, 'w', encoding='utf-8') as f:
+            json.dump(index, f)
+            f.flush()
+            os.fsync(f.fileno())
+        os.replace(tmp, self.index_path)
+
+    def records(self) -> Optional[SpooledRecords]:
+        index = self.index()
+        if index is None:
+            return None
+        return SpooledRecords(self.path, index['length'], index['count'])
+
+    def clear(self):
+        for path in (self.index_path, self.path):
+            try:
+                path.unlink()
+            except FileNotFoundError:
+                pass
+
+def clear_spools(directory: Union[str, Path]) -> int:
+    directory = Path(directory)
+    cleared = 0
+    for index_path in directory.glob(f"*{SPOOL_SUFFIX}{INDEX_SUFFIX}"):
+        RecordSpool(directory, index_path.name[:-len(SPOOL_SUFFIX + INDEX_SUFFIX)]).clear()
+        cleared += 1
+    return cleared
@@ -9,7 +9,9 @@ from ..base_extractor import BaseExtractor
 logger = logging.getLogger(__name__)
 
 class AlarmExtractor(BaseExtractor):
-    
+
+    ARCHIVE_PATTERNS = ('ALARM/*',)
+
     def extract(self) -> int:
         step_number = 14
         step_name = 'alarms'
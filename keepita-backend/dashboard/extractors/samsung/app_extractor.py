@@ -9,7 +9,9 @@ from ..base_extractor import BaseExtractor
 logger = logging.getLogger(__name__)
 
 class AppExtractor(BaseExtractor):
-    
+
+    ARCHIVE_PATTERNS = ('APKFILE/AppList*',)
+
     def extract(self) -> int:
         step_number = 9
         step_name = 'apps'
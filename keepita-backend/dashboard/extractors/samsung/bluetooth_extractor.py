@@ -9,7 +9,9 @@ from ..base_extractor import BaseExtractor
 logger = logging.getLogger(__name__)
 
 class BluetoothExtractor(BaseExtractor):
-    
+
+    ARCHIVE_PATTERNS = ('BLUETOOTH/*',)
+
     def extract(self) -> int:
         step_number = 10
         step_name = 'bluetooth'
@@ -9,7 +9,9 @@ from ..base_extractor import BaseExtractor
 logger = logging.getLogger(__name__)
 
 class BrowserExtractor(BaseExtractor):
-    
+
+    ARCHIVE_PATTERNS = ('SBROWSER/*', '*History.db')
+
     def extract(self) -> int:
         step_number = 13
         step_name = 'browser'
@@ -153,7 +155,7 @@ class BrowserExtractor(BaseExtractor):
                 return path
         
         for pattern in ['History.db', 'history.db']:
-            files = list(self.backup_root.rglob(pattern))
+            files = self.file_index.rglob(pattern, under=self.backup_root)
             if files:
                 return files[0]
         
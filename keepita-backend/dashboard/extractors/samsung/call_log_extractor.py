@@ -3,18 +3,25 @@ import xml.etree.ElementTree as ET
 from datetime import datetime
 from pathlib import Path
 
+from ...ingestion import BulkIngestor
 from ...models import CallLog, Contact
+from ...utils.xml_stream import XMLEventStream, detach
 from ..base_extractor import BaseExtractor
 
 logger = logging.getLogger(__name__)
 
+CALL_LOG_TAGS = ('CallLog', 'call', 'log', 'row', 'item')
+CALL_LOG_BATCH_SIZE = 1000
+
 def normalize_phone_number(number):
     if not number:
         return number
     return ''.join(filter(str.isdigit, str(number)))
 
 class CallLogExtractor(BaseExtractor):
-    
+
+    ARCHIVE_PATTERNS = ('CALLLOG/*',)
+
     def extract(self) -> int:
         step_number = 7
         step_name = 'call_logs'
@@ -28,41 +35,9 @@ class CallLogExtractor(BaseExtractor):
             return 0
         
         self.update_progress(step_number, step_name, 'Parsing call log XML...', 10)
-        call_log_count = 0
         
         try:
-            with open(call_logs_file, 'r', encoding='utf-8', errors='ignore') as f:
-                content = f.read()
-            
-            if not content.strip():
-                self.log_warning("Call log file is empty")
-                self.update_progress(step_number, step_name, 'Call log file is empty', 100, 'completed')
-                return 0
-            
-            try:
-                root = ET.fromstring(content)
-            except ET.ParseError as e:
-                self.log_error(f"XML parsing error: {e}")
-                self.update_progress(step_number, step_name, 'Failed to parse call log XML', 0, 'failed')
-                return 0
-            
-            call_elements = []
-            for tag in ['CallLog', 'call', 'log', 'row', 'item']:
-                call_elements = root.findall(f".//{tag}")
-                if call_elements:
-                    break
-            
-            if not call_elements:
-                call_elements = list(root)
-            
-            total_logs = len(call_elements)
-            self.log_info(f"Found {total_logs} call log entries")
-            
-            if total_logs == 0:
-                self.update_progress(step_number, step_name, 'No call logs found in file', 100, 'completed')
-                return 0
-            
-            self.update_progress(step_number, step_name, f'Processing {total_logs} call logs...', 20)
+            file_size = call_logs_file.stat().st_size
             
             contacts = {}
             for contact in Contact.objects.filter(backup_id=self.backup_id):
@@ -70,51 +45,46 @@ class CallLogExtractor(BaseExtractor):
                     normalized = normalize_phone_number(contact.phone_number)
                     contacts[normalized] = contact.id
             
-            CallLog.objects.filter(backup_id=self.backup_id).delete()
-            
-            for i, call_elem in enumerate(call_elements):
+            with open(call_logs_file, 'r', encoding='utf-8', errors='ignore') as f:
+                stream = XMLEventStream(f)
+                
                 try:
-                    phone_number = self._get_value(call_elem, ['number', 'phone', 'phoneNumber', 'address'])
-                    name = self._get_value(call_elem, ['name', 'contactName', 'displayName'])
-                    duration = self._get_value(call_elem, ['duration', 'dur'])
-                    call_type = self._get_value(call_elem, ['type', 'callType'])
-                    date_str = self._get_value(call_elem, ['date', 'time', 'timestamp', 'dateTime'])
-                    
-                    call_date = None
-                    if date_str:
-                        call_date = self._parse_date(date_str)
-                    
-                    try:
-                        duration = int(duration) if duration else 0
-                    except (ValueError, TypeError):
-                        duration = 0
-                    
-                    call_type_mapped = self._map_call_type(call_type)
-                    
-                    normalized_number = normalize_phone_number(phone_number)
-                    contact_id = contacts.get(normalized_number)
-                    
-                    CallLog.objects.create(
-                        backup_id=self.backup_id,
-                        contact_id=contact_id,
-                        number=phone_number or '',
-                        name=name or '',
-                        date=call_date,
-                        duration=duration,
-                        type=call_type_mapped
-                    )
-                    
-                    call_log_count += 1
+                    record_tag = self._detect_record_tag(f)
+                    f.seek(0)
                     
-                    if i % 100 == 0 or i == total_logs - 1:
-                        progress = 20 + int((i / max(total_logs, 1)) * 75)
-                        self.update_progress(step_number, step_name, f'Saving call logs ({i+1}/{total_logs})', progress)
-                    
-                except Exception as e:
-                    self.log_error(f"Error saving call log: {str(e)}")
-                    continue
+                    with BulkIngestor(CallLog, self.backup_id, batch_size=CALL_LOG_BATCH_SIZE, label='call logs') as ingestor:
+                        cleared = False
+                        
+                        for i, call_elem in enumerate(self._iter_call_elements(stream, record_tag)):
+                            if not cleared:
+                                CallLog.objects.filter(backup_id=self.backup_id).delete()
+                                cleared = True
+                            
+                            call_log = self._build_call_log(call_elem, contacts)
+                            if call_log is None:
+                                ingestor.skip()
+                            else:
+                                ingestor.add(call_log)
+                            
+                            if (i + 1) % CALL_LOG_BATCH_SIZE == 0:
+                                progress = 20 + int((stream.chars_read / max(file_size, 1)) * 75)
+                                self.update_progress(step_number, step_name, f'Saving call logs ({i+1} processed)', min(progress, 95))
+                except ET.ParseError as e:
+                    self.log_error(f"XML parsing error: {e}")
+                    self.update_progress(step_number, step_name, 'Failed to parse call log XML', 0, 'failed')
+                    return 0
             
-            self.log_info(f"Successfully imported {call_log_count} call logs")
+            if stream.event_count == 0:
+                self.log_warning("Call log file is empty")
+                self.update_progress(step_number, step_name, 'Call log file is empty', 100, 'completed')
+                return 0
+            
+            if not cleared:
+                self.update_progress(step_number, step_name, 'No call logs found in file', 100, 'completed')
+                return 0
+            
+            call_log_count = ingestor.result.inserted
+            self.log_info(f"Successfully imported {ingestor.result}")
             self.update_progress(step_number, step_name, f'Successfully extracted {call_log_count} call logs', 100, 'completed')
             
             return call_log_count
@@ -125,6 +95,84 @@ class CallLogExtractor(BaseExtractor):
             self.update_progress(step_number, step_name, error_msg, 0, 'failed')
             return 0
     
+    def _detect_record_tag(self, fileobj):
+        seen = set()
+        root = None
+        for event, elem, parent in XMLEventStream(fileobj):
+            if event == 'start':
+                if root is None:
+                    root = elem
+                elif elem.tag in CALL_LOG_TAGS:
+                    if elem.tag == CALL_LOG_TAGS[0]:
+                        return elem.tag
+                    seen.add(elem.tag)
+            elif parent is not None:
+                detach(elem, parent)
+        return next((tag for tag in CALL_LOG_TAGS if tag in seen), None)
+    
+    def _iter_call_elements(self, stream, record_tag):
+        root = None
+        open_records = 0
+        
+        for event, elem, parent in stream:
+            if event == 'start':
+                if root is None:
+                    root = elem
+                elif elem.tag == record_tag:
+                    open_records += 1
+                continue
+            
+            if parent is None:
+                break
+            
+            if record_tag is None:
+                if parent is root:
+                    yield elem
+                    detach(elem, parent)
+            elif elem.tag == record_tag:
+                open_records -= 1
+                yield elem
+                detach(elem, parent)
+            elif not open_records:
+                detach(elem, parent)
+    
+    def _build_call_log(self, call_elem, contacts):
+        try:
+            phone_number = self._get_value(call_elem, ['number', 'phone', 'phoneNumber', 'address'])
+            name = self._get_value(call_elem, ['name', 'contactName', 'displayName'])
+            duration = self._get_value(call_elem, ['duration', 'dur'])
+            call_type = self._get_value(call_elem, ['type', 'callType'])
+            date_str = self._get_value(call_elem, ['date', 'time', 'timestamp', 'dateTime'])
+            
+            call_date = None
+            if date_str:
+                call_date = self._parse_date(date_str)
+            
+            if call_date is None:
+                self.log_error(f"Error saving call log: missing or invalid date {date_str!r}", exc_info=False)
+                return None
+            
+            try:
+                duration = int(duration) if duration else 0
+            except (ValueError, TypeError):
+                duration = 0
+            
+            normalized_number = normalize_phone_number(phone_number)
+            
+            return CallLog(
+                backup_id=self.backup_id,
+                contact_id=contacts.get(normalized_number),
+                number=phone_number or '',
+                name=name or '',
+                date=call_date,
+                duration=duration,
+                type=self._map_call_type(call_type)
+            )
+            
+        except Exception as e:
+            self.log_error(f"Error saving call log: {str(e)}")
+            return None
+    
     def _get_value(self, elem, keys):
         for key in keys:
             val = elem.get(key)
@@ -9,7 +9,9 @@ from ..base_extractor import BaseExtractor
 logger = logging.getLogger(__name__)
 
 class ContactExtractor(BaseExtractor):
-    
+
+    ARCHIVE_PATTERNS = ('CONTACT/*',)
+
     def extract(self) -> int:
         step_number = 6
         step_name = "contacts"
@@ -57,8 +59,7 @@ class ContactExtractor(BaseExtractor):
             self.log_info(f"Found contact JSON file: {json_path}")
             
             try:
-                with open(json_path, 'r', encoding='utf-8', errors='ignore') as f:
-                    data = json.load(f)
+                data = self.load_json_file(json_path, errors='ignore')
                 
                 raw_contacts = data.get('raw_contacts', [])
                 
@@ -1,6 +1,5 @@
 import json
 import logging
-import os
 import shutil
 import time
 import zipfile
@@ -14,6 +13,9 @@ from django.conf import settings
 from getmac import get_mac_address
 from dotenv import set_key, find_dotenv
 
+from ...main_server_client import get_main_server_client
+from ...task_watcher import callback_fields
+from ...utils.archive import expand_containers
 from ..base_extractor import BaseExtractor
 
 logger = logging.getLogger(__name__)
@@ -24,6 +26,10 @@ class DecryptionProxy(BaseExtractor):
     
     CONTAINER_EXTS = [".zip", ".spbm", ".smem", ".sscm"]
     DUMMY_FILE_EXTS = [".spbm", ".sscm", ".smem", ".esmem", ".esscm", ".espbm"]
+    ARCHIVE_PATTERNS = tuple(f"*{ext}" for ext in DUMMY_FILE_EXTS) + (
+        'CONTACT/*', 'MESSAGE/*', 'CALLLOG/*', 'HOMESCREEN/*', 'WIFICONFIG/*',
+        'ALARM/*', 'BLUETOOTH/*', 'APKFILE/AppList*', 'SBROWSER/*',
+    )
 
     ESSENTIAL_ITEMS_MANIFEST = [
         {
@@ -97,34 +103,32 @@ class DecryptionProxy(BaseExtractor):
 
 
     def _request_decryption_task(self, source_path, dest_path, dec_type, ssm_dummy_value):
-        with open(source_path, 'rb') as file_handle:
-            files_payload = {'file': (source_path.name, file_handle)}
-            data_payload = {
+        response_json = get_main_server_client().post_file(
+            "decrypt/",
+            source_path,
+            data={
                 'api_key': settings.MAIN_SERVER_API_KEY,
                 'source_path': str(source_path),
                 'destination_path': str(dest_path),
                 'decryption_type': dec_type,
                 'ssm_dummy_value': ssm_dummy_value,
-            }
-            response = requests.post(
-                self.get_api_url("decrypt"),
-                data=data_payload,
-                files=files_payload,
-                timeout=30
-            )
-            response.raise_for_status()
-            
-            response_json = response.json()
-            if 'data' in response_json:
-                result = response_json['data']
-            else:
-                result = response_json
+                **callback_fields(),
+            },
+            timeout=30,
+        )
+        if response_json.get('success') is False and response_json.get('error'):
+            raise RuntimeError(response_json['error'])
 
-            deliveries = result.get('deliveries', [])
-            for delivery in deliveries:
-                self._process_delivery(delivery)
-            
-            return result
+        if 'data' in response_json:
+            result = response_json['data']
+        else:
+            result = response_json
+
+        deliveries = result.get('deliveries', [])
+        for delivery in deliveries:
+            self._process_delivery(delivery)
+        
+        return result
 
     def extract(self) -> int:
         step_number = 5
@@ -134,6 +138,7 @@ class DecryptionProxy(BaseExtractor):
         try:
             self.update_progress(step_number, step_name, "Stage 0: Extracting container files...", 2)
             self._extract_all_containers_recursively()
+            self.file_index.refresh()
 
             if not getattr(settings, 'MAIN_SERVER_API_KEY', None) or settings.MAIN_SERVER_API_KEY == "":
                 try:
@@ -173,51 +178,62 @@ class DecryptionProxy(BaseExtractor):
             self.log_info(f"Found {len(files_to_process)} files to process.")
             
             task_ids = []
-            for i, (source, dest, dec_type) in enumerate(files_to_process):
+            server_files = []
+            done_count = 0
+
+            def report_progress():
+                progress = 25 + int((done_count / len(files_to_process)) * 50)
+                self.update_progress(step_number, step_name, f"Processing file {done_count}/{len(files_to_process)}", progress)
+
+            for source, dest, dec_type in files_to_process:
+                if dec_type not in ("copy_only", "extract_only"):
+                    server_files.append((source, dest, dec_type))
+                    continue
                 try:
                     if dec_type == "copy_only":
                         dest_path = Path(dest)
                         dest_path.parent.mkdir(parents=True, exist_ok=True)
                         shutil.copy(source, dest_path)
                         self.log_info(f"Copied {source.name} to {dest_path}")
-                    elif dec_type == "extract_only":
+                    else:
                         dest_path = Path(dest)
                         dest_path.mkdir(parents=True, exist_ok=True)
                         with zipfile.ZipFile(source, 'r') as zip_ref:
                             zip_ref.extractall(dest_path)
                         self.log_info(f"Extracted {source.name} to {dest_path}")
-                    else:
-                        response_data = self._request_decryption_task(source, dest, dec_type, ssm_dummy_value)
-                        if response_data and response_data.get('task_id'):
-                            task_ids.append(response_data.get('task_id'))
-                            
-                    progress = 25 + int(((i + 1) / len(files_to_process)) * 50)
-                    self.update_progress(step_number, step_name, f"Processing file {i+1}/{len(files_to_process)}", progress)
-                    
                 except Exception as e:
                     self.log_error(f"Failed to process {source}: {e}")
+                done_count += 1
+                report_progress()
 
-            self.log_info(f"{len(task_ids)} decryption tasks created. Polling for results...")
-            
-            tasks_to_poll = list(task_ids)
-            processed_tasks = set()
+            def request_task(item):
+                source, dest, dec_type = item
+                try:
+                    return self._request_decryption_task(source, dest, dec_type, ssm_dummy_value)
+                except Exception as e:
+                    self.log_error(f"Failed to process {source}: {e}")
+                    return None
 
-            while tasks_to_poll:
-                current_task_id = tasks_to_poll.pop(0)
-                if not current_task_id or current_task_id in processed_tasks:
-                    continue
-                
-                self.log_info(f"Polling for task: {current_task_id}...")
-                result = self._poll_task_status(current_task_id)
+            for _, response_data in get_main_server_client().map_concurrent(request_task, server_files):
+                if response_data and response_data.get('task_id'):
+                    task_ids.append(response_data.get('task_id'))
+                done_count += 1
+                report_progress()
+
+            self.log_info(f"{len(task_ids)} decryption tasks created. Waiting for results...")
+            
+            watcher = self._watch_tasks(task_ids)
+            for task_id, result in watcher:
+                self.log_info(f"Task {task_id} finished, handling result...")
                 self._handle_decryption_result(result)
-                processed_tasks.add(current_task_id)
 
                 if result and result.get('next_task_id'):
                     next_task = result.get('next_task_id')
                     self.log_info(f"Server dispatched a follow-up task: {next_task}")
-                    tasks_to_poll.append(next_task)
+                    watcher.add(next_task)
             
             self.log_info("All decryption tasks completed.")
+            self.file_index.invalidate()
             self.update_progress(step_number, step_name, "Decryption tasks completed.", 90)
             
             self._final_extraction_step()
@@ -249,64 +265,42 @@ class DecryptionProxy(BaseExtractor):
         return False
 
     def _extract_all_containers_recursively(self):
-        extracted_once = set()
-        max_iterations = 5
-        iteration = 0
-        
-        while iteration < max_iterations:
-            newly_extracted = False
-            for filepath in self.backup_root.rglob("*"):
-                if filepath.is_file() and filepath.suffix.lower() in self.CONTAINER_EXTS:
-                    if filepath in extracted_once:
-                        continue
-                    
-                    extract_dir = filepath.parent / f"{filepath.stem}_ext"
-                    extract_dir.mkdir(exist_ok=True)
-                    
-                    try:
-                        with zipfile.ZipFile(filepath, "r") as zip_ref:
-                            zip_ref.extractall(extract_dir)
-                        self.log_info(f"Extracted container '{filepath.name}' to '{extract_dir}'")
-                        newly_extracted = True
-                    except Exception as e:
-                        self.log_debug(f"Could not extract {filepath.name} as zip: {e}")
-                    finally:
-                        extracted_once.add(filepath)
-                        
-            if not newly_extracted:
-                break
-            iteration += 1
-            
-        if iteration >= max_iterations:
-            self.log_info("Reached maximum extraction iterations.")
+        containers = [
+            path for path in self.file_index.files(under=self.backup_root)
+            if path.suffix.lower() in self.CONTAINER_EXTS
+        ]
+        stats = expand_containers(
+            containers, self.backup_root, self.CONTAINER_EXTS,
+            manifest=self.archive_manifest,
+            chunk_size=getattr(settings, 'BACKUP_EXTRACT_CHUNK_SIZE', 1024 * 1024),
+        )
+        self.log_info(f"Container expansion finished: {stats}")
 
     def _get_ssm_dummy_value(self):
         self.log_info("Searching for dummy file to extract master key...")
         
-        for root, _, files in os.walk(self.backup_root):
-            for file in files:
-                if any(file.lower().endswith(ext) for ext in self.DUMMY_FILE_EXTS):
-                    dummy_path = Path(root) / file
-                    self.log_info(f"Found potential dummy file: {dummy_path}")
-                    
-                    try:
-                        with open(dummy_path, "rb") as f:
-                            files_payload = {"file": (dummy_path.name, f)}
-                            data_payload = {"api_key": settings.MAIN_SERVER_API_KEY}
-                            url = self.get_api_url("extract-key")
-                            
-                            response = requests.post(url, data=data_payload, files=files_payload, timeout=90)
-                            response.raise_for_status()
-                            
-                            data = response.json().get("data", {})
-                            key = data.get("ssm_dummy_value")
-                            if key:
-                                return key
-                                
-                    except Exception as e:
-                        self.log_error(f"Failed to get key from {dummy_path.name}: {e}")
-                        continue
+        for dummy_path in self.file_index.files(under=self.backup_root):
+            if dummy_path.name.lower().endswith(tuple(self.DUMMY_FILE_EXTS)):
+                self.log_info(f"Found potential dummy file: {dummy_path}")
+                
+                try:
+                    with open(dummy_path, "rb") as f:
+                        files_payload = {"file": (dummy_path.name, f)}
+                        data_payload = {"api_key": settings.MAIN_SERVER_API_KEY}
+                        url = self.get_api_url("extract-key")
+                        
+                        response = requests.post(url, data=data_payload, files=files_payload, timeout=90)
+                        response.raise_for_status()
                         
+                        data = response.json().get("data", {})
+                        key = data.get("ssm_dummy_value")
+                        if key:
+                            return key
+                            
+                except Exception as e:
+                    self.log_error(f"Failed to get key from {dummy_path.name}: {e}")
+                    continue
+                    
         return None
 
     def _find_files_to_process(self):
@@ -317,7 +311,7 @@ class DecryptionProxy(BaseExtractor):
                 self.log_error(f"Invalid manifest entry: {task}.")
                 continue
                 
-            source_paths = list(self.backup_root.rglob(task["source_glob"]))
+            source_paths = self.file_index.rglob(task["source_glob"], under=self.backup_root)
             
             if source_paths:
                 source_path = source_paths[0]
@@ -4,16 +4,23 @@ import os
 from pathlib import Path
 
 from django.conf import settings
-from django.core.files.base import ContentFile
-from django.core.files.storage import default_storage
 from django.utils.timezone import datetime
 
 from ...models import Backup, File
+from ...utils.blob_store import blob_reference
 from ..base_extractor import BaseExtractor
 
 logger = logging.getLogger(__name__)
 
 class FileExtractor(BaseExtractor):
+
+    MAIN_FOLDERS = (
+        'Music', 'Photo', 'Video', 'Docs', 'Download', 'DCIM',
+        'Pictures', 'Movies', 'Documents', 'EtcFile', 'MYFILES',
+        'PHOTO_ORIGIN'
+    )
+    ARCHIVE_PATTERNS = tuple(f"{folder}/*" for folder in MAIN_FOLDERS)
+
     def extract(self) -> int:
         step_number = 12
         step_name = 'files'
@@ -41,11 +48,7 @@ class FileExtractor(BaseExtractor):
             for ext in extensions:
                 EXTENSION_CATEGORIES[ext.lower()] = category
         
-        main_folders = [
-            'Music', 'Photo', 'Video', 'Docs', 'Download', 'DCIM',
-            'Pictures', 'Movies', 'Documents', 'EtcFile', 'MYFILES',
-            'PHOTO_ORIGIN'
-        ]
+        main_folders = self.MAIN_FOLDERS
         
         file_count = 0
         total_folders = len(main_folders)
@@ -73,12 +76,8 @@ class FileExtractor(BaseExtractor):
                 
                 category = EXTENSION_CATEGORIES.get(file_ext, 'other')
                 try:
-                    unique_filename = f"backup_{self.backup_id}_{file_count}_{file_path.name}"
-                    
-                    with open(file_path, 'rb') as f:
-                        file_content = f.read()
-                        django_file = ContentFile(file_content, name=unique_filename)
-                        file_obj = File.objects.create(
+                    with blob_reference(file_path) as blob_name:
+                        File.objects.create(
                             backup_id=self.backup_id,
                             file_name=file_path.name,
                             file_size=file_size,
@@ -87,7 +86,7 @@ class FileExtractor(BaseExtractor):
                             category=category,
                             created_date=created_time,
                             modified_date=modified_time,
-                            file=django_file
+                            file=blob_name
                         )
                     
                     file_count += 1
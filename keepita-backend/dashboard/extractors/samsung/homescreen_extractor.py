@@ -2,13 +2,22 @@ import logging
 import xml.etree.ElementTree as ET
 from pathlib import Path
 
+from ...ingestion import BulkIngestor
 from ...models import HomeScreenItem, HomeScreenLayout
+from ...utils.xml_stream import XMLEventStream, detach
 from ..base_extractor import BaseExtractor
 
 logger = logging.getLogger(__name__)
 
+LAYOUT_SETTING_TAGS = (
+    'Rows', 'Columns', 'PageCount', 'zeroPage', 'only_portrait_mode_setting',
+    'notification_panel_setting', 'lock_layout_setting', 'quick_access_finder', 'badge_on_off_setting',
+)
+
 class HomeScreenExtractor(BaseExtractor):
-    
+
+    ARCHIVE_PATTERNS = ('HOMESCREEN/*',)
+
     def extract(self) -> int:
         step_number = 16
         step_name = 'homescreen'
@@ -32,98 +41,42 @@ class HomeScreenExtractor(BaseExtractor):
         self.update_progress(step_number, step_name, 'Parsing home screen XML...', 10)
         
         try:
-            with open(homescreen_file, 'r', encoding='utf-8', errors='ignore') as f:
-                content = f.read()
+            settings = {}
+            containers = {}
+            items = {'home': [], 'hotseat': []}
             
-            if not content.strip():
+            with open(homescreen_file, 'r', encoding='utf-8', errors='ignore') as f:
+                stream = XMLEventStream(f, wrap_tag='root')
+                
+                try:
+                    for event, elem, parent in stream:
+                        if event == 'start':
+                            if elem.tag in items and elem.tag not in containers:
+                                containers[elem.tag] = elem
+                            continue
+                        
+                        if elem.tag in LAYOUT_SETTING_TAGS and elem.text and elem.tag not in settings:
+                            settings[elem.tag] = elem.text
+                        
+                        location = next((loc for loc, container in containers.items() if container is parent), None)
+                        if location:
+                            item_data = self._parse_item_element(elem, location)
+                            if item_data:
+                                items[location].append(item_data)
+                            detach(elem, parent)
+                        elif parent is not None and parent.tag == 'root':
+                            detach(elem, parent)
+                except ET.ParseError as e:
+                    self.log_error(f"XML parsing error: {e}")
+                    self.update_progress(step_number, step_name, 'Failed to parse home screen XML', 0, 'failed')
+                    return 0
+            
+            if stream.event_count == 0:
                 self.log_warning("Home screen file is empty")
                 self.update_progress(step_number, step_name, 'Home screen file is empty', 100, 'completed')
                 return 0
             
-            if content.startswith('<?xml'):
-                decl_end = content.find('?>')
-                if decl_end != -1:
-                    content = content[decl_end + 2:].strip()
-            
-            content = f'<root>{content}</root>'
-            
-            try:
-                root = ET.fromstring(content)
-            except ET.ParseError as e:
-                self.log_error(f"XML parsing error: {e}")
-                self.update_progress(step_number, step_name, 'Failed to parse home screen XML', 0, 'failed')
-                return 0
-            
-            rows = 5
-            columns = 4
-            page_count = 1
-            
-            rows_elem = root.find('.//Rows')
-            if rows_elem is not None and rows_elem.text:
-                try:
-                    rows = int(rows_elem.text)
-                except ValueError:
-                    pass
-            
-            columns_elem = root.find('.//Columns')
-            if columns_elem is not None and columns_elem.text:
-                try:
-                    columns = int(columns_elem.text)
-                except ValueError:
-                    pass
-            
-            page_count_elem = root.find('.//PageCount')
-            if page_count_elem is not None and page_count_elem.text:
-                try:
-                    page_count = int(page_count_elem.text)
-                except ValueError:
-                    pass
-            
-            has_zero_page = False
-            zero_page_elem = root.find('.//zeroPage')
-            if zero_page_elem is not None and zero_page_elem.text:
-                has_zero_page = zero_page_elem.text.lower() == 'true'
-            
-            is_portrait_only = True
-            portrait_elem = root.find('.//only_portrait_mode_setting')
-            if portrait_elem is not None and portrait_elem.text:
-                is_portrait_only = portrait_elem.text.lower() == 'true'
-            
-            notification_panel = True
-            notification_elem = root.find('.//notification_panel_setting')
-            if notification_elem is not None and notification_elem.text:
-                notification_panel = notification_elem.text.lower() == 'true'
-            
-            layout_locked = False
-            lock_elem = root.find('.//lock_layout_setting')
-            if lock_elem is not None and lock_elem.text:
-                layout_locked = lock_elem.text.lower() == 'true'
-            
-            quick_access = True
-            quick_elem = root.find('.//quick_access_finder')
-            if quick_elem is not None and quick_elem.text:
-                quick_access = quick_elem.text.lower() == 'true'
-            
-            badge_enabled = True
-            badge_elem = root.find('.//badge_on_off_setting')
-            if badge_elem is not None and badge_elem.text:
-                badge_enabled = badge_elem.text != '0'
-            
-            items = []
-            
-            home_elem = root.find('.//home')
-            if home_elem is not None:
-                for item in home_elem:
-                    item_data = self._parse_item_element(item, 'home')
-                    if item_data:
-                        items.append(item_data)
-            
-            hotseat_elem = root.find('.//hotseat')
-            if hotseat_elem is not None:
-                for item in hotseat_elem:
-                    item_data = self._parse_item_element(item, 'hotseat')
-                    if item_data:
-                        items.append(item_data)
+            items = items['home'] + items['hotseat']
             
             total_items = len(items)
             self.log_info(f"Found {total_items} home screen items")
@@ -134,26 +87,25 @@ class HomeScreenExtractor(BaseExtractor):
             
             self.update_progress(step_number, step_name, f'Processing {total_items} home screen items...', 40)
             
-            HomeScreenItem.objects.filter(backup_id=self.backup_id).delete()
-            HomeScreenLayout.objects.filter(backup_id=self.backup_id).delete()
-            
-            layout = HomeScreenLayout.objects.create(
-                backup_id=self.backup_id,
-                rows=rows,
-                columns=columns,
-                page_count=page_count,
-                has_zero_page=has_zero_page,
-                is_portrait_only=is_portrait_only,
-                notification_panel_enabled=notification_panel,
-                layout_locked=layout_locked,
-                quick_access_enabled=quick_access,
-                badge_enabled=badge_enabled
-            )
-            
-            item_count = 0
-            for item in items:
-                try:
-                    HomeScreenItem.objects.create(
+            with BulkIngestor(HomeScreenItem, self.backup_id, label='home screen items') as ingestor:
+                HomeScreenItem.objects.filter(backup_id=self.backup_id).delete()
+                HomeScreenLayout.objects.filter(backup_id=self.backup_id).delete()
+                
+                layout = HomeScreenLayout.objects.create(
+                    backup_id=self.backup_id,
+                    rows=self._int_setting(settings, 'Rows', 5),
+                    columns=self._int_setting(settings, 'Columns', 4),
+                    page_count=self._int_setting(settings, 'PageCount', 1),
+                    has_zero_page=self._bool_setting(settings, 'zeroPage', False),
+                    is_portrait_only=self._bool_setting(settings, 'only_portrait_mode_setting', True),
+                    notification_panel_enabled=self._bool_setting(settings, 'notification_panel_setting', True),
+                    layout_locked=self._bool_setting(settings, 'lock_layout_setting', False),
+                    quick_access_enabled=self._bool_setting(settings, 'quick_access_finder', True),
+                    badge_enabled=settings['badge_on_off_setting'] != '0' if 'badge_on_off_setting' in settings else True
+                )
+                
+                for item in items:
+                    ingestor.add(HomeScreenItem(
                         backup_id=self.backup_id,
                         layout=layout,
                         package_name=item.get('package_name', ''),
@@ -168,15 +120,10 @@ class HomeScreenExtractor(BaseExtractor):
                         location=item.get('location', 'home'),
                         app_widget_id=item.get('app_widget_id'),
                         is_hidden=False
-                    )
-                    
-                    item_count += 1
-                    
-                except Exception as e:
-                    self.log_error(f"Error saving home screen item: {str(e)}")
-                    continue
+                    ))
             
-            self.log_info(f"Successfully imported {item_count} home screen items")
+            item_count = ingestor.result.inserted
+            self.log_info(f"Successfully imported {ingestor.result}")
             self.update_progress(step_number, step_name, f'Successfully extracted {item_count} home screen items', 100, 'completed')
             
             return item_count
@@ -187,6 +134,17 @@ class HomeScreenExtractor(BaseExtractor):
             self.update_progress(step_number, step_name, error_msg, 0, 'failed')
             return 0
     
+    def _int_setting(self, settings, tag, default):
+        try:
+            return int(settings[tag])
+        except (KeyError, ValueError):
+            return default
+    
+    def _bool_setting(self, settings, tag, default):
+        if tag not in settings:
+            return default
+        return settings[tag].lower() == 'true'
+    
     def _parse_item_element(self, elem, location):
         tag = elem.tag
         
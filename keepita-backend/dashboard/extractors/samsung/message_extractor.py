@@ -3,13 +3,15 @@ import logging
 from datetime import datetime
 from pathlib import Path
 
-from django.db import transaction
-
+from ...ingestion import BulkIngestor
 from ...models import ChatThread, Contact, Message
+from ...utils.json_stream import JSONStreamReader, iter_json_records
 from ..base_extractor import BaseExtractor
 
 logger = logging.getLogger(__name__)
 
+MESSAGE_BATCH_SIZE = 1000
+
 def normalize_phone_number(number):
     if not number:
         return number
@@ -22,7 +24,9 @@ def clean_text(text):
     return cleaned
 
 class MessageExtractor(BaseExtractor):
-    
+
+    ARCHIVE_PATTERNS = ('MESSAGE/*', '*sms_restore*')
+
     def extract(self) -> int:
         step_number = 8
         step_name = 'messages'
@@ -41,36 +45,7 @@ class MessageExtractor(BaseExtractor):
         self.update_progress(step_number, step_name, 'Parsing messages...', 10)
         
         try:
-            with open(message_file, 'r', encoding='utf-8', errors='ignore') as f:
-                content = f.read()
-            
-            if not content.strip():
-                self.log_warning("Message file is empty")
-                self.update_progress(step_number, step_name, 'Message file is empty', 100, 'completed')
-                return 0
-            
-            try:
-                messages_data = json.loads(content)
-            except json.JSONDecodeError as e:
-                self.log_error(f"Failed to parse message JSON: {e}")
-                self.update_progress(step_number, step_name, 'Failed to parse messages', 0, 'failed')
-                return 0
-            
-            if isinstance(messages_data, dict):
-                messages_list = messages_data.get('messages', messages_data.get('sms', []))
-            elif isinstance(messages_data, list):
-                messages_list = messages_data
-            else:
-                messages_list = []
-            
-            total_messages = len(messages_list)
-            self.log_info(f"Found {total_messages} messages to process")
-            
-            if total_messages == 0:
-                self.update_progress(step_number, step_name, 'No messages found', 100, 'completed')
-                return 0
-            
-            self.update_progress(step_number, step_name, f'Processing {total_messages} messages...', 20)
+            file_size = message_file.stat().st_size
             
             contacts = {}
             for contact in Contact.objects.filter(backup_id=self.backup_id):
@@ -78,60 +53,53 @@ class MessageExtractor(BaseExtractor):
                     normalized = normalize_phone_number(contact.phone_number)
                     contacts[normalized] = contact
             
-            Message.objects.filter(backup_id=self.backup_id).delete()
-            ChatThread.objects.filter(backup_id=self.backup_id).delete()
+            with open(message_file, 'rb') as f:
+                reader = JSONStreamReader(f)
+                
+                if not reader.peek():
+                    self.log_warning("Message file is empty")
+                    self.update_progress(step_number, step_name, 'Message file is empty', 100, 'completed')
+                    return 0
+                
+                self.update_progress(step_number, step_name, 'Processing messages...', 20)
+                
+                try:
+                    with BulkIngestor(Message, self.backup_id, batch_size=MESSAGE_BATCH_SIZE, label='messages') as ingestor:
+                        Message.objects.filter(backup_id=self.backup_id).delete()
+                        ChatThread.objects.filter(backup_id=self.backup_id).delete()
+                        
+                        threads = {}
+                        pending = []
+                        records = iter_json_records(f, keys=('messages', 'sms'), reader=reader)
+                        
+                        for i, msg_data in enumerate(records):
+                            parsed = self._build_message(msg_data)
+                            if parsed is None:
+                                ingestor.skip()
+                            else:
+                                pending.append(parsed)
+                            
+                            if (i + 1) % MESSAGE_BATCH_SIZE == 0:
+                                self._save_batch(pending, threads, contacts, ingestor)
+                                pending = []
+                                progress = 20 + int((reader.bytes_read / max(file_size, 1)) * 75)
+                                self.update_progress(step_number, step_name, f'Saving messages ({i+1} processed)', min(progress, 95))
+                        
+                        self._save_batch(pending, threads, contacts, ingestor)
+                except json.JSONDecodeError as e:
+                    self.log_error(f"Failed to parse message JSON: {e}")
+                    self.update_progress(step_number, step_name, 'Failed to parse messages', 0, 'failed')
+                    return 0
             
-            threads = {}
-            message_count = 0
+            message_count = ingestor.result.inserted
             
-            for i, msg_data in enumerate(messages_list):
-                try:
-                    address = msg_data.get('address', msg_data.get('phone', msg_data.get('number', '')))
-                    body = clean_text(msg_data.get('body', msg_data.get('text', msg_data.get('message', ''))))
-                    
-                    if not address:
-                        continue
-                    
-                    normalized_address = normalize_phone_number(address)
-                    
-                    if normalized_address not in threads:
-                        contact = contacts.get(normalized_address)
-                        thread = ChatThread.objects.create(
-                            backup_id=self.backup_id,
-                            contact=contact,
-                            address=address
-                        )
-                        threads[normalized_address] = thread
-                    else:
-                        thread = threads[normalized_address]
-                    
-                    date_str = msg_data.get('date', msg_data.get('timestamp', msg_data.get('time')))
-                    message_date = self._parse_date(date_str)
-                    
-                    msg_type = msg_data.get('type', msg_data.get('msg_type', 1))
-                    is_incoming = str(msg_type) == '1' or 'received' in str(msg_type).lower()
-                    
-                    Message.objects.create(
-                        backup_id=self.backup_id,
-                        chat_thread=thread,
-                        body=body,
-                        date=message_date,
-                        status=1 if is_incoming else 2,
-                        seen=msg_data.get('read', True),
-                        service_type='SMS'
-                    )
-                    
-                    message_count += 1
-                    
-                    if i % 100 == 0 or i == total_messages - 1:
-                        progress = 20 + int((i / max(total_messages, 1)) * 75)
-                        self.update_progress(step_number, step_name, f'Saving messages ({i+1}/{total_messages})', progress)
-                    
-                except Exception as e:
-                    self.log_error(f"Error saving message: {str(e)}")
-                    continue
+            if message_count == 0 and not threads:
+                self.log_info("No messages found in message file")
+                self.update_progress(step_number, step_name, 'No messages found', 100, 'completed')
+                return 0
             
-            self.log_info(f"Successfully imported {message_count} messages in {len(threads)} threads")
+            ChatThread.refresh_summaries(self.backup_id)
+            self.log_info(f"Successfully imported {ingestor.result} in {len(threads)} threads")
             self.update_progress(step_number, step_name, f'Successfully extracted {message_count} messages', 100, 'completed')
             
             return message_count
@@ -142,6 +110,50 @@ class MessageExtractor(BaseExtractor):
             self.update_progress(step_number, step_name, error_msg, 0, 'failed')
             return 0
     
+    def _save_batch(self, pending, threads, contacts, ingestor):
+        new_threads = {}
+        for normalized_address, address, _ in pending:
+            if normalized_address not in threads and normalized_address not in new_threads:
+                new_threads[normalized_address] = ChatThread(
+                    backup_id=self.backup_id,
+                    contact=contacts.get(normalized_address),
+                    address=address
+                )
+        
+        if new_threads:
+            ChatThread.objects.bulk_create(new_threads.values())
+            threads.update((normalized, thread.id) for normalized, thread in new_threads.items())
+        
+        for normalized_address, _, message in pending:
+            message.chat_thread_id = threads[normalized_address]
+        ingestor.add_many(message for _, _, message in pending)
+    
+    def _build_message(self, msg_data):
+        try:
+            address = msg_data.get('address', msg_data.get('phone', msg_data.get('number', '')))
+            body = clean_text(msg_data.get('body', msg_data.get('text', msg_data.get('message', ''))))
+            
+            if not address:
+                return None
+            
+            date_str = msg_data.get('date', msg_data.get('timestamp', msg_data.get('time')))
+            
+            msg_type = msg_data.get('type', msg_data.get('msg_type', 1))
+            is_incoming = str(msg_type) == '1' or 'received' in str(msg_type).lower()
+            
+            return normalize_phone_number(address), address, Message(
+                backup_id=self.backup_id,
+                body=body,
+                date=self._parse_date(date_str),
+                status=1 if is_incoming else 2,
+                seen=msg_data.get('read', True),
+                service_type='SMS'
+            )
+            
+        except Exception as e:
+            self.log_error(f"Error saving message: {str(e)}")
+            return None
+    
     def _find_message_file(self):
         paths = [
             self._get_file_path('MESSAGE', 'Message_ext', '!@ssm@!MESSAGE_JSON_ext', '!@ssm@!sms_restore_decrypted.bk'),
@@ -155,7 +167,7 @@ class MessageExtractor(BaseExtractor):
                 return path
         
         for pattern in ['*sms_restore*.bk', '*sms_restore*.json']:
-            files = list(self.backup_root.rglob(pattern))
+            files = self.file_index.rglob(pattern, under=self.backup_root)
             if files:
                 return files[0]
         
@@ -3,16 +3,18 @@ import os
 import shutil
 from pathlib import Path
 
-from django.core.files import File as DjangoFile
 from django.db import transaction
 
-from ...models import Backup, Wallpaper
+from ...models import Wallpaper
+from ...utils.blob_store import blob_reference
 from ..base_extractor import BaseExtractor
 
 logger = logging.getLogger(__name__)
 
 class WallpaperExtractor(BaseExtractor):
 
+    ARCHIVE_PATTERNS = ('WALLPAPER/*',)
+
     def extract(self) -> int:
         step_number = 17
         step_name = 'wallpapers'
@@ -62,13 +64,9 @@ class WallpaperExtractor(BaseExtractor):
                             is_default=False
                         )
                         
-                        with open(path, 'rb') as image_file:
-                            backup = Backup.objects.get(id=self.backup_id)
-                            original_filename = path.name
-                            django_file = DjangoFile(image_file, name=original_filename)
-                            wallpaper.image.save(original_filename, django_file, save=False)
-                        
-                        wallpaper.save()
+                        with blob_reference(path) as blob_name:
+                            wallpaper.image = blob_name
+                            wallpaper.save()
                         
                         wallpaper_count += 1
                         self.log_info(f"Saved {wallpaper_type} wallpaper: {path.name}")
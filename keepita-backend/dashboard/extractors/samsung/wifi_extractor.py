@@ -8,7 +8,9 @@ from ..base_extractor import BaseExtractor
 logger = logging.getLogger(__name__)
 
 class WifiExtractor(BaseExtractor):
-    
+
+    ARCHIVE_PATTERNS = ('WIFICONFIG/*',)
+
     def extract(self) -> int:
         step_number = 11
         step_name = 'wifi'
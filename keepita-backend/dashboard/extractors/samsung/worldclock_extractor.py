@@ -7,7 +7,9 @@ from ..base_extractor import BaseExtractor
 logger = logging.getLogger(__name__)
 
 class WorldClockExtractor(BaseExtractor):
-    
+
+    ARCHIVE_PATTERNS = ('WORLDCLOCK/*',)
+
     def extract(self) -> int:
         step_number = 15
         step_name = 'worldclocks'
@@ -0,0 +1,101 @@
+import logging
+import time
+from concurrent.futures import FIRST_COMPLETED, ThreadPoolExecutor, wait
+from typing import Dict, List, Optional, Sequence, Tuple
+
+from django.conf import settings
+from django.db import connections
+from django.utils import timezone
+
+logger = logging.getLogger('dashboard')
+
+PREREQUISITE_EXTRACTORS = ('decrypt', 'proxy')
+
+EXTRACTOR_DEPENDENCIES = {
+    'messages': ('contacts',),
+    'call_logs': ('contacts',),
+    'homescreen': ('apps',),
+}
+
+class ExtractorScheduler:
+
+    def __init__(self, extractors: List[Tuple[str, object]], backup_id: int, log=None,
+                 max_workers: Optional[int] = None, dependencies: Optional[Dict[str, Sequence[str]]] = None,
+                 file_index=None):
+        self.extractors = dict(extractors)
+        self.order = [name for name, _ in extractors]
+        self.backup_id = backup_id
+        self.log = log
+        self.file_index = file_index
+        self.max_workers = max_workers or getattr(settings, 'BACKUP_EXTRACTOR_WORKERS', 4)
+        self.dependencies = self._resolve_dependencies(dependencies or EXTRACTOR_DEPENDENCIES)
+
+    def _resolve_dependencies(self, dependencies) -> Dict[str, set]:
+        prerequisites = {name for name in self.order if name in PREREQUISITE_EXTRACTORS}
+        resolved = {}
+        for name in self.order:
+            if name in prerequisites:
+                resolved[name] = set()
+                continue
+            declared = {dep for dep in dependencies.get(name, ()) if dep in self.extractors}
+            resolved[name] = declared | prerequisites
+        return resolved
+
+    def _run_one(self, name: str) -> dict:
+        started = time.monotonic()
+        timing = {'started_at': timezone.now().isoformat()}
+        try:
+            count = self.extractors[name].extract()
+            result = {'count': count}
+            logger.info(f"Extracted {count} {name} for backup {self.backup_id}")
+        except Exception as e:
+            logger.error(f"Error extracting {name} for backup {self.backup_id}: {str(e)}", exc_info=True)
+            result = {'error': str(e)}
+        finally:
+            connections.close_all()
+
+        timing['finished_at'] = timezone.now().isoformat()
+        timing['duration'] = round(time.monotonic() - started, 3)
+        timing['status'] = 'failed' if 'error' in result else 'completed'
+        result['timing'] = timing
+        return result
+
+    def run(self) -> dict:
+        stats = {}
+        pending = list(self.order)
+        done = set()
+        running = {}
+        started = time.monotonic()
+
+        with ThreadPoolExecutor(max_workers=self.max_workers, thread_name_prefix=f'extract-{self.backup_id}') as pool:
+            while pending or running:
+                for name in [n for n in pending if self.dependencies[n] <= done]:
+                    pending.remove(name)
+                    running[pool.submit(self._run_one, name)] = name
+
+                if not running:
+                    logger.error(f"Unresolvable extractor dependencies for backup {self.backup_id}: {pending}")
+                    break
+
+                finished, _ = wait(running, return_when=FIRST_COMPLETED)
+                for future in finished:
+                    name = running.pop(future)
+                    stats[name] = future.result()
+                    done.add(name)
+                    if name in PREREQUISITE_EXTRACTORS and self.file_index is not None:
+                        self.file_index.invalidate()
+                    self._record_timing(name, stats[name]['timing'])
+
+        logger.info(
+            f"Ran {len(stats)} extractors for backup {self.backup_id} in "
+            f"{time.monotonic() - started:.2f}s with up to {self.max_workers} workers"
+        )
+        return {name: stats[name] for name in self.order if name in stats}
+
+    def _record_timing(self, name: str, timing: dict):
+        if not self.log:
+            return
+        try:
+            self.log.record_extractor_timing(name, timing)
+        except Exception as e:
+            logger.debug(f"Failed to record timing for {name}: {e}")
@@ -1,5 +1,4 @@
 
-import json
 import logging
 from datetime import datetime
 from pathlib import Path
@@ -11,7 +10,9 @@ from ..base_extractor import BaseExtractor
 logger = logging.getLogger(__name__)
 
 class XiaomiContactExtractor(BaseExtractor):
-    
+
+    ARCHIVE_PATTERNS = ()
+
     DEFAULT_CALL_TYPE = 'INCOMING'
 
     def extract(self):
@@ -135,10 +136,9 @@ class XiaomiContactExtractor(BaseExtractor):
         json_path = Path(self.backup_root) / '_extracted_json' / f'{data_type}.json'
         if json_path.exists():
             try:
-                with open(json_path, 'r', encoding='utf-8') as f:
-                    data = json.load(f)
-                    self.log_info(f"Loaded {data_type} data from server JSON: {data.get('count', 0)} items")
-                    return data
+                data = self.load_json_file(json_path)
+                self.log_info(f"Loaded {data_type} data from server JSON: {data.get('count', 0)} items")
+                return data
             except Exception as e:
                 self.log_error(f"Failed to load server JSON for {data_type}: {e}")
         return None
\ No newline at end of file
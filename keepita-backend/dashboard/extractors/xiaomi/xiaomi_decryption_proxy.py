@@ -3,12 +3,13 @@ import base64
 import json
 import logging
 import os
-import zipfile
 from pathlib import Path
 
-import requests
 from django.conf import settings
 
+from ...main_server_client import get_main_server_client, unwrap_result
+from ...task_watcher import callback_fields
+from ...utils.archive import expand_containers
 from ..base_extractor import BaseExtractor
 
 logger = logging.getLogger(__name__)
@@ -19,6 +20,9 @@ def get_api_url(endpoint="decrypt"):
 
 class XiaomiDecryptionProxy(BaseExtractor):
 
+    ARCHIVE_PATTERNS = ('*.zip', '*.bak')
+    CONTAINER_EXTS = ('.zip',)
+
     FILE_TYPE_MAPPING = {
         'Contacts(com.android.contacts).bak': 'contacts',
         'Call history(com.android.contacts).bak': 'call_logs',
@@ -30,8 +34,8 @@ class XiaomiDecryptionProxy(BaseExtractor):
         'com.android.deskclock.bak': 'alarms',
     }
 
-    def __init__(self, backup_root: str, backup_id: int):
-        super().__init__(backup_root, backup_id)
+    def __init__(self, backup_root: str, backup_id: int, file_index=None):
+        super().__init__(backup_root, backup_id, file_index=file_index)
         self.backup_root = Path(backup_root)
         self.extracted_data_dir = self.backup_root / '_extracted_json'
 
@@ -46,6 +50,7 @@ class XiaomiDecryptionProxy(BaseExtractor):
 
             self.update_progress(step_number, step_name, "Stage 0: Extracting container files...", 2)
             self._extract_all_containers()
+            self.file_index.refresh()
 
             self.update_progress(step_number, step_name, "Stage 1: Finding backup files...", 10)
             bak_files = self._find_bak_files()
@@ -70,11 +75,12 @@ class XiaomiDecryptionProxy(BaseExtractor):
             self.update_progress(step_number, step_name, f"Stage 2: Processing {len(bak_files)} files via server...", 25)
             
             processed_count = 0
-            processed_task_ids = set()
+            watcher = self._watch_tasks()
+            client = get_main_server_client()
+            results = client.map_concurrent(lambda bak_file: self._process_file_via_server(bak_file, api_key), bak_files)
             
-            for i, bak_file in enumerate(bak_files):
+            for i, (bak_file, result) in enumerate(results):
                 try:
-                    result = self._process_file_via_server(bak_file, api_key)
                     
                     self.log_info(f"DEBUG: Server response for {bak_file.name}: success={result.get('success') if result else 'None'}, next_task_id={result.get('next_task_id') if result else 'None'}")
                     
@@ -86,15 +92,8 @@ class XiaomiDecryptionProxy(BaseExtractor):
                             self._process_delivery(delivery)
                         
                         next_task_id = result.get('next_task_id')
-                        if next_task_id and next_task_id not in processed_task_ids:
-                            processed_task_ids.add(next_task_id)
+                        if next_task_id and watcher.add(next_task_id):
                             self.log_info(f"Server dispatched a follow-up task: {next_task_id}")
-                            task_result = self._poll_task_status(next_task_id)
-                            if task_result:
-                                self.log_info(f"DEBUG: Task poll result: {task_result}")
-                                self._handle_decryption_result(task_result)
-                            else:
-                                self.log_warning(f"DEBUG: Task poll returned None for task {next_task_id}")
                         elif next_task_id:
                             self.log_debug(f"Skipping task {next_task_id} - already processed")
 
@@ -111,6 +110,15 @@ class XiaomiDecryptionProxy(BaseExtractor):
                 except Exception as e:
                     self.log_error(f"Failed to process {bak_file.name}: {e}")
 
+            if len(watcher):
+                self.log_info(f"Waiting for {len(watcher)} follow-up tasks...")
+            for task_id, task_result in watcher:
+                if task_result:
+                    self.log_info(f"DEBUG: Task poll result: {task_result}")
+                    self._handle_decryption_result(task_result)
+                else:
+                    self.log_warning(f"DEBUG: Task poll returned None for task {task_id}")
+
             self.log_info(f"Successfully processed {processed_count}/{len(bak_files)} files via main server.")
             self.update_progress(step_number, step_name, f"Processed {processed_count} files.", 100, "completed")
             self.extracted_count = processed_count
@@ -123,60 +131,30 @@ class XiaomiDecryptionProxy(BaseExtractor):
             return 0
 
     def _extract_all_containers(self):
-        for zip_file in self.backup_root.rglob("*.zip"):
-            try:
-                extract_dir = zip_file.parent / f"{zip_file.stem}_ext"
-                if extract_dir.exists():
-                    continue
-                    
-                extract_dir.mkdir(parents=True, exist_ok=True)
-                with zipfile.ZipFile(zip_file, 'r') as zf:
-                    zf.extractall(extract_dir)
-                self.log_debug(f"Extracted {zip_file.name}")
-            except Exception as e:
-                self.log_error(f"Failed to extract {zip_file}: {e}")
+        stats = expand_containers(
+            self.file_index.rglob("*.zip", under=self.backup_root), self.backup_root, self.CONTAINER_EXTS,
+            manifest=self.archive_manifest, skip_existing=True,
+            chunk_size=getattr(settings, 'BACKUP_EXTRACT_CHUNK_SIZE', 1024 * 1024),
+        )
+        self.log_debug(f"Container expansion finished: {stats}")
 
     def _find_bak_files(self) -> list:
-        return list(self.backup_root.rglob("*.bak"))
+        return self.file_index.rglob("*.bak", under=self.backup_root)
 
     def _process_file_via_server(self, file_path: Path, api_key: str) -> dict:
         try:
-            with open(file_path, 'rb') as f:
-                files_payload = {'file': (file_path.name, f)}
-                data_payload = {
+            response_json = get_main_server_client().post_file(
+                "opensource/process-file/",
+                file_path,
+                data={
                     'file_name': file_path.name,
                     'device_brand': 'xiaomi',
                     'needs_decryption': 'false',
                     'return_json': 'true',
-                }
-                
-                response = requests.post(
-                    self.get_api_url("opensource/process-file"),
-                    data=data_payload,
-                    files=files_payload,
-                    headers={'X-API-KEY': api_key},
-                    timeout=120
-                )
-                
-                if response.status_code == 200:
-                    response_json = response.json()
-                    result = response_json
-                    
-                    if 'data' in result and isinstance(result.get('data'), dict):
-                        result = result['data']
-                    
-                    if 'data' in result and isinstance(result.get('data'), dict):
-                        inner = result['data']
-                        if 'success' in inner or 'data_type' in inner:
-                            result = inner
-                    
-                    return result
-                else:
-                    self.log_error(f"Server returned {response.status_code} for {file_path.name}")
-                    return None
-                    
-        except requests.Timeout:
-            self.log_error(f"Timeout processing {file_path.name}")
+                    **callback_fields(),
+                },
+            )
+            return unwrap_result(response_json)
         except Exception as e:
             self.log_error(f"Error sending {file_path.name} to server: {e}")
         
@@ -202,9 +180,7 @@ class XiaomiDecryptionProxy(BaseExtractor):
             existing_data = []
             if json_path.exists():
                 try:
-                    with open(json_path, 'r', encoding='utf-8') as f:
-                        existing = json.load(f)
-                        existing_data = existing.get('items', [])
+                    existing_data = self.load_json_file(json_path).get('items', [])
                 except:
                     pass
             
@@ -232,6 +208,5 @@ class XiaomiDecryptionProxy(BaseExtractor):
     def load_extracted_data(self, data_type: str) -> dict:
         json_path = self.get_extracted_json_path(data_type)
         if json_path.exists():
-            with open(json_path, 'r', encoding='utf-8') as f:
-                return json.load(f)
+            return self.load_json_file(json_path)
         return {}
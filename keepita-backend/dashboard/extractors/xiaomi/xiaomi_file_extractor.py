@@ -5,15 +5,16 @@ import zipfile
 from datetime import datetime
 from pathlib import Path
 
-from django.core.files.base import ContentFile
-
 from ...models import File
+from ...utils.blob_store import blob_reference, release_queryset_blobs
 from ..base_extractor import BaseExtractor
 
 logger = logging.getLogger(__name__)
 
 class XiaomiFileExtractor(BaseExtractor):
 
+    ARCHIVE_PATTERNS = ('backup_*.zip',)
+
     def extract(self) -> int:
         step_number = 12
         step_name = 'xiaomi_files'
@@ -22,7 +23,9 @@ class XiaomiFileExtractor(BaseExtractor):
         self.update_progress(step_number, step_name, 'Preparing for extraction', 0)
 
         try:
-            count, _ = File.objects.filter(backup_id=self.backup_id).delete()
+            existing = File.objects.filter(backup_id=self.backup_id)
+            release_queryset_blobs(existing, 'file')
+            count, _ = existing.delete()
             if count > 0:
                 self.log_info(f"Cleanup: Removed {count} old file entries for backup ID {self.backup_id}.")
         except Exception as e:
@@ -79,26 +82,24 @@ class XiaomiFileExtractor(BaseExtractor):
                         try:
                             processed_files_signature.add(file_signature)
 
-                            with zip_ref.open(member) as source_file: file_content = source_file.read()
-                            
                             file_path_in_zip = Path(member.filename)
                             file_ext = file_path_in_zip.suffix.lower()
                             mime_type, _ = mimetypes.guess_type(str(file_path_in_zip))
                             modified_time = datetime(*member.date_time)
-                            unique_filename = f"backup_{self.backup_id}_{file_count}_{file_path_in_zip.name}"
-                            django_file = ContentFile(file_content, name=unique_filename)
                             
-                            File.objects.create(
-                                backup_id=self.backup_id,
-                                file_name=file_path_in_zip.name,
-                                file_size=member.file_size,
-                                file_extension=file_ext[1:] if file_ext else '',
-                                mime_type=mime_type or 'application/octet-stream',
-                                category=category,
-                                modified_date=modified_time,
-                                file=django_file,
-                                is_hidden=file_path_in_zip.name.startswith('.')
-                            )
+                            with zip_ref.open(member) as source_file, \
+                                    blob_reference(source_file, file_path_in_zip.name) as stored_name:
+                                File.objects.create(
+                                    backup_id=self.backup_id,
+                                    file_name=file_path_in_zip.name,
+                                    file_size=member.file_size,
+                                    file_extension=file_ext[1:] if file_ext else '',
+                                    mime_type=mime_type or 'application/octet-stream',
+                                    category=category,
+                                    modified_date=modified_time,
+                                    file=stored_name,
+                                    is_hidden=file_path_in_zip.name.startswith('.')
+                                )
                             file_count += 1
                         except Exception as e:
                             self.log_error(f"Error saving item '{member.filename}': {e}", exc_info=True)
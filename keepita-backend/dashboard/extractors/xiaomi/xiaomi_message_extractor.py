@@ -1,5 +1,4 @@
 
-import json
 import logging
 from datetime import datetime
 from pathlib import Path
@@ -19,6 +18,8 @@ def normalize_phone_number(number):
 
 class XiaomiMessageExtractor(BaseExtractor):
 
+    ARCHIVE_PATTERNS = ()
+
     def extract(self) -> int:
         step_number = 8
         step_name = 'messages'
@@ -100,6 +101,7 @@ class XiaomiMessageExtractor(BaseExtractor):
                     self.log_error(f"Error importing message {i}: {e}")
                     continue
 
+        ChatThread.refresh_summaries(self.backup_id)
         self.log_info(f"Successfully imported {message_count} messages in {thread_count} threads from server.")
         self.update_progress(step_number, step_name, f"Successfully imported {message_count} messages", 100, 'completed')
         return message_count
@@ -108,10 +110,9 @@ class XiaomiMessageExtractor(BaseExtractor):
         json_path = Path(self.backup_root) / '_extracted_json' / f'{data_type}.json'
         if json_path.exists():
             try:
-                with open(json_path, 'r', encoding='utf-8') as f:
-                    data = json.load(f)
-                    self.log_info(f"Loaded {data_type} data from server JSON: {data.get('count', 0)} items")
-                    return data
+                data = self.load_json_file(json_path)
+                self.log_info(f"Loaded {data_type} data from server JSON: {data.get('count', 0)} items")
+                return data
             except Exception as e:
                 self.log_error(f"Failed to load server JSON for {data_type}: {e}")
         return None
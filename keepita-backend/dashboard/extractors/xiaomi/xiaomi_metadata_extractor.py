@@ -1,5 +1,4 @@
 
-import json
 import logging
 from datetime import datetime
 from pathlib import Path
@@ -12,6 +11,8 @@ logger = logging.getLogger(__name__)
 
 class XiaomiMetadataExtractor(BaseExtractor):
 
+    ARCHIVE_PATTERNS = ()
+
     def extract(self):
         step_number = 1
         step_name = 'metadata'
@@ -72,10 +73,9 @@ class XiaomiMetadataExtractor(BaseExtractor):
         json_path = Path(self.backup_root) / '_extracted_json' / f'{data_type}.json'
         if json_path.exists():
             try:
-                with open(json_path, 'r', encoding='utf-8') as f:
-                    data = json.load(f)
-                    self.log_info(f"Loaded {data_type} data from server JSON: {data.get('count', 0)} items")
-                    return data
+                data = self.load_json_file(json_path)
+                self.log_info(f"Loaded {data_type} data from server JSON: {data.get('count', 0)} items")
+                return data
             except Exception as e:
                 self.log_error(f"Failed to load server JSON for {data_type}: {e}")
         return None
\ No newline at end of file
@@ -1,4 +1,4 @@
-from config.pagination import DefaultPagination
+from config.pagination import KeysetPagination
 from django_filters.rest_framework import DjangoFilterBackend
 from rest_framework import filters, viewsets
 from rest_framework.permissions import IsAuthenticated
@@ -31,7 +31,8 @@ class FileViewSet(viewsets.ReadOnlyModelViewSet):
     search_fields = ['file_name', 'category']
     ordering_fields = ['file_name', 'file_size', 'created_date', 'modified_date']
     ordering = ['-created_date']
-    pagination_class = DefaultPagination
+    pagination_class = KeysetPagination
+    keyset_field = '-created_date'
 
     def get_queryset(self):
         if getattr(self, 'swagger_fake_view', False):
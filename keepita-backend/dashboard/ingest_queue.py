@@ -0,0 +1,185 @@
+import logging
+import os
+import socket
+import threading
+import uuid
+from datetime import timedelta
+from pathlib import Path
+from typing import Optional
+
+from django.conf import settings
+from django.db import connections
+from django.db.models import F, Q
+from django.utils import timezone
+
+from .models import Backup, IngestJob
+
+logger = logging.getLogger('dashboard')
+
+class LeaseLost(Exception):
+    pass
+
+def _lease_seconds() -> int:
+    return getattr(settings, 'INGEST_JOB_LEASE_SECONDS', 300)
+
+def enqueue_backup(backup, log, extract_dir: Path, temp_zip_path: Path) -> IngestJob:
+    job = IngestJob.objects.create(
+        backup=backup,
+        log=log,
+        max_attempts=getattr(settings, 'INGEST_JOB_MAX_ATTEMPTS', 3),
+        payload={
+            'extract_dir': str(extract_dir),
+            'temp_zip_path': str(temp_zip_path),
+        },
+    )
+    logger.info(f"Queued ingest job {job.id} for backup {backup.id}")
+    return job
+
+def _claimable(now) -> Q:
+    return (
+        Q(status='queued', available_at__lte=now)
+        | Q(status='running', lease_expires_at__lt=now)
+    )
+
+def claim_next_job(worker_id: str, lease_seconds: Optional[int] = None) -> Optional[IngestJob]:
+    lease_seconds = lease_seconds or _lease_seconds()
+
+    while True:
+        now = timezone.now()
+        candidate = (
+            IngestJob.objects.filter(_claimable(now))
+            .order_by('available_at', 'created_at')
+            .values('id', 'status', 'attempts', 'max_attempts')
+            .first()
+        )
+        if candidate is None:
+            return None
+
+        if candidate['status'] == 'running' and candidate['attempts'] >= candidate['max_attempts']:
+            _expire_job(candidate['id'], now)
+            continue
+
+        claimed = IngestJob.objects.filter(_claimable(now), pk=candidate['id']).update(
+            status='running',
+            worker_id=worker_id,
+            attempts=F('attempts') + 1,
+            heartbeat_at=now,
+            lease_expires_at=now + timedelta(seconds=lease_seconds),
+            updated_at=now,
+        )
+        if claimed:
+            return IngestJob.objects.select_related('backup', 'log').get(pk=candidate['id'])
+
+def _expire_job(job_id, now):
+    error = "Lease expired too many times; giving up."
+    updated = IngestJob.objects.filter(pk=job_id, status='running', lease_expires_at__lt=now).update(
+        status='failed', last_error=error, updated_at=now
+    )
+    if not updated:
+        return
+
+    job = IngestJob.objects.select_related('backup', 'log').get(pk=job_id)
+    logger.error(f"Ingest job {job_id} for backup {job.backup_id} abandoned: {error}")
+    if job.log:
+        job.log.mark_failed(error)
+    else:
+        Backup.objects.filter(pk=job.backup_id).update(status='failed')
+
+def heartbeat(job: IngestJob, worker_id: str, lease_seconds: Optional[int] = None) -> bool:
+    now = timezone.now()
+    return bool(
+        IngestJob.objects.filter(pk=job.pk, status='running', worker_id=worker_id).update(
+            heartbeat_at=now,
+            lease_expires_at=now + timedelta(seconds=lease_seconds or _lease_seconds()),
+            updated_at=now,
+        )
+    )
+
+def finish_job(job: IngestJob, worker_id: str, error: Optional[str] = None):
+    IngestJob.objects.filter(pk=job.pk, status='running', worker_id=worker_id).update(
+        status='failed' if error else 'completed',
+        last_error=error,
+        lease_expires_at=None,
+        updated_at=timezone.now(),
+    )
+
+class Heartbeat(threading.Thread):
+
+    def __init__(self, job: IngestJob, worker_id: str, interval: Optional[float] = None):
+        super().__init__(name=f'ingest-heartbeat-{job.pk}', daemon=True)
+        self.job = job
+        self.worker_id = worker_id
+        self.interval = interval or getattr(settings, 'INGEST_JOB_HEARTBEAT_SECONDS', 30)
+        self._stop_event = threading.Event()
+        self.lost = threading.Event()
+
+    def run(self):
+        try:
+            while not self._stop_event.wait(self.interval):
+                try:
+                    if not heartbeat(self.job, self.worker_id):
+                        logger.warning(f"Lost lease on ingest job {self.job.pk}, cancelling it on this worker")
+                        self.lost.set()
+                        return
+                except Exception as e:
+                    logger.warning(f"Heartbeat failed for ingest job {self.job.pk}: {e}")
+        finally:
+            connections.close_all()
+
+    def stop(self):
+        self._stop_event.set()
+        self.join()
+
+class IngestWorker:
+
+    def __init__(self, worker_id: Optional[str] = None, poll_interval: Optional[float] = None):
+        self.worker_id = worker_id or f"{socket.gethostname()}:{os.getpid()}:{uuid.uuid4().hex[:8]}"
+        self.poll_interval = poll_interval or getattr(settings, 'INGEST_WORKER_POLL_SECONDS', 2)
+        self.stop_event = threading.Event()
+
+    def run_job(self, job: IngestJob):
+        from .serializers import BackupUploadSerializer
+
+        logger.info(f"Worker {self.worker_id} picked up ingest job {job.pk} (attempt {job.attempts})")
+        beat = Heartbeat(job, self.worker_id)
+        beat.start()
+        try:
+            error = BackupUploadSerializer()._process_backup_async(
+                job.backup,
+                Path(job.payload['extract_dir']),
+                Path(job.payload['temp_zip_path']),
+                job.log,
+                lease_lost=beat.lost,
+            )
+        except LeaseLost as e:
+            logger.warning(f"Ingest job {job.pk} abandoned by worker {self.worker_id}: {e}")
+            return
+        except Exception as e:
+            error = str(e)
+            logger.error(f"Ingest job {job.pk} crashed: {error}", exc_info=True)
+        finally:
+            beat.stop()
+        finish_job(job, self.worker_id, error)
+
+    def run_once(self) -> bool:
+        job = claim_next_job(self.worker_id)
+        if job is None:
+            return False
+        self.run_job(job)
+        return True
+
+    def run_forever(self):
+        logger.info(f"Ingest worker {self.worker_id} started")
+        while not self.stop_event.is_set():
+            try:
+                worked = self.run_once()
+            except Exception as e:
+                logger.error(f"Ingest worker {self.worker_id} poll failed: {e}", exc_info=True)
+                connections.close_all()
+                worked = False
+            if not worked:
+                self.stop_event.wait(self.poll_interval)
+        logger.info(f"Ingest worker {self.worker_id} stopped")
+
+    def stop(self):
+        self.stop_event.set()
@@ -0,0 +1,140 @@
+import logging
+import sys
+import time
+from typing import Iterable, Optional, Sequence
+
+from django.conf import settings
+from django.db import transaction
+
+from .memory_budget import get_memory_accountant
+
+logger = logging.getLogger('dashboard')
+
+DEFAULT_BATCH_SIZE = 500
+
+class IngestResult:
+
+    def __init__(self, label: str, inserted: int = 0, skipped: int = 0, elapsed: float = 0.0):
+        self.label = label
+        self.inserted = inserted
+        self.skipped = skipped
+        self.elapsed = elapsed
+
+    @property
+    def rows_per_second(self) -> float:
+        if self.elapsed <= 0:
+            return float(self.inserted)
+        return self.inserted / self.elapsed
+
+    def as_dict(self) -> dict:
+        return {
+            'inserted': self.inserted,
+            'skipped': self.skipped,
+            'elapsed': round(self.elapsed, 3),
+        }
+
+    def __str__(self):
+        return (
+            f"{self.label}: {self.inserted} inserted, {self.skipped} skipped "
+            f"in {self.elapsed:.2f}s ({self.rows_per_second:.0f} rows/s)"
+        )
+
+class BulkIngestor:
+
+    def __init__(self, model, backup_id: int, key_fields: Sequence[str] = (),
+                 batch_size: int = DEFAULT_BATCH_SIZE, label: Optional[str] = None):
+        self.model = model
+        self.backup_id = backup_id
+        self.key_fields = tuple(key_fields)
+        self.batch_size = batch_size
+        self.result = IngestResult(label or model._meta.verbose_name_plural)
+        self._pending = []
+        self._reserved = 0
+        self._keys = None
+        self._atomic = None
+        self._started_at = None
+
+    def __enter__(self):
+        self._started_at = time.monotonic()
+        self._atomic = transaction.atomic()
+        self._atomic.__enter__()
+        return self
+
+    def __exit__(self, exc_type, exc, tb):
+        try:
+            if exc_type is None:
+                self.flush()
+        except Exception:
+            self._atomic.__exit__(*sys.exc_info())
+            raise
+        finally:
+            self._pending = []
+            self._release_buffer()
+            self.result.elapsed = time.monotonic() - self._started_at
+        return self._atomic.__exit__(exc_type, exc, tb)
+
+    @property
+    def existing_keys(self) -> set:
+        if self._keys is None:
+            self._keys = self._load_keys()
+        return self._keys
+
+    def _load_keys(self) -> set:
+        if not self.key_fields:
+            return set()
+        rows = self.model.objects.filter(backup_id=self.backup_id).values_list(*self.key_fields)
+        return {tuple(row) for row in rows}
+
+    def key_for(self, instance) -> tuple:
+        return tuple(getattr(instance, field) for field in self.key_fields)
+
+    def add(self, instance) -> bool:
+        if self.key_fields:
+            key = self.key_for(instance)
+            if key in self.existing_keys:
+                self.result.skipped += 1
+                return False
+            self.existing_keys.add(key)
+        self._queue(instance)
+        return True
+
+    def add_many(self, instances: Iterable) -> int:
+        incoming = list(instances)
+        if self.key_fields:
+            keyed = {}
+            for instance in incoming:
+                keyed.setdefault(self.key_for(instance), instance)
+            new_keys = keyed.keys() - self.existing_keys
+            self.result.skipped += len(incoming) - len(new_keys)
+            self.existing_keys.update(new_keys)
+            incoming = [instance for key, instance in keyed.items() if key in new_keys]
+
+        for instance in incoming:
+            self._queue(instance)
+        return len(incoming)
+
+    def _queue(self, instance):
+        if not self._reserved:
+            self._reserved = self.batch_size * getattr(settings, 'INGEST_RECORD_ESTIMATE_BYTES', 2048)
+            get_memory_accountant().acquire(self._reserved, 'records', self.backup_id, block=False)
+        self._pending.append(instance)
+        if len(self._pending) >= self.batch_size:
+            self.flush()
+
+    def skip(self, count: int = 1):
+        self.result.skipped += count
+
+    def flush(self):
+        if not self._pending:
+            return
+        batch, self._pending = self._pending, []
+        try:
+            self.model.objects.bulk_create(batch, batch_size=self.batch_size)
+        finally:
+            self._release_buffer()
+        self.result.inserted += len(batch)
+
+    def _release_buffer(self):
+        if self._reserved:
+            get_memory_accountant().release(self._reserved, 'records', self.backup_id)
+            self._reserved = 0
@@ -1,8 +1,11 @@
 
 import logging
 import os
+import threading
 import time
-from typing import Any, Dict, List, Optional
+from contextlib import nullcontext
+from concurrent.futures import Future, ThreadPoolExecutor, as_completed
+from typing import Any, Callable, Dict, Iterable, Iterator, List, Optional, Tuple
 import platform
 import socket
 from getmac import get_mac_address
@@ -10,21 +13,29 @@ from dotenv import set_key, find_dotenv
 from pathlib import Path
 
 import requests
+from requests.adapters import HTTPAdapter
 from django.conf import settings
 
+from .utils.multipart_upload import MultipartFileUpload
+
 logger = logging.getLogger('dashboard')
 
 class MainServerClient:
     
-    def __init__(self, base_url: str = None, api_key: str = None):
+    def __init__(self, base_url: str = None, api_key: str = None, max_concurrency: int = None):
         self.base_url = base_url or getattr(settings, 'MAIN_SERVER_URL', 'http://localhost:8000')
         self.api_key = api_key or getattr(settings, 'MAIN_SERVER_API_KEY', '')
+        self.max_concurrency = max(1, max_concurrency or getattr(settings, 'MAIN_SERVER_MAX_CONCURRENCY', 8))
+        self.pid = os.getpid()
         
         if not self.api_key or self.api_key == "":
             logger.info("API key not found. Starting auto-registration...")
             self._register_client_and_get_api_key()
         
         self.session = requests.Session()
+        adapter = HTTPAdapter(pool_connections=4, pool_maxsize=self.max_concurrency)
+        self.session.mount('http://', adapter)
+        self.session.mount('https://', adapter)
         self.session.headers.update({
             'X-API-KEY': self.api_key,
         })
@@ -33,6 +44,10 @@ class MainServerClient:
         self.retry_delay = 1
         
         self.timeout = 120
+
+        self._slots = threading.BoundedSemaphore(self.max_concurrency)
+        self._executor = None
+        self._executor_lock = threading.Lock()
     
     def _register_client_and_get_api_key(self):
         logger.info("API key not found. Starting client registration process...")
@@ -96,7 +111,9 @@ class MainServerClient:
         endpoint: str, 
         data: Dict = None, 
         files: Dict = None,
-        retry: bool = True
+        retry: bool = True,
+        timeout: Optional[float] = None,
+        upload: Optional[MultipartFileUpload] = None
     ) -> Dict:
         url = self._get_url(endpoint)
         attempts = 0
@@ -107,13 +124,15 @@ class MainServerClient:
             try:
                 logger.debug(f"Making {method} request to {url} (attempt {attempts})")
                 
-                response = self.session.request(
-                    method=method,
-                    url=url,
-                    data=data,
-                    files=files,
-                    timeout=self.timeout
-                )
+                with self._slots, (upload.open() if upload else nullcontext()) as body:
+                    response = self.session.request(
+                        method=method,
+                        url=url,
+                        data=data if body is None else body,
+                        files=files,
+                        headers={'Content-Type': upload.content_type} if upload else None,
+                        timeout=timeout or self.timeout
+                    )
                 
                 response.raise_for_status()
                 return response.json()
@@ -148,6 +167,45 @@ class MainServerClient:
             'error': last_error or 'Unknown error occurred'
         }
     
+    def post_file(self, endpoint: str, file_path: Path, data: Dict = None, timeout: Optional[float] = None) -> Dict:
+        return self._make_request(
+            method='POST',
+            endpoint=endpoint,
+            upload=MultipartFileUpload(file_path, fields=data),
+            timeout=timeout
+        )
+
+    def get_task_status(self, task_id: str, timeout: float = 10) -> Dict:
+        return self._make_request(
+            method='GET',
+            endpoint=f'tasks/{task_id}/status/',
+            retry=False,
+            timeout=timeout
+        )
+
+    def _get_executor(self) -> ThreadPoolExecutor:
+        with self._executor_lock:
+            if self._executor is None:
+                self._executor = ThreadPoolExecutor(
+                    max_workers=self.max_concurrency,
+                    thread_name_prefix='main-server'
+                )
+            return self._executor
+
+    def submit(self, fn: Callable, *args, **kwargs) -> Future:
+        return self._get_executor().submit(fn, *args, **kwargs)
+
+    def map_concurrent(self, fn: Callable, items: Iterable) -> Iterator[Tuple[Any, Any]]:
+        futures = {self.submit(fn, item): item for item in items}
+        for future in as_completed(futures):
+            item = futures[future]
+            try:
+                result = future.result()
+            except Exception as e:
+                logger.error(f"Concurrent main server call failed for {item}: {e}", exc_info=True)
+                result = None
+            yield item, result
+
     def extract_key(self, dummy_file_content: bytes) -> Optional[str]:
         try:
             response = self._make_request(
@@ -183,7 +241,11 @@ class MainServerClient:
         logger.debug(f"File-info raw response for {file_name}: {response}")
         
         first_layer = response.get('data', {})
-        result = first_layer.get('data', first_layer)
+        if not isinstance(first_layer, dict):
+            first_layer = {}
+        result = first_layer.get('data')
+        if not isinstance(result, dict):
+            result = first_layer
         
         logger.info(f"File-info for {file_name}: needs_decryption={result.get('needs_decryption')}, type={result.get('decryption_type')}")
         
@@ -244,11 +306,34 @@ class MainServerClient:
         except:
             return False
 
+_shared_client = None
+_shared_client_lock = threading.Lock()
+
 def get_main_server_client() -> MainServerClient:
-    return MainServerClient(
-        base_url=getattr(settings, 'MAIN_SERVER_URL', None),
-        api_key=getattr(settings, 'MAIN_SERVER_API_KEY', None)
-    )
+    global _shared_client
+    base_url = getattr(settings, 'MAIN_SERVER_URL', None)
+    api_key = getattr(settings, 'MAIN_SERVER_API_KEY', None)
+
+    with _shared_client_lock:
+        client = _shared_client
+        if (
+            client is None
+            or client.pid != os.getpid()
+            or (base_url and client.base_url != base_url)
+            or (api_key and client.api_key != api_key)
+        ):
+            _shared_client = MainServerClient(base_url=base_url, api_key=api_key)
+        return _shared_client
+
+def unwrap_result(response_json: Dict) -> Dict:
+    result = response_json
+    if 'data' in result and isinstance(result.get('data'), dict):
+        result = result['data']
+    if 'data' in result and isinstance(result.get('data'), dict):
+        inner = result['data']
+        if 'success' in inner or 'data_type' in inner:
+            result = inner
+    return result
 
 def process_file(
     file_content: bytes,
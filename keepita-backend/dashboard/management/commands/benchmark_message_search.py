@@ -0,0 +1,112 @@
+import itertools
+import random
+import sqlite3
+import string
+import time
+
+from django.core.management.base import BaseCommand, CommandError
+
+from dashboard.message_search import (FTS_TABLE, HIGHLIGHT_CLOSE, HIGHLIGHT_OPEN, MESSAGE_TABLE, SNIPPET_ELLIPSIS,
+                                      SNIPPET_TOKENS, fts_query)
+
+MESSAGE_SCHEMA = (
+    f"CREATE TABLE {MESSAGE_TABLE} (id INTEGER PRIMARY KEY, backup_id INTEGER NOT NULL, "
+    f"chat_thread_id INTEGER NOT NULL, date TEXT, body TEXT, seen BOOL, status INTEGER)",
+    f"CREATE INDEX message_backup_thread_date_idx ON {MESSAGE_TABLE} (backup_id, chat_thread_id, date)",
+)
+FTS_SCHEMA = (
+    f"CREATE VIRTUAL TABLE IF NOT EXISTS {FTS_TABLE} USING fts5("
+    f"body, content='{MESSAGE_TABLE}', content_rowid='id', tokenize='unicode61 remove_diacritics 2')",
+    f"CREATE TRIGGER IF NOT EXISTS {FTS_TABLE}_ai AFTER INSERT ON {MESSAGE_TABLE} BEGIN "
+    f"INSERT INTO {FTS_TABLE}(rowid, body) VALUES (new.id, new.body); END",
+    f"CREATE TRIGGER IF NOT EXISTS {FTS_TABLE}_ad AFTER DELETE ON {MESSAGE_TABLE} BEGIN "
+    f"INSERT INTO {FTS_TABLE}({FTS_TABLE}, rowid, body) VALUES ('delete', old.id, old.body); END",
+    f"CREATE TRIGGER IF NOT EXISTS {FTS_TABLE}_au AFTER UPDATE OF body ON {MESSAGE_TABLE} BEGIN "
+    f"INSERT INTO {FTS_TABLE}({FTS_TABLE}, rowid, body) VALUES ('delete', old.id, old.body); "
+    f"INSERT INTO {FTS_TABLE}(rowid, body) VALUES (new.id, new.body); END",
+)
+LIKE_SQL = (
+    f"SELECT id, body FROM {MESSAGE_TABLE} "
+    f"WHERE backup_id = ? AND chat_thread_id = ? AND body LIKE ? ESCAPE '\\' ORDER BY date DESC LIMIT ?"
+)
+FTS_SQL = (
+    f"SELECT m.id, highlight({FTS_TABLE}, 0, ?, ?), snippet({FTS_TABLE}, 0, ?, ?, ?, ?) "
+    f"FROM {FTS_TABLE} JOIN {MESSAGE_TABLE} m ON m.id = {FTS_TABLE}.rowid "
+    f"WHERE {FTS_TABLE} MATCH ? AND m.backup_id = ? AND m.chat_thread_id = ? ORDER BY bm25({FTS_TABLE}) LIMIT ?"
+)
+
+def _vocabulary(size, rng):
+    return [''.join(rng.choices(string.ascii_lowercase, k=rng.randint(3, 9))) for _ in range(size)]
+
+class Command(BaseCommand):
+    help = 'Benchmark LIKE scans against the FTS5 message index on a synthetic in-memory dataset.'
+
+    def add_arguments(self, parser):
+        parser.add_argument('--messages', type=int, default=200000, help='Number of synthetic messages.')
+        parser.add_argument('--backups', type=int, default=4, help='Number of synthetic backups.')
+        parser.add_argument('--threads', type=int, default=10, help='Chat threads per backup.')
+        parser.add_argument('--queries', type=int, default=200, help='Number of search queries to time.')
+        parser.add_argument('--limit', type=int, default=50, help='Maximum results per query.')
+        parser.add_argument('--seed', type=int, default=7)
+
+    def handle(self, *args, **options):
+        rng = random.Random(options['seed'])
+        conn = sqlite3.connect(':memory:')
+        try:
+            conn.execute("CREATE VIRTUAL TABLE fts5_probe USING fts5(x)")
+            conn.execute("DROP TABLE fts5_probe")
+        except sqlite3.OperationalError as e:
+            raise CommandError(f"This SQLite build ({sqlite3.sqlite_version}) lacks FTS5: {e}")
+
+        for statement in MESSAGE_SCHEMA + FTS_SCHEMA:
+            conn.execute(statement)
+
+        words = _vocabulary(5000, rng)
+        cum_weights = list(itertools.accumulate(1 / (rank + 1) for rank in range(len(words))))
+        backups, threads = options['backups'], options['threads']
+
+        def rows():
+            for message_id in range(1, options['messages'] + 1):
+                body = ' '.join(rng.choices(words, cum_weights=cum_weights, k=rng.randint(4, 30)))
+                yield (message_id, rng.randint(1, backups), rng.randint(1, threads), f"2024-01-01 {message_id % 86400:05d}",
+                       body.capitalize(), rng.random() < 0.5, 1)
+
+        started = time.perf_counter()
+        conn.executemany(f"INSERT INTO {MESSAGE_TABLE} VALUES (?, ?, ?, ?, ?, ?, ?)", rows())
+        conn.commit()
+        ingest_seconds = time.perf_counter() - started
+        self.stdout.write(f"Inserted {options['messages']} messages with FTS triggers in {ingest_seconds:.2f}s")
+
+        searches = [
+            (rng.choice(words[:2000]), rng.randint(1, backups), rng.randint(1, threads))
+            for _ in range(options['queries'])
+        ]
+        limit = options['limit']
+
+        started = time.perf_counter()
+        like_hits = 0
+        for term, backup_id, thread_id in searches:
+            like_hits += len(conn.execute(LIKE_SQL, (backup_id, thread_id, f"%{term}%", limit)).fetchall())
+        like_seconds = time.perf_counter() - started
+
+        started = time.perf_counter()
+        fts_hits = 0
+        for term, backup_id, thread_id in searches:
+            fts_hits += len(conn.execute(FTS_SQL, (
+                HIGHLIGHT_OPEN, HIGHLIGHT_CLOSE, HIGHLIGHT_OPEN, HIGHLIGHT_CLOSE, SNIPPET_ELLIPSIS, SNIPPET_TOKENS,
+                fts_query(term), backup_id, thread_id, limit,
+            )).fetchall())
+        fts_seconds = time.perf_counter() - started
+
+        started = time.perf_counter()
+        for term, _, _ in searches[:20]:
+            conn.execute(f"SELECT count(*) FROM {MESSAGE_TABLE} WHERE body LIKE ? ESCAPE '\\'", (f"%{term}%",)).fetchone()
+        table_like_seconds = (time.perf_counter() - started) / min(20, len(searches))
+        conn.close()
+
+        queries = len(searches)
+        self.stdout.write(f"LIKE per thread:  {like_seconds / queries * 1000:.2f} ms/query ({like_hits} hits)")
+        self.stdout.write(f"FTS5 per thread:  {fts_seconds / queries * 1000:.2f} ms/query ({fts_hits} hits)")
+        self.stdout.write(f"LIKE whole table: {table_like_seconds * 1000:.2f} ms/query")
+        if fts_seconds:
+            self.stdout.write(f"FTS5 speedup over per-thread LIKE: {like_seconds / fts_seconds:.1f}x")
@@ -0,0 +1,69 @@
+import logging
+import multiprocessing
+import signal
+
+from django.conf import settings
+from django.core.management.base import BaseCommand
+from django.db import connections
+
+from dashboard.memory_budget import configure_memory_accountant
+
+logger = logging.getLogger('dashboard')
+
+def _worker_main(poll_interval, workers):
+    import django
+    django.setup()
+
+    from dashboard.ingest_queue import IngestWorker
+
+    configure_memory_accountant(workers)
+
+    worker = IngestWorker(poll_interval=poll_interval)
+    signal.signal(signal.SIGTERM, lambda *_: worker.stop())
+    signal.signal(signal.SIGINT, lambda *_: worker.stop())
+    worker.run_forever()
+
+class Command(BaseCommand):
+    help = 'Run background workers that process queued backup ingest jobs.'
+
+    def add_arguments(self, parser):
+        parser.add_argument('--concurrency', type=int, default=None, help='Number of worker processes to run (defaults to INGEST_WORKERS).')
+        parser.add_argument('--poll-interval', type=float, default=None, help='Seconds to wait between polls when the queue is empty.')
+
+    def handle(self, *args, **options):
+        concurrency = max(1, options['concurrency'] or settings.INGEST_WORKERS)
+        poll_interval = options['poll_interval']
+
+        if concurrency == 1:
+            from dashboard.ingest_queue import IngestWorker
+
+            configure_memory_accountant(concurrency)
+
+            worker = IngestWorker(poll_interval=poll_interval)
+            signal.signal(signal.SIGTERM, lambda *_: worker.stop())
+            signal.signal(signal.SIGINT, lambda *_: worker.stop())
+            self.stdout.write(f"Starting ingest worker {worker.worker_id}")
+            worker.run_forever()
+            return
+
+        connections.close_all()
+        processes = [
+            multiprocessing.Process(target=_worker_main, args=(poll_interval, concurrency), name=f'ingest-worker-{i}')
+            for i in range(concurrency)
+        ]
+        for process in processes:
+            process.start()
+        self.stdout.write(f"Started {concurrency} ingest workers")
+
+        def shutdown(*_):
+            for process in processes:
+                if process.is_alive():
+                    process.terminate()
+
+        signal.signal(signal.SIGTERM, shutdown)
+        signal.signal(signal.SIGINT, shutdown)
+
+        for process in processes:
+            process.join()
+            if process.exitcode:
+                logger.warning(f"Ingest worker {process.name} exited with code {process.exitcode}")
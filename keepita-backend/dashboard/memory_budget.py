@@ -0,0 +1,162 @@
+import logging
+import sys
+import threading
+import time
+from contextlib import contextmanager
+from typing import Dict, Iterator, Optional
+
+from django.conf import settings
+
+logger = logging.getLogger('dashboard')
+
+try:
+    import resource
+except ImportError:
+    resource = None
+
+class _Usage:
+
+    def __init__(self):
+        self.in_use = 0
+        self.peak = 0
+        self.by_category: Dict[str, int] = {}
+        self.peak_by_category: Dict[str, int] = {}
+        self.waits = 0
+        self.wait_seconds = 0.0
+        self.overcommits = 0
+
+    def add(self, size: int, category: str):
+        self.in_use += size
+        self.peak = max(self.peak, self.in_use)
+        current = self.by_category.get(category, 0) + size
+        self.by_category[category] = current
+        self.peak_by_category[category] = max(self.peak_by_category.get(category, 0), current)
+
+    def remove(self, size: int, category: str):
+        self.in_use = max(0, self.in_use - size)
+        self.by_category[category] = max(0, self.by_category.get(category, 0) - size)
+
+    def as_dict(self) -> Dict:
+        return {
+            'in_use_bytes': self.in_use,
+            'peak_bytes': self.peak,
+            'peak_by_category': dict(self.peak_by_category),
+            'waits': self.waits,
+            'wait_seconds': round(self.wait_seconds, 3),
+            'overcommits': self.overcommits,
+        }
+
+class MemoryAccountant:
+
+    def __init__(self, max_bytes: int = 0, wait_timeout: float = 30.0):
+        self.max_bytes = max(0, int(max_bytes))
+        self.wait_timeout = wait_timeout
+        self._total = _Usage()
+        self._owners: Dict[object, _Usage] = {}
+        self._cond = threading.Condition()
+
+    def _owner(self, owner) -> Optional[_Usage]:
+        if owner is None:
+            return None
+        usage = self._owners.get(owner)
+        if usage is None:
+            usage = self._owners[owner] = _Usage()
+        return usage
+
+    def acquire(self, size: int, category: str, owner=None, block: bool = True):
+        size = max(0, int(size))
+        with self._cond:
+            owner_usage = self._owner(owner)
+            if block and self.max_bytes and self._total.in_use and self._total.in_use + size > self.max_bytes:
+                started = time.monotonic()
+                deadline = started + self.wait_timeout
+                while self._total.in_use and self._total.in_use + size > self.max_bytes:
+                    remaining = deadline - time.monotonic()
+                    if remaining <= 0:
+                        self._total.overcommits += 1
+                        if owner_usage:
+                            owner_usage.overcommits += 1
+                        logger.warning(
+                            f"Memory budget of {self.max_bytes} bytes exceeded by a {size} byte {category} "
+                            f"reservation after waiting {self.wait_timeout}s, proceeding anyway"
+                        )
+                        break
+                    self._cond.wait(remaining)
+                waited = time.monotonic() - started
+                for usage in (self._total, owner_usage):
+                    if usage:
+                        usage.waits += 1
+                        usage.wait_seconds += waited
+
+            self._total.add(size, category)
+            if owner_usage:
+                owner_usage.add(size, category)
+
+    def release(self, size: int, category: str, owner=None):
+        size = max(0, int(size))
+        with self._cond:
+            self._total.remove(size, category)
+            owner_usage = self._owners.get(owner)
+            if owner_usage:
+                owner_usage.remove(size, category)
+            self._cond.notify_all()
+
+    @contextmanager
+    def reserve(self, size: int, category: str, owner=None) -> Iterator[None]:
+        self.acquire(size, category, owner)
+        try:
+            yield
+        finally:
+            self.release(size, category, owner)
+
+    def usage(self, owner=None) -> Dict:
+        with self._cond:
+            usage = self._owners.get(owner) if owner is not None else self._total
+            data = usage.as_dict() if usage else _Usage().as_dict()
+            data['budget_bytes'] = self.max_bytes
+            data['process_peak_bytes'] = self._total.peak
+        max_rss = process_max_rss()
+        if max_rss is not None:
+            data['process_max_rss_bytes'] = max_rss
+        return data
+
+    def forget(self, owner):
+        with self._cond:
+            self._owners.pop(owner, None)
+
+def process_max_rss() -> Optional[int]:
+    if resource is None:
+        return None
+    max_rss = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss
+    return max_rss if sys.platform == 'darwin' else max_rss * 1024
+
+_accountant = None
+_accountant_lock = threading.Lock()
+
+def process_memory_budget(workers: Optional[int] = None) -> int:
+    if workers is None:
+        workers = getattr(settings, 'INGEST_WORKERS', 1)
+    budget = getattr(settings, 'INGEST_MEMORY_BUDGET_BYTES', 512 * 1024 * 1024)
+    return budget // (max(1, workers) + 1)
+
+def _build_accountant(workers: Optional[int] = None) -> MemoryAccountant:
+    return MemoryAccountant(
+        process_memory_budget(workers),
+        getattr(settings, 'INGEST_MEMORY_WAIT_TIMEOUT', 30.0),
+    )
+
+def get_memory_accountant() -> MemoryAccountant:
+    global _accountant
+    with _accountant_lock:
+        if _accountant is None:
+            _accountant = _build_accountant()
+        return _accountant
+
+def configure_memory_accountant(workers: int) -> MemoryAccountant:
+    global _accountant
+    with _accountant_lock:
+        _accountant = _build_accountant(workers)
+        return _accountant
+
+def reserve_memory(size: int, category: str, owner=None):
+    return get_memory_accountant().reserve(size, category, owner)
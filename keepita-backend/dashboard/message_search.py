@@ -0,0 +1,92 @@
+import logging
+import re
+
+from django.db import DatabaseError, connection
+
+from .models import Message
+
+logger = logging.getLogger('dashboard')
+
+FTS_TABLE = 'dashboard_message_fts'
+MESSAGE_TABLE = 'dashboard_message'
+HIGHLIGHT_OPEN = '<mark>'
+HIGHLIGHT_CLOSE = '</mark>'
+SNIPPET_ELLIPSIS = '...'
+SNIPPET_TOKENS = 16
+DEFAULT_LIMIT = 50
+
+SEARCH_SQL = (
+    f"SELECT m.id, m.body, m.date, m.seen, m.status, "
+    f"highlight({FTS_TABLE}, 0, %s, %s) AS highlighted_body, "
+    f"snippet({FTS_TABLE}, 0, %s, %s, %s, %s) AS snippet, "
+    f"bm25({FTS_TABLE}) AS rank "
+    f"FROM {FTS_TABLE} JOIN {MESSAGE_TABLE} m ON m.id = {FTS_TABLE}.rowid "
+    f"WHERE {FTS_TABLE} MATCH %s AND m.backup_id = %s AND m.chat_thread_id = %s "
+    f"ORDER BY rank LIMIT %s"
+)
+
+_TOKEN_RE = re.compile(r'\w+', re.UNICODE)
+
+def fts_available(using=None) -> bool:
+    conn = using or connection
+    if conn.vendor != 'sqlite':
+        return False
+    with conn.cursor() as cursor:
+        cursor.execute("SELECT 1 FROM sqlite_master WHERE type = 'table' AND name = %s", [FTS_TABLE])
+        return cursor.fetchone() is not None
+
+def fts_query(query: str) -> str:
+    return ' '.join(f'"{token}"*' for token in _TOKEN_RE.findall(query))
+
+def highlight_text(text: str, query: str) -> str:
+    if not text or not query:
+        return text
+    pattern = re.compile(re.escape(query), re.IGNORECASE)
+    return pattern.sub(lambda match: f"{HIGHLIGHT_OPEN}{match.group(0)}{HIGHLIGHT_CLOSE}", text)
+
+def _search_fts(backup_id, thread_id, query, limit):
+    match = fts_query(query)
+    if not match:
+        return []
+    params = [
+        HIGHLIGHT_OPEN, HIGHLIGHT_CLOSE,
+        HIGHLIGHT_OPEN, HIGHLIGHT_CLOSE, SNIPPET_ELLIPSIS, SNIPPET_TOKENS,
+        match, backup_id, thread_id, limit,
+    ]
+    return [
+        {
+            'message_id': message.id,
+            'body': message.body,
+            'highlighted_body': message.highlighted_body,
+            'snippet': message.snippet,
+            'rank': message.rank,
+            'date': message.date,
+            'seen': message.seen,
+            'status': message.status,
+        }
+        for message in Message.objects.raw(SEARCH_SQL, params)
+    ]
+
+def _search_like(queryset, query, limit):
+    results = []
+    for message in queryset.filter(body__icontains=query)[:limit]:
+        highlighted = highlight_text(message.body, query)
+        results.append({
+            'message_id': message.id,
+            'body': message.body,
+            'highlighted_body': highlighted,
+            'snippet': highlighted,
+            'rank': None,
+            'date': message.date,
+            'seen': message.seen,
+            'status': message.status,
+        })
+    return results
+
+def search_messages(queryset, backup_id, thread_id, query, limit=DEFAULT_LIMIT):
+    if fts_available():
+        try:
+            return _search_fts(backup_id, thread_id, query, limit), 'fts'
+        except DatabaseError as e:
+            logger.warning(f"FTS message search failed for thread {thread_id}, falling back to LIKE: {e}")
+    return _search_like(queryset, query, limit), 'like'
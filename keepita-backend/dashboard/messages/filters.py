@@ -1,5 +1,5 @@
 import django_filters
-from django.db.models import Count, Max, Q
+from django.db.models import Q
 
 from dashboard.models import ChatThread, Message
 
@@ -35,35 +35,27 @@ class ChatThreadFilter(django_filters.FilterSet):
     
     def filter_has_messages(self, queryset, name, value):
         if value:
-            return queryset.filter(messages__isnull=False).distinct()
+            return queryset.filter(message_count__gt=0)
         else:
-            return queryset.filter(messages__isnull=True)
+            return queryset.filter(message_count=0)
     
     def filter_min_messages(self, queryset, name, value):
-        return queryset.annotate(
-            messages_count=Count('messages')
-        ).filter(messages_count__gte=value)
+        return queryset.filter(message_count__gte=value)
     
     def filter_max_messages(self, queryset, name, value):
-        return queryset.annotate(
-            messages_count=Count('messages')
-        ).filter(messages_count__lte=value)
+        return queryset.filter(message_count__lte=value)
     
     def filter_has_unread(self, queryset, name, value):
         if value:
-            return queryset.filter(messages__seen=False).distinct()
+            return queryset.filter(unread_count__gt=0)
         else:
-            return queryset.exclude(messages__seen=False).distinct()
+            return queryset.filter(unread_count=0)
     
     def filter_last_message_after(self, queryset, name, value):
-        return queryset.annotate(
-            last_message_date=Max('messages__date')
-        ).filter(last_message_date__gte=value)
+        return queryset.filter(last_message_date__gte=value)
     
     def filter_last_message_before(self, queryset, name, value):
-        return queryset.annotate(
-            last_message_date=Max('messages__date')
-        ).filter(last_message_date__lte=value)
+        return queryset.filter(last_message_date__lte=value)
 
 class MessageFilter(django_filters.FilterSet):
     
@@ -22,8 +22,7 @@ class ChatThreadListSerializer(serializers.ModelSerializer):
     contact = ContactBasicSerializer(read_only=True)
     last_message = serializers.SerializerMethodField()
     last_message_date = serializers.SerializerMethodField()
-    messages_count = serializers.SerializerMethodField()
-    unread_count = serializers.SerializerMethodField()
+    messages_count = serializers.IntegerField(source='message_count', read_only=True)
     
     class Meta:
         model = ChatThread
@@ -33,20 +32,13 @@ class ChatThreadListSerializer(serializers.ModelSerializer):
         ]
     
     def get_last_message(self, obj):
-        last_message = obj.messages.order_by('-date').first()
-        if last_message:
-            return last_message.body[:100] + ('...' if len(last_message.body or '') > 100 else '')
-        return None
+        if not obj.message_count:
+            return None
+        body = obj.last_message_body or ''
+        return body[:100] + ('...' if len(body) > 100 else '')
     
     def get_last_message_date(self, obj):
-        last_message = obj.messages.order_by('-date').first()
-        return last_message.date if last_message else obj.created_at
-    
-    def get_messages_count(self, obj):
-        return obj.messages.count()
-    
-    def get_unread_count(self, obj):
-        return obj.messages.filter(seen=False).count()
+        return obj.last_message_date if obj.message_count else obj.created_at
 
 class ChatThreadDetailSerializer(serializers.ModelSerializer):
     contact = ContactBasicSerializer(read_only=True)
@@ -61,7 +53,7 @@ class ChatThreadDetailSerializer(serializers.ModelSerializer):
         ]
     
     def get_messages_count(self, obj):
-        return obj.messages.count()
+        return obj.message_count
 
 class ChatThreadOverviewSerializer(serializers.ModelSerializer):
     contact = ContactBasicSerializer(read_only=True)
@@ -89,10 +81,10 @@ class ChatThreadOverviewSerializer(serializers.ModelSerializer):
         return last_message.date if last_message else None
     
     def get_messages_count(self, obj):
-        return obj.messages.count()
+        return obj.message_count
     
     def get_unread_count(self, obj):
-        return obj.messages.filter(seen=False).count()
+        return obj.unread_count
     
     def get_first_message_date(self, obj):
         first_message = obj.messages.order_by('date').first()
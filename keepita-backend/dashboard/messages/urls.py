@@ -11,4 +11,5 @@ app_name = 'messages'
 urlpatterns = [
     path('', include(router.urls)),    
     path('threads/<int:thread_pk>/messages/', views.ThreadMessageViewSet.as_view({'get': 'list'}), name='thread-messages-list'),
+    path('threads/<int:thread_pk>/messages/search/', views.ThreadMessageViewSet.as_view({'get': 'search'}), name='thread-messages-search'),
 ]
@@ -1,5 +1,5 @@
-from config.pagination import DefaultPagination
-from django.db.models import Count, Max, Min, Prefetch, Q
+from config.pagination import DefaultPagination, KeysetPagination
+from django.db.models import Count, F, Min
 from django.shortcuts import get_object_or_404
 from django_filters.rest_framework import DjangoFilterBackend
 from rest_framework import status, viewsets
@@ -12,6 +12,7 @@ from rest_framework.views import APIView
 from drf_yasg.utils import swagger_auto_schema
 from drf_yasg import openapi
 
+from dashboard.message_search import search_messages
 from dashboard.models import Backup, ChatThread, Message
 
 from .filters import ChatThreadFilter, MessageFilter
@@ -54,16 +55,6 @@ class ChatThreadViewSet(viewsets.ReadOnlyModelViewSet):
             backup__user_id=user.pk
         ).select_related(
             'contact', 'backup'
-        ).prefetch_related(
-            Prefetch(
-                'messages',
-                queryset=Message.objects.order_by('-date'),
-                to_attr='ordered_messages'
-            )
-        ).annotate(
-            messages_count=Count('messages'),
-            unread_count=Count('messages', filter=Q(messages__seen=False)),
-            last_message_date=Max('messages__date')
         )
 
         if backup_pk:
@@ -94,20 +85,20 @@ class ChatThreadViewSet(viewsets.ReadOnlyModelViewSet):
         
         
         total_threads = queryset.count()
-        threads_with_messages = queryset.filter(messages__isnull=False).distinct().count()
-        threads_with_unread = queryset.filter(messages__seen=False).distinct().count()
+        threads_with_messages = queryset.filter(message_count__gt=0).count()
+        threads_with_unread = queryset.filter(unread_count__gt=0).count()
         
         
         from django.db.models import Avg, Sum
         message_stats = queryset.aggregate(
-            total_messages=Sum('messages_count'),
-            avg_messages_per_thread=Avg('messages_count'),
+            total_messages=Sum('message_count'),
+            avg_messages_per_thread=Avg('message_count'),
             total_unread=Sum('unread_count')
         )
         
         
-        most_active = queryset.order_by('-messages_count')[:10].values(
-            'id', 'address', 'contact__name', 'messages_count'
+        most_active = queryset.order_by('-message_count')[:10].values(
+            'id', 'address', 'contact__name', messages_count=F('message_count')
         )
         
         return Response({
@@ -140,7 +131,8 @@ class ThreadMessageViewSet(viewsets.ReadOnlyModelViewSet):
     search_fields = ['body']
     ordering_fields = ['date', 'created_at', 'status', 'seen']
     ordering = ['-date']
-    pagination_class = DefaultPagination
+    pagination_class = KeysetPagination
+    keyset_field = '-date'
 
     def get_queryset(self):
         if getattr(self, 'swagger_fake_view', False):
@@ -161,6 +153,7 @@ class ThreadMessageViewSet(viewsets.ReadOnlyModelViewSet):
         )
 
         return Message.objects.filter(
+            backup_id=thread.backup_id,
             chat_thread=thread
         ).select_related(
             'chat_thread', 'chat_thread__contact'
@@ -211,29 +204,12 @@ class ThreadMessageViewSet(viewsets.ReadOnlyModelViewSet):
             return Response({'error': 'Query parameter "q" is required'}, 
                           status=status.HTTP_400_BAD_REQUEST)
         
-        messages = self.get_queryset().filter(body__icontains=query)[:50]
-        
-        results = []
-        for message in messages:
-            
-            highlighted_body = message.body
-            if query.lower() in highlighted_body.lower():
-                highlighted_body = highlighted_body.replace(
-                    query, f"<mark>{query}</mark>"
-                )
-            
-            results.append({
-                'message_id': message.id,
-                'body': message.body,
-                'highlighted_body': highlighted_body,
-                'date': message.date,
-                'seen': message.seen,
-                'status': message.status
-            })
+        results, engine = search_messages(self.get_queryset(), backup_pk, thread_pk, query)
         
         return Response({
             'thread_id': thread_pk,
             'query': query,
+            'engine': engine,
             'total_results': len(results),
             'results': results
         })
\ No newline at end of file
@@ -0,0 +1,18 @@
+# Generated by Django 5.1.7 on 2026-10-17 01:05
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('dashboard', '0017_increase_file_max_length'),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name='backuplog',
+            name='extractor_timings',
+            field=models.JSONField(blank=True, default=dict, verbose_name='Extractor Timings'),
+        ),
+    ]
@@ -0,0 +1,18 @@
+# Generated by Django 5.1.7 on 2026-10-17 01:36
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('dashboard', '0020_blob'),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name='backuplog',
+            name='memory_usage',
+            field=models.JSONField(blank=True, default=dict, verbose_name='Memory Usage'),
+        ),
+    ]
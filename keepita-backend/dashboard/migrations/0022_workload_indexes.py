@@ -0,0 +1,111 @@
+# Generated by Django 5.1.7 on 2026-10-17 01:37
+
+from django.conf import settings
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('dashboard', '0021_backuplog_memory_usage'),
+        migrations.swappable_dependency(settings.AUTH_USER_MODEL),
+    ]
+
+    operations = [
+        migrations.AddIndex(
+            model_name='alarm',
+            index=models.Index(fields=['backup', 'created_at'], name='alarm_backup_created_idx'),
+        ),
+        migrations.AddIndex(
+            model_name='apklist',
+            index=models.Index(fields=['backup', 'apk_name'], name='apklist_backup_name_idx'),
+        ),
+        migrations.AddIndex(
+            model_name='backup',
+            index=models.Index(fields=['user', 'created_at'], name='backup_user_created_idx'),
+        ),
+        migrations.AddIndex(
+            model_name='backuplog',
+            index=models.Index(fields=['backup', 'created_at'], name='backuplog_backup_created_idx'),
+        ),
+        migrations.AddIndex(
+            model_name='bluetoothdevice',
+            index=models.Index(fields=['backup', 'last_connected'], name='bt_backup_connected_idx'),
+        ),
+        migrations.AddIndex(
+            model_name='browserbookmark',
+            index=models.Index(fields=['backup', 'created_at'], name='bookmark_backup_created_idx'),
+        ),
+        migrations.AddIndex(
+            model_name='browserdownload',
+            index=models.Index(fields=['backup', 'download_time'], name='download_backup_time_idx'),
+        ),
+        migrations.AddIndex(
+            model_name='browserhistory',
+            index=models.Index(fields=['backup', 'last_visit_time'], name='history_backup_visit_idx'),
+        ),
+        migrations.AddIndex(
+            model_name='browsersearch',
+            index=models.Index(fields=['backup', 'search_time'], name='search_backup_time_idx'),
+        ),
+        migrations.AddIndex(
+            model_name='browsertab',
+            index=models.Index(fields=['backup', 'last_accessed'], name='tab_backup_accessed_idx'),
+        ),
+        migrations.AddIndex(
+            model_name='calendarevent',
+            index=models.Index(fields=['backup', 'start_date'], name='calendar_backup_start_idx'),
+        ),
+        migrations.AddIndex(
+            model_name='calllog',
+            index=models.Index(fields=['backup', 'date'], name='calllog_backup_date_idx'),
+        ),
+        migrations.AddIndex(
+            model_name='calllog',
+            index=models.Index(fields=['backup', 'type'], name='calllog_backup_type_idx'),
+        ),
+        migrations.AddIndex(
+            model_name='chatthread',
+            index=models.Index(fields=['backup', 'created_at'], name='chatthread_backup_created_idx'),
+        ),
+        migrations.AddIndex(
+            model_name='contact',
+            index=models.Index(fields=['backup', 'name'], name='contact_backup_name_idx'),
+        ),
+        migrations.AddIndex(
+            model_name='file',
+            index=models.Index(fields=['backup', 'created_date'], name='file_backup_created_idx'),
+        ),
+        migrations.AddIndex(
+            model_name='file',
+            index=models.Index(fields=['backup', 'category', 'created_date'], name='file_backup_category_idx'),
+        ),
+        migrations.AddIndex(
+            model_name='homescreenlayout',
+            index=models.Index(fields=['backup', 'created_at'], name='hslayout_backup_created_idx'),
+        ),
+        migrations.AddIndex(
+            model_name='iosnotification',
+            index=models.Index(fields=['backup', 'timestamp'], name='iosnotif_backup_time_idx'),
+        ),
+        migrations.AddIndex(
+            model_name='message',
+            index=models.Index(fields=['backup', 'chat_thread', 'date'], name='message_backup_thread_date_idx'),
+        ),
+        migrations.AddIndex(
+            model_name='note',
+            index=models.Index(fields=['backup', 'created_at'], name='note_backup_created_idx'),
+        ),
+        migrations.AddIndex(
+            model_name='notification',
+            index=models.Index(fields=['user', 'created_at'], name='notification_user_created_idx'),
+        ),
+        migrations.AddIndex(
+            model_name='wallpaper',
+            index=models.Index(fields=['backup', 'created_at'], name='wallpaper_backup_created_idx'),
+        ),
+        migrations.AddIndex(
+            model_name='wifinetwork',
+            index=models.Index(fields=['backup', 'created_at'], name='wifi_backup_created_idx'),
+        ),
+    ]
@@ -0,0 +1,47 @@
+# Generated by Django 5.1.7 on 2026-10-17 01:40
+
+import django.db.models.deletion
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('dashboard', '0022_workload_indexes'),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name='BackupStats',
+            fields=[
+                ('backup', models.OneToOneField(on_delete=django.db.models.deletion.CASCADE, primary_key=True, related_name='stats', serialize=False, to='dashboard.backup')),
+                ('contacts_count', models.PositiveIntegerField(default=0, verbose_name='Contacts')),
+                ('messages_count', models.PositiveIntegerField(default=0, verbose_name='Messages')),
+                ('threads_count', models.PositiveIntegerField(default=0, verbose_name='Chat Threads')),
+                ('call_logs_count', models.PositiveIntegerField(default=0, verbose_name='Call Logs')),
+                ('apps_count', models.PositiveIntegerField(default=0, verbose_name='Apps')),
+                ('files_count', models.PositiveIntegerField(default=0, verbose_name='Files')),
+                ('images_count', models.PositiveIntegerField(default=0, verbose_name='Images')),
+                ('videos_count', models.PositiveIntegerField(default=0, verbose_name='Videos')),
+                ('musics_count', models.PositiveIntegerField(default=0, verbose_name='Musics')),
+                ('other_files_count', models.PositiveIntegerField(default=0, verbose_name='Other Files')),
+                ('files_bytes', models.BigIntegerField(default=0, verbose_name='Files Size')),
+                ('browser_count', models.PositiveIntegerField(default=0, verbose_name='Browser Rows')),
+                ('wifi_networks_count', models.PositiveIntegerField(default=0, verbose_name='WiFi Networks')),
+                ('bluetooth_devices_count', models.PositiveIntegerField(default=0, verbose_name='Bluetooth Devices')),
+                ('alarms_count', models.PositiveIntegerField(default=0, verbose_name='Alarms')),
+                ('home_screen_items_count', models.PositiveIntegerField(default=0, verbose_name='Home Screen Items')),
+                ('wallpapers_count', models.PositiveIntegerField(default=0, verbose_name='Wallpapers')),
+                ('notes_count', models.PositiveIntegerField(default=0, verbose_name='Notes')),
+                ('calendar_count', models.PositiveIntegerField(default=0, verbose_name='Calendar Events')),
+                ('notifications_count', models.PositiveIntegerField(default=0, verbose_name='Notifications')),
+                ('reminders_count', models.PositiveIntegerField(default=0, verbose_name='Reminders')),
+                ('has_metadata', models.BooleanField(default=False, verbose_name='Has Metadata')),
+                ('updated_at', models.DateTimeField(auto_now=True, verbose_name='Updated At')),
+            ],
+            options={
+                'verbose_name': 'Backup Stats',
+                'verbose_name_plural': 'Backup Stats',
+            },
+        ),
+    ]
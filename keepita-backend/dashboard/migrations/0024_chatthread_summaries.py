@@ -0,0 +1,63 @@
+# Generated by Django 5.1.7 on 2026-10-17 01:42
+
+from django.db import migrations, models
+
+
+def backfill_thread_summaries(apps, schema_editor):
+    ChatThread = apps.get_model('dashboard', 'ChatThread')
+    Message = apps.get_model('dashboard', 'Message')
+    latest = Message.objects.filter(chat_thread_id=models.OuterRef('pk')).order_by('-date', '-id')
+    threads = ChatThread.objects.annotate(
+        summary_count=models.Count('messages'),
+        summary_unread=models.Count('messages', filter=models.Q(messages__seen=False)),
+        summary_date=models.Max('messages__date'),
+        summary_body=models.Subquery(latest.values('body')[:1]),
+    )
+    batch = []
+    fields = ['message_count', 'unread_count', 'last_message_date', 'last_message_body']
+    for thread in threads.iterator(chunk_size=500):
+        thread.message_count = thread.summary_count
+        thread.unread_count = thread.summary_unread
+        thread.last_message_date = thread.summary_date
+        thread.last_message_body = thread.summary_body
+        batch.append(thread)
+        if len(batch) >= 500:
+            ChatThread.objects.bulk_update(batch, fields)
+            batch = []
+    if batch:
+        ChatThread.objects.bulk_update(batch, fields)
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('dashboard', '0023_backupstats'),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name='chatthread',
+            name='last_message_body',
+            field=models.TextField(blank=True, null=True, verbose_name='Last Message Body'),
+        ),
+        migrations.AddField(
+            model_name='chatthread',
+            name='last_message_date',
+            field=models.DateTimeField(blank=True, null=True, verbose_name='Last Message Date'),
+        ),
+        migrations.AddField(
+            model_name='chatthread',
+            name='message_count',
+            field=models.PositiveIntegerField(default=0, verbose_name='Message Count'),
+        ),
+        migrations.AddField(
+            model_name='chatthread',
+            name='unread_count',
+            field=models.PositiveIntegerField(default=0, verbose_name='Unread Count'),
+        ),
+        migrations.AddIndex(
+            model_name='chatthread',
+            index=models.Index(fields=['backup', 'last_message_date'], name='chatthread_backup_last_idx'),
+        ),
+        migrations.RunPython(backfill_thread_summaries, migrations.RunPython.noop),
+    ]
@@ -0,0 +1,56 @@
+import logging
+
+from django.db import DatabaseError, migrations
+
+logger = logging.getLogger('dashboard')
+
+CREATE_FTS = (
+    "CREATE VIRTUAL TABLE IF NOT EXISTS dashboard_message_fts USING fts5("
+    "body, content='dashboard_message', content_rowid='id', tokenize='unicode61 remove_diacritics 2')",
+    "CREATE TRIGGER IF NOT EXISTS dashboard_message_fts_ai AFTER INSERT ON dashboard_message BEGIN "
+    "INSERT INTO dashboard_message_fts(rowid, body) VALUES (new.id, new.body); END",
+    "CREATE TRIGGER IF NOT EXISTS dashboard_message_fts_ad AFTER DELETE ON dashboard_message BEGIN "
+    "INSERT INTO dashboard_message_fts(dashboard_message_fts, rowid, body) VALUES ('delete', old.id, old.body); END",
+    "CREATE TRIGGER IF NOT EXISTS dashboard_message_fts_au AFTER UPDATE OF body ON dashboard_message BEGIN "
+    "INSERT INTO dashboard_message_fts(dashboard_message_fts, rowid, body) VALUES ('delete', old.id, old.body); "
+    "INSERT INTO dashboard_message_fts(rowid, body) VALUES (new.id, new.body); END",
+)
+REBUILD_FTS = "INSERT INTO dashboard_message_fts(dashboard_message_fts) VALUES ('rebuild')"
+DROP_FTS = (
+    "DROP TRIGGER IF EXISTS dashboard_message_fts_ai",
+    "DROP TRIGGER IF EXISTS dashboard_message_fts_ad",
+    "DROP TRIGGER IF EXISTS dashboard_message_fts_au",
+    "DROP TABLE IF EXISTS dashboard_message_fts",
+)
+
+
+def create_message_fts(apps, schema_editor):
+    if schema_editor.connection.vendor != 'sqlite':
+        return
+    with schema_editor.connection.cursor() as cursor:
+        try:
+            for statement in CREATE_FTS:
+                cursor.execute(statement)
+        except DatabaseError as e:
+            logger.warning(f"SQLite FTS5 is unavailable, message search will use LIKE scans: {e}")
+            return
+        cursor.execute(REBUILD_FTS)
+
+
+def drop_message_fts(apps, schema_editor):
+    if schema_editor.connection.vendor != 'sqlite':
+        return
+    with schema_editor.connection.cursor() as cursor:
+        for statement in DROP_FTS:
+            cursor.execute(statement)
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('dashboard', '0024_chatthread_summaries'),
+    ]
+
+    operations = [
+        migrations.RunPython(create_message_fts, drop_message_fts),
+    ]
@@ -0,0 +1,21 @@
+# Generated by Django 5.1.7 on 2026-10-17 02:24
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('dashboard', '0025_message_fts'),
+    ]
+
+    operations = [
+        migrations.RemoveIndex(
+            model_name='note',
+            name='note_backup_created_idx',
+        ),
+        migrations.AddIndex(
+            model_name='note',
+            index=models.Index(fields=['backup', '-creation_date', '-created_at'], name='note_backup_creation_idx'),
+        ),
+    ]
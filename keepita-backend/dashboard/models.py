@@ -45,6 +45,9 @@ class Backup(models.Model):
         verbose_name = _('Backup')
         verbose_name_plural = _('Backups')
         ordering = ['-created_at']
+        indexes = [
+            models.Index(fields=['user', 'created_at'], name='backup_user_created_idx'),
+        ]
 
     def __str__(self):
         return f"{self.name} - {self.model_name}"
@@ -64,6 +67,8 @@ class BackupLog(models.Model):
     progress_percentage = models.FloatField(_('Progress Percentage'), default=0.0)
     status = models.CharField(_('Status'), max_length=20, choices=STATUS_CHOICES, default='pending')
     steps_data = models.JSONField(_('Steps Data'), default=dict)
+    extractor_timings = models.JSONField(_('Extractor Timings'), default=dict, blank=True)
+    memory_usage = models.JSONField(_('Memory Usage'), default=dict, blank=True)
     created_at = models.DateTimeField(_('Created At'), auto_now_add=True)
     updated_at = models.DateTimeField(_('Updated At'), auto_now=True)
 
@@ -71,6 +76,9 @@ class BackupLog(models.Model):
         verbose_name = _('Backup Log')
         verbose_name_plural = _('Backup Logs')
         ordering = ['-created_at']
+        indexes = [
+            models.Index(fields=['backup', 'created_at'], name='backuplog_backup_created_idx'),
+        ]
 
     def __str__(self):
         return f"Log {self.id} - {self.backup.name if self.backup else 'No backup'}"   
@@ -87,96 +95,196 @@ class BackupLog(models.Model):
             } for i in range(total_steps)
         }
         self.save()
+        from .progress_manager import release_progress_tracker
+        release_progress_tracker(self)
         return self
 
     def update_step(self, step_number, name, description, progress_percent=0, status='processing'):
-        self.current_step = step_number
-        step_key = f'step_{step_number}'
-
-        if not self.steps_data:
-            self.steps_data = {}
-
-        for prev_step in range(1, step_number):
-            prev_key = f'step_{prev_step}'
-            if prev_key in self.steps_data and self.steps_data[prev_key].get('status') in ['pending', 'processing']:
-                self.steps_data[prev_key]['status'] = 'completed'
-                self.steps_data[prev_key]['progress_percent'] = 100
-                if self.steps_data[prev_key]['description'] == 'Pending...':
-                    self.steps_data[prev_key]['description'] = 'Step completed implicitly.'
-
-        if step_key in self.steps_data:
-            current_step = self.steps_data[step_key]
-            
-            if current_step.get('name', '').startswith('Step '):
-                current_step['name'] = name
-            if current_step.get('description') == 'Pending...':
-                current_step['description'] = description
-
-            if current_step.get('status') == 'completed' and status != 'failed':
-                return self
-
-            if status == 'failed' or progress_percent > current_step.get('progress_percent', 0) or status == 'completed':
-                current_step['progress_percent'] = 0 if status == 'failed' else (100 if status == 'completed' else progress_percent)
-                current_step['description'] = description
-                current_step['status'] = status
-                current_step['timestamp'] = timezone.now().isoformat()
-        else:
-            self.steps_data[step_key] = {
-                'name': name,
-                'description': description,
-                'progress_percent': progress_percent,
-                'status': status,
-                'timestamp': timezone.now().isoformat()
-            }
-        
-        completed_steps = 0
-        current_step_contribution = 0
-        
-        for step_idx in range(1, self.total_steps + 1):
-            step_data = self.steps_data.get(f'step_{step_idx}')
-            if not step_data:
-                continue
-                
-            if step_data.get('status') == 'completed':
-                completed_steps += 1
-            elif step_idx == step_number and step_data.get('status') == 'processing' and progress_percent > 0:
-                current_step_contribution = (progress_percent / 100) * (1 / self.total_steps)
-        
-        if self.total_steps > 0:
-            base_progress = (completed_steps / self.total_steps) * 100
-            
-            total_progress = base_progress + current_step_contribution * 100
-            self.progress_percentage = min(total_progress, 100)
+        from .progress_manager import get_progress_tracker
 
-        self.save(update_fields=['current_step', 'steps_data', 'progress_percentage', 'updated_at'])
+        tracker = get_progress_tracker(self)
+        tracker.update_step(step_number, name, description, progress_percent, status)
+        tracker.apply_to(self)
         return self
     
     def mark_complete(self):
-        self.status = 'completed'
-        self.progress_percentage = 100
+        self._finish_progress('completed')
         
         if self.backup:
             self.backup.status = 'completed'
             self.backup.save(update_fields=['status'])
             
-        self.save()
+        return self
+
+    def _finish_progress(self, status, error_message=None):
+        from .progress_manager import get_progress_tracker, release_progress_tracker
+
+        tracker = get_progress_tracker(self)
+        tracker.finish(status, error_message)
+        tracker.apply_to(self)
+        self.status = tracker.status
+        release_progress_tracker(self)
+
+    def record_extractor_timing(self, name, timing):
+        self.extractor_timings = {**(self.extractor_timings or {}), name: timing}
+        self.save(update_fields=['extractor_timings', 'updated_at'])
+        return self
+
+    def record_memory_usage(self, usage):
+        self.memory_usage = usage
+        self.save(update_fields=['memory_usage', 'updated_at'])
         return self
         
     def mark_failed(self, error_message):
-        self.status = 'failed'
-        
-        self.steps_data['error'] = {
-            'message': error_message,
-            'timestamp': timezone.now().isoformat()
-        }
+        self._finish_progress('failed', error_message)
         
         if self.backup:
             self.backup.status = 'failed'
             self.backup.save(update_fields=['status'])
             
-        self.save()
         return self
 
+class IngestJob(models.Model):
+    STATUS_CHOICES = [
+        ('queued', 'Queued'),
+        ('running', 'Running'),
+        ('completed', 'Completed'),
+        ('failed', 'Failed'),
+    ]
+
+    id = models.UUIDField(primary_key=True, default=uuid.uuid4, editable=False)
+    backup = models.ForeignKey(Backup, on_delete=models.CASCADE, related_name='ingest_jobs')
+    log = models.ForeignKey(BackupLog, on_delete=models.SET_NULL, null=True, blank=True, related_name='ingest_jobs')
+    status = models.CharField(_('Status'), max_length=20, choices=STATUS_CHOICES, default='queued')
+    payload = models.JSONField(_('Payload'), default=dict)
+    attempts = models.IntegerField(_('Attempts'), default=0)
+    max_attempts = models.IntegerField(_('Max Attempts'), default=3)
+    worker_id = models.CharField(_('Worker ID'), max_length=255, null=True, blank=True)
+    available_at = models.DateTimeField(_('Available At'), default=timezone.now)
+    lease_expires_at = models.DateTimeField(_('Lease Expires At'), null=True, blank=True)
+    heartbeat_at = models.DateTimeField(_('Heartbeat At'), null=True, blank=True)
+    last_error = models.TextField(_('Last Error'), null=True, blank=True)
+    created_at = models.DateTimeField(_('Created At'), auto_now_add=True)
+    updated_at = models.DateTimeField(_('Updated At'), auto_now=True)
+
+    class Meta:
+        verbose_name = _('Ingest Job')
+        verbose_name_plural = _('Ingest Jobs')
+        ordering = ['available_at', 'created_at']
+        indexes = [
+            models.Index(fields=['status', 'available_at'], name='ingestjob_status_avail_idx'),
+        ]
+
+    def __str__(self):
+        return f"Ingest job {self.id} - {self.status}"
+
+class Blob(models.Model):
+    sha256 = models.CharField(_('SHA-256'), max_length=64, primary_key=True)
+    file = models.FileField(_('Blob File'), max_length=500, unique=True)
+    size = models.BigIntegerField(_('Size'), default=0)
+    ref_count = models.IntegerField(_('Reference Count'), default=0)
+    created_at = models.DateTimeField(_('Created At'), auto_now_add=True)
+
+    class Meta:
+        verbose_name = _('Blob')
+        verbose_name_plural = _('Blobs')
+
+    def __str__(self):
+        return f"{self.sha256} ({self.ref_count} refs)"
+
+class BackupStats(models.Model):
+    MEDIA_CATEGORIES = {'images_count': 'image', 'videos_count': 'video', 'musics_count': 'music'}
+    RELATION_COUNTS = {
+        'contacts_count': 'contacts',
+        'messages_count': 'messages',
+        'threads_count': 'chat_threads',
+        'call_logs_count': 'call_logs',
+        'apps_count': 'apk_lists',
+        'wifi_networks_count': 'wifi_networks',
+        'bluetooth_devices_count': 'bluetooth_devices',
+        'alarms_count': 'alarms',
+        'home_screen_items_count': 'home_screen_items',
+        'wallpapers_count': 'wallpapers',
+        'notes_count': 'notes',
+        'calendar_count': 'calendar_events',
+        'notifications_count': 'notifications',
+        'reminders_count': 'reminders',
+    }
+    BROWSER_RELATIONS = ('browser_bookmarks', 'browser_histories', 'browser_downloads', 'browser_searches', 'browser_tabs')
+
+    backup = models.OneToOneField(Backup, on_delete=models.CASCADE, primary_key=True, related_name='stats')
+    contacts_count = models.PositiveIntegerField(_('Contacts'), default=0)
+    messages_count = models.PositiveIntegerField(_('Messages'), default=0)
+    threads_count = models.PositiveIntegerField(_('Chat Threads'), default=0)
+    call_logs_count = models.PositiveIntegerField(_('Call Logs'), default=0)
+    apps_count = models.PositiveIntegerField(_('Apps'), default=0)
+    files_count = models.PositiveIntegerField(_('Files'), default=0)
+    images_count = models.PositiveIntegerField(_('Images'), default=0)
+    videos_count = models.PositiveIntegerField(_('Videos'), default=0)
+    musics_count = models.PositiveIntegerField(_('Musics'), default=0)
+    other_files_count = models.PositiveIntegerField(_('Other Files'), default=0)
+    files_bytes = models.BigIntegerField(_('Files Size'), default=0)
+    browser_count = models.PositiveIntegerField(_('Browser Rows'), default=0)
+    wifi_networks_count = models.PositiveIntegerField(_('WiFi Networks'), default=0)
+    bluetooth_devices_count = models.PositiveIntegerField(_('Bluetooth Devices'), default=0)
+    alarms_count = models.PositiveIntegerField(_('Alarms'), default=0)
+    home_screen_items_count = models.PositiveIntegerField(_('Home Screen Items'), default=0)
+    wallpapers_count = models.PositiveIntegerField(_('Wallpapers'), default=0)
+    notes_count = models.PositiveIntegerField(_('Notes'), default=0)
+    calendar_count = models.PositiveIntegerField(_('Calendar Events'), default=0)
+    notifications_count = models.PositiveIntegerField(_('Notifications'), default=0)
+    reminders_count = models.PositiveIntegerField(_('Reminders'), default=0)
+    has_metadata = models.BooleanField(_('Has Metadata'), default=False)
+    updated_at = models.DateTimeField(_('Updated At'), auto_now=True)
+
+    class Meta:
+        verbose_name = _('Backup Stats')
+        verbose_name_plural = _('Backup Stats')
+
+    def __str__(self):
+        return f"Stats for backup {self.backup_id}"
+
+    @classmethod
+    def refresh(cls, backup):
+        backup_id = backup.pk if isinstance(backup, Backup) else backup
+        values = {
+            field: Backup._meta.get_field(relation).related_model.objects.filter(backup_id=backup_id).count()
+            for field, relation in cls.RELATION_COUNTS.items()
+        }
+        values['browser_count'] = sum(
+            Backup._meta.get_field(relation).related_model.objects.filter(backup_id=backup_id).count()
+            for relation in cls.BROWSER_RELATIONS
+        )
+        files = File.objects.filter(backup_id=backup_id).aggregate(
+            files_count=models.Count('id'),
+            files_bytes=models.Sum('file_size'),
+            **{
+                field: models.Count('id', filter=models.Q(category=category))
+                for field, category in cls.MEDIA_CATEGORIES.items()
+            },
+        )
+        files['files_bytes'] = files['files_bytes'] or 0
+        files['other_files_count'] = files['files_count'] - sum(files[field] for field in cls.MEDIA_CATEGORIES)
+        values.update(files)
+        values['has_metadata'] = BackupMetadata.objects.filter(backup_id=backup_id).exists()
+
+        stats, _ = cls.objects.update_or_create(backup_id=backup_id, defaults=values)
+        if isinstance(backup, Backup):
+            backup.stats = stats
+        return stats
+
+    @classmethod
+    def for_backup(cls, backup):
+        try:
+            return backup.stats
+        except cls.DoesNotExist:
+            return cls.refresh(backup)
+
+    @classmethod
+    def fill_missing(cls, backups):
+        for backup in backups.filter(stats__isnull=True).exclude(status='processing'):
+            cls.refresh(backup)
+
 class Contact(models.Model):
     backup = models.ForeignKey(Backup, on_delete=models.CASCADE, related_name='contacts')
     name = models.CharField(_('Name'), max_length=255)
@@ -193,6 +301,9 @@ class Contact(models.Model):
     class Meta:
         verbose_name = _('Contact')
         verbose_name_plural = _('Contacts')
+        indexes = [
+            models.Index(fields=['backup', 'name'], name='contact_backup_name_idx'),
+        ]
 
     def __str__(self):
         return self.name
@@ -201,15 +312,44 @@ class ChatThread(models.Model):
     backup = models.ForeignKey(Backup, on_delete=models.CASCADE, related_name='chat_threads')
     contact = models.ForeignKey(Contact, on_delete=models.SET_NULL, null=True, related_name='chat_threads')
     address = models.CharField(_('Address'), max_length=255)
+    last_message_body = models.TextField(_('Last Message Body'), null=True, blank=True)
+    last_message_date = models.DateTimeField(_('Last Message Date'), null=True, blank=True)
+    message_count = models.PositiveIntegerField(_('Message Count'), default=0)
+    unread_count = models.PositiveIntegerField(_('Unread Count'), default=0)
     created_at = models.DateTimeField(_('Created At'), auto_now_add=True)
 
     class Meta:
         verbose_name = _('Chat Thread')
         verbose_name_plural = _('Chat Threads')
+        indexes = [
+            models.Index(fields=['backup', 'created_at'], name='chatthread_backup_created_idx'),
+            models.Index(fields=['backup', 'last_message_date'], name='chatthread_backup_last_idx'),
+        ]
 
     def __str__(self):
         return f"Chat with {self.contact.name if self.contact else self.address}"
 
+    @classmethod
+    def refresh_summaries(cls, backup_id):
+        latest = Message.objects.filter(chat_thread_id=models.OuterRef('pk')).order_by('-date', '-id')
+        threads = list(
+            cls.objects.filter(backup_id=backup_id).annotate(
+                summary_count=models.Count('messages'),
+                summary_unread=models.Count('messages', filter=models.Q(messages__seen=False)),
+                summary_date=models.Max('messages__date'),
+                summary_body=models.Subquery(latest.values('body')[:1]),
+            )
+        )
+        for thread in threads:
+            thread.message_count = thread.summary_count
+            thread.unread_count = thread.summary_unread
+            thread.last_message_date = thread.summary_date
+            thread.last_message_body = thread.summary_body
+        cls.objects.bulk_update(
+            threads, ['message_count', 'unread_count', 'last_message_date', 'last_message_body'], batch_size=500
+        )
+        return len(threads)
+
 class Message(models.Model):
     backup = models.ForeignKey(Backup, on_delete=models.CASCADE, related_name='messages')
     chat_thread = models.ForeignKey(ChatThread, on_delete=models.CASCADE, related_name='messages')
@@ -231,6 +371,9 @@ class Message(models.Model):
         verbose_name = _('Message')
         verbose_name_plural = _('Messages')
         ordering = ['date']
+        indexes = [
+            models.Index(fields=['backup', 'chat_thread', 'date'], name='message_backup_thread_date_idx'),
+        ]
 
 class CallLog(models.Model):
     CALL_TYPES = [
@@ -253,6 +396,10 @@ class CallLog(models.Model):
         verbose_name = _('Call Log')
         verbose_name_plural = _('Call Logs')
         ordering = ['-date']
+        indexes = [
+            models.Index(fields=['backup', 'date'], name='calllog_backup_date_idx'),
+            models.Index(fields=['backup', 'type'], name='calllog_backup_type_idx'),
+        ]
 
 class ApkList(models.Model):
     backup = models.ForeignKey(Backup, on_delete=models.CASCADE, related_name='apk_lists')
@@ -272,6 +419,9 @@ class ApkList(models.Model):
     class Meta:
         verbose_name = _('APK List')
         verbose_name_plural = _('APK Lists')
+        indexes = [
+            models.Index(fields=['backup', 'apk_name'], name='apklist_backup_name_idx'),
+        ]
 
 class ApkPermission(models.Model):
     apk = models.ForeignKey(ApkList, on_delete=models.CASCADE, related_name='permissions', null=True, blank=True)
@@ -298,6 +448,9 @@ class Alarm(models.Model):
     class Meta:
         verbose_name = _('Alarm')
         verbose_name_plural = _('Alarms')
+        indexes = [
+            models.Index(fields=['backup', 'created_at'], name='alarm_backup_created_idx'),
+        ]
 
 class WorldClock(models.Model):
     backup = models.ForeignKey(Backup, on_delete=models.CASCADE, related_name='world_clocks')
@@ -344,6 +497,9 @@ class HomeScreenLayout(models.Model):
     class Meta:
         verbose_name = _('Home Screen Layout')
         verbose_name_plural = _('Home Screen Layouts')
+        indexes = [
+            models.Index(fields=['backup', 'created_at'], name='hslayout_backup_created_idx'),
+        ]
 
 class HomeScreenFolder(models.Model):
     layout = models.ForeignKey(HomeScreenLayout, on_delete=models.CASCADE, related_name='folders')
@@ -404,6 +560,9 @@ class BrowserBookmark(models.Model):
     class Meta:
         verbose_name = _('Browser Bookmark')
         verbose_name_plural = _('Browser Bookmarks')
+        indexes = [
+            models.Index(fields=['backup', 'created_at'], name='bookmark_backup_created_idx'),
+        ]
 
 class BrowserHistory(models.Model):
     backup = models.ForeignKey(Backup, on_delete=models.CASCADE, related_name='browser_histories')
@@ -421,6 +580,9 @@ class BrowserHistory(models.Model):
         verbose_name = _('Browser History')
         verbose_name_plural = _('Browser History')
         ordering = ['-last_visit_time']
+        indexes = [
+            models.Index(fields=['backup', 'last_visit_time'], name='history_backup_visit_idx'),
+        ]
 
 class BrowserDownload(models.Model):
     STATES = [
@@ -442,6 +604,9 @@ class BrowserDownload(models.Model):
     class Meta:
         verbose_name = _('Browser Download')
         verbose_name_plural = _('Browser Downloads')
+        indexes = [
+            models.Index(fields=['backup', 'download_time'], name='download_backup_time_idx'),
+        ]
 
 class BrowserSearch(models.Model):
     backup = models.ForeignKey(Backup, on_delete=models.CASCADE, related_name='browser_searches')
@@ -453,6 +618,9 @@ class BrowserSearch(models.Model):
     class Meta:
         verbose_name = _('Browser Search')
         verbose_name_plural = _('Browser Searches')
+        indexes = [
+            models.Index(fields=['backup', 'search_time'], name='search_backup_time_idx'),
+        ]
 
 class BrowserTab(models.Model):
     backup = models.ForeignKey(Backup, on_delete=models.CASCADE, related_name='browser_tabs')
@@ -466,6 +634,9 @@ class BrowserTab(models.Model):
     class Meta:
         verbose_name = _('Browser Tab')
         verbose_name_plural = _('Browser Tabs')
+        indexes = [
+            models.Index(fields=['backup', 'last_accessed'], name='tab_backup_accessed_idx'),
+        ]
 
 class Wallpaper(models.Model):
     TYPE_CHOICES = [
@@ -489,6 +660,9 @@ class Wallpaper(models.Model):
     class Meta:
         verbose_name = _('Wallpaper')
         verbose_name_plural = _('Wallpapers')
+        indexes = [
+            models.Index(fields=['backup', 'created_at'], name='wallpaper_backup_created_idx'),
+        ]
 
     def __str__(self):
         return f"{self.type} wallpaper for {self.backup.name}"
@@ -516,6 +690,10 @@ class File(models.Model):
     class Meta:
         verbose_name = _('File')
         verbose_name_plural = _('Files')
+        indexes = [
+            models.Index(fields=['backup', 'created_date'], name='file_backup_created_idx'),
+            models.Index(fields=['backup', 'category', 'created_date'], name='file_backup_category_idx'),
+        ]
 
 class Email(models.Model):
     backup = models.ForeignKey(Backup, on_delete=models.CASCADE, related_name='emails')
@@ -546,6 +724,9 @@ class BluetoothDevice(models.Model):
     class Meta:
         verbose_name = _('Bluetooth Device')
         verbose_name_plural = _('Bluetooth Devices')
+        indexes = [
+            models.Index(fields=['backup', 'last_connected'], name='bt_backup_connected_idx'),
+        ]
 
     def __str__(self):
         return f"{self.name or 'Unknown'} ({self.address})"
@@ -574,6 +755,9 @@ class WifiNetwork(models.Model):
     class Meta:
         verbose_name = _('WiFi Network')
         verbose_name_plural = _('WiFi Networks')
+        indexes = [
+            models.Index(fields=['backup', 'created_at'], name='wifi_backup_created_idx'),
+        ]
 
     def __str__(self):
         return self.ssid
@@ -587,6 +771,9 @@ class Notification(models.Model):
 
     class Meta:
         ordering = ['-created_at']
+        indexes = [
+            models.Index(fields=['user', 'created_at'], name='notification_user_created_idx'),
+        ]
 
     def __str__(self):
         return f"{self.user.username}: {self.title[:50]}"
@@ -621,7 +808,10 @@ class Note(models.Model):
     class Meta:
         verbose_name = _('Note')
         verbose_name_plural = _('Notes')
-        ordering = ['-creation_date', '-created_at'] 
+        ordering = ['-creation_date', '-created_at']
+        indexes = [
+            models.Index(fields=['backup', '-creation_date', '-created_at'], name='note_backup_creation_idx'),
+        ]
 
     def __str__(self):
         display_text = self.title if self.title else (self.body[:50] if self.body else "Empty Note")
@@ -698,6 +888,9 @@ class CalendarEvent(models.Model):
         verbose_name = 'Calendar Event'
         verbose_name_plural = 'Calendar Events'
         ordering = ['-start_date']
+        indexes = [
+            models.Index(fields=['backup', 'start_date'], name='calendar_backup_start_idx'),
+        ]
 
     def __str__(self):
         return self.summary or "Unnamed Event"
@@ -807,6 +1000,9 @@ class IOSNotification(models.Model):
 
     class Meta:
         ordering = ['-timestamp']
+        indexes = [
+            models.Index(fields=['backup', 'timestamp'], name='iosnotif_backup_time_idx'),
+        ]
 
 class Reminder(models.Model):
     PRIORITY_CHOICES = [
@@ -1,91 +1,305 @@
+import copy
+import json
 import logging
+import threading
+import time
+
+from django.conf import settings
 from django.utils import timezone
+
 from .models import BackupLog
 
 logger = logging.getLogger('dashboard')
 
+PENDING_DESCRIPTION = 'Pending...'
+TERMINAL_STATUSES = ('completed', 'failed')
+STREAM_MIN_INTERVAL = 0.25
+
+_changes = threading.Condition()
+_version = 0
+
+def notify_progress():
+    global _version
+    with _changes:
+        _version += 1
+        _changes.notify_all()
+
+def _current_version() -> int:
+    with _changes:
+        return _version
+
+def wait_for_progress(seen_version: int, timeout: float):
+    with _changes:
+        if _version == seen_version and timeout > 0:
+            _changes.wait(timeout)
+
+def apply_step_update(steps_data, step_number, name, description, progress_percent=0, status='processing'):
+    step_key = f'step_{step_number}'
+
+    for prev_step in range(1, step_number):
+        prev_key = f'step_{prev_step}'
+        if prev_key in steps_data and steps_data[prev_key].get('status') in ['pending', 'processing']:
+            steps_data[prev_key]['status'] = 'completed'
+            steps_data[prev_key]['progress_percent'] = 100
+            if steps_data[prev_key]['description'] == PENDING_DESCRIPTION:
+                steps_data[prev_key]['description'] = 'Step completed implicitly.'
+
+    if step_key in steps_data:
+        current_step = steps_data[step_key]
+
+        if current_step.get('name', '').startswith('Step '):
+            current_step['name'] = name
+        if current_step.get('description') == PENDING_DESCRIPTION:
+            current_step['description'] = description
+
+        if current_step.get('status') == 'completed' and status != 'failed':
+            return False
+
+        if status == 'failed' or progress_percent > current_step.get('progress_percent', 0) or status == 'completed':
+            current_step['progress_percent'] = 0 if status == 'failed' else (100 if status == 'completed' else progress_percent)
+            current_step['description'] = description
+            current_step['status'] = status
+            current_step['timestamp'] = timezone.now().isoformat()
+    else:
+        steps_data[step_key] = {
+            'name': name,
+            'description': description,
+            'progress_percent': progress_percent,
+            'status': status,
+            'timestamp': timezone.now().isoformat()
+        }
+    return True
+
+def calculate_overall_progress(steps_data, total_steps):
+    if not steps_data or not total_steps:
+        return 0.0
+
+    step_weight = 1.0 / total_steps
+    total_percentage = 0.0
+    for i in range(1, total_steps + 1):
+        step = steps_data.get(f'step_{i}')
+        if not step:
+            continue
+        if step.get('status') == 'completed':
+            total_percentage += step_weight * 100.0
+        elif step.get('status') == 'processing':
+            total_percentage += step.get('progress_percent', 0) * step_weight
+
+    return min(total_percentage, 100.0)
+
+class ProgressTracker:
+
+    def __init__(self, log_id, current_step=0, total_steps=0, steps_data=None, progress_percentage=0.0,
+                 status='pending', flush_interval=None):
+        self.log_id = log_id
+        self.current_step = current_step
+        self.total_steps = total_steps
+        self.steps_data = copy.deepcopy(steps_data or {})
+        self.progress_percentage = progress_percentage
+        self.status = status
+        self.flush_interval = flush_interval if flush_interval is not None else getattr(settings, 'PROGRESS_FLUSH_INTERVAL', 2.0)
+        self.flushes = 0
+        self._lock = threading.RLock()
+        self._dirty = False
+        self._last_flush = time.monotonic()
+
+    @classmethod
+    def from_log(cls, log: BackupLog) -> 'ProgressTracker':
+        return cls(log.pk, log.current_step, log.total_steps, log.steps_data,
+                   log.progress_percentage, log.status)
+
+    def update_step(self, step_number, name, description, progress_percent=0, status='processing') -> bool:
+        with self._lock:
+            statuses = self._step_statuses()
+            self.current_step = step_number
+            changed = apply_step_update(self.steps_data, step_number, name, description, progress_percent, status)
+            self.progress_percentage = calculate_overall_progress(self.steps_data, self.total_steps)
+            self._dirty = True
+
+            if self._step_statuses() != statuses or time.monotonic() - self._last_flush >= self.flush_interval:
+                self.flush()
+        notify_progress()
+        return changed
+
+    def _step_statuses(self):
+        return {key: step.get('status') for key, step in self.steps_data.items() if isinstance(step, dict)}
+
+    def finish(self, status, error_message=None):
+        with self._lock:
+            self.status = status
+            if status == 'completed':
+                self.progress_percentage = 100
+            elif error_message is not None:
+                self.steps_data['error'] = {
+                    'message': error_message,
+                    'timestamp': timezone.now().isoformat()
+                }
+            self._dirty = True
+            self.flush(fields=('status',))
+        notify_progress()
+
+    def flush(self, fields=()):
+        with self._lock:
+            if not self._dirty:
+                return False
+            values = {
+                'current_step': self.current_step,
+                'steps_data': copy.deepcopy(self.steps_data),
+                'progress_percentage': self.progress_percentage,
+                'updated_at': timezone.now(),
+            }
+            for field in fields:
+                values[field] = getattr(self, field)
+            try:
+                BackupLog.objects.filter(pk=self.log_id).update(**values)
+            except Exception as e:
+                logger.warning(f"Failed to flush progress for log {self.log_id}: {e}")
+                return False
+            self._dirty = False
+            self._last_flush = time.monotonic()
+            self.flushes += 1
+            return True
+
+    def snapshot(self):
+        with self._lock:
+            return {
+                'status': self.status,
+                'current_step': self.current_step,
+                'progress_percentage': self.progress_percentage,
+                'steps_data': copy.deepcopy(self.steps_data),
+            }
+
+    def apply_to(self, log: BackupLog):
+        with self._lock:
+            log.current_step = self.current_step
+            log.steps_data = copy.deepcopy(self.steps_data)
+            log.progress_percentage = self.progress_percentage
+
+_trackers = {}
+_trackers_lock = threading.Lock()
+
+def get_progress_tracker(log) -> ProgressTracker:
+    log_id = log.pk if isinstance(log, BackupLog) else log
+    with _trackers_lock:
+        tracker = _trackers.get(log_id)
+        if tracker is None:
+            if not isinstance(log, BackupLog):
+                log = BackupLog.objects.get(pk=log_id)
+            tracker = ProgressTracker.from_log(log)
+            _trackers[log_id] = tracker
+        return tracker
+
+def release_progress_tracker(log) -> None:
+    log_id = log.pk if isinstance(log, BackupLog) else log
+    with _trackers_lock:
+        tracker = _trackers.pop(log_id, None)
+    if tracker is not None:
+        tracker.flush()
+
+def _local_tracker(log_id):
+    with _trackers_lock:
+        return _trackers.get(log_id)
+
+def progress_snapshot(log_id):
+    tracker = _local_tracker(log_id)
+    if tracker is not None:
+        return tracker.snapshot()
+    return BackupLog.objects.filter(pk=log_id).values(
+        'status', 'current_step', 'progress_percentage', 'steps_data'
+    ).first()
+
+def _log_updated_at(log_id):
+    return BackupLog.objects.filter(pk=log_id).values_list('updated_at', flat=True).first()
+
+def progress_delta(previous, snapshot):
+    delta = {key: snapshot[key] for key in ('status', 'current_step', 'progress_percentage')
+             if previous.get(key) != snapshot[key]}
+    previous_steps = previous.get('steps_data') or {}
+    steps = {key: step for key, step in (snapshot['steps_data'] or {}).items() if previous_steps.get(key) != step}
+    if steps:
+        delta['steps'] = steps
+    return delta
+
+def _event(event, data, event_id=None):
+    lines = [f"event: {event}"]
+    if event_id is not None:
+        lines.append(f"id: {event_id}")
+    lines.append(f"data: {json.dumps(data, default=str)}")
+    return '\n'.join(lines) + '\n\n'
+
+def progress_event_stream(log_id, poll_interval=None, heartbeat_interval=None, timeout=None, db_poll_interval=None):
+    poll_interval = poll_interval or getattr(settings, 'PROGRESS_STREAM_POLL_INTERVAL', 1.0)
+    heartbeat_interval = heartbeat_interval or getattr(settings, 'PROGRESS_STREAM_HEARTBEAT', 15.0)
+    timeout = timeout or getattr(settings, 'PROGRESS_STREAM_TIMEOUT', 300)
+    db_poll_interval = db_poll_interval or getattr(settings, 'PROGRESS_STREAM_DB_POLL_INTERVAL', 3.0)
+
+    started = last_sent = time.monotonic()
+    previous = {}
+    event_id = 0
+    snapshot = None
+    seen_updated_at = None
+    yield f"retry: {int(poll_interval * 1000)}\n\n"
+
+    while True:
+        version = _current_version()
+        local = _local_tracker(log_id) is not None
+        if local:
+            snapshot = progress_snapshot(log_id)
+        else:
+            # Ingest workers run in other processes, so only the flushed BackupLog row is visible here.
+            updated_at = _log_updated_at(log_id)
+            if updated_at is None:
+                snapshot = None
+            elif snapshot is None or updated_at != seen_updated_at:
+                seen_updated_at = updated_at
+                snapshot = progress_snapshot(log_id)
+        if snapshot is None:
+            yield _event('end', {'status': 'deleted'})
+            return
+
+        delta = progress_delta(previous, snapshot)
+        now = time.monotonic()
+        if delta:
+            event_id += 1
+            yield _event('progress', delta, event_id)
+            previous = snapshot
+            last_sent = now
+
+        if snapshot['status'] in TERMINAL_STATUSES:
+            yield _event('end', {'status': snapshot['status']})
+            return
+        if now - started >= timeout:
+            yield _event('timeout', {'status': snapshot['status']})
+            return
+        if now - last_sent >= heartbeat_interval:
+            yield ": heartbeat\n\n"
+            last_sent = now
+
+        if not local:
+            time.sleep(min(db_poll_interval, heartbeat_interval))
+            continue
+        if delta:
+            time.sleep(STREAM_MIN_INTERVAL)
+        wait_for_progress(version, min(poll_interval, heartbeat_interval))
+
 class ProgressManager:
-    
+
     @staticmethod
     def update_step(log_id, step_number, name, description, progress_percent=0, status='processing'):
         try:
-            log = BackupLog.objects.get(id=log_id)
+            tracker = get_progress_tracker(log_id)
         except BackupLog.DoesNotExist:
             logger.error(f"BackupLog with ID {log_id} not found")
             return None
-            
-        log.current_step = step_number
-        step_key = f'step_{step_number}'
-
-        if not log.steps_data:
-            log.steps_data = {}
-
-        if step_key in log.steps_data:
-            current_step = log.steps_data[step_key]
-            
-            if current_step.get('status') == 'completed' and status != 'failed':
-                logger.debug(f"Step {step_number} already completed, ignoring update")
-                return log
-                
-            if current_step.get('status') == 'failed' and status not in ['processing', 'completed']:
-                logger.debug(f"Step {step_number} already failed, ignoring update unless it's being reprocessed")
-                return log
-            
-            update_needed = False
-            
-            if status == 'failed':
-                current_step['progress_percent'] = 0
-                current_step['status'] = 'failed'
-                current_step['description'] = description or f"Error: {description}"
-                update_needed = True
-            else:
-                if progress_percent > current_step.get('progress_percent', 0):
-                    current_step['progress_percent'] = progress_percent
-                    update_needed = True
-                
-                if description and description != current_step.get('description') and not description.startswith('Extracting'):
-                    current_step['description'] = description
-                    update_needed = True
-                
-                status_priorities = {'pending': 0, 'processing': 1, 'completed': 2, 'failed': -1}
-                current_status_priority = status_priorities.get(current_step.get('status', 'pending'), 0)
-                new_status_priority = status_priorities.get(status, 0)
-                
-                if new_status_priority > current_status_priority:
-                    current_step['status'] = status
-                    update_needed = True
-                
-                if status == 'completed':
-                    current_step['progress_percent'] = 100
-                    current_step['status'] = 'completed'
-                    update_needed = True
-            
-            if update_needed:
-                current_step['timestamp'] = timezone.now().isoformat()
-                
-        else:
-            log.steps_data[step_key] = {
-                'name': name,
-                'description': description,
-                'progress_percent': progress_percent,
-                'status': status,
-                'timestamp': timezone.now().isoformat()
-            }
-            
-            logger.debug(f"Moving to step {step_number} ({name}) without auto-completing previous steps")
-
-        log.progress_percentage = calculate_overall_progress(log)
-        
-        log.save(update_fields=['current_step', 'steps_data', 'progress_percentage', 'updated_at'])
-        logger.debug(f"Updated step {step_number} to {status} with {progress_percent}%")
-        return log
-    
+        tracker.update_step(step_number, name, description, progress_percent, status)
+        return tracker
+
     @staticmethod
     def mark_step_complete(log_id, step_number, name, description="Step completed successfully"):
         return ProgressManager.update_step(
             log_id, step_number, name, description, 100, 'completed'
         )
-    
+
     @staticmethod
     def mark_step_failed(log_id, step_number, name, error_message):
         return ProgressManager.update_step(
@@ -95,66 +309,15 @@ class ProgressManager:
     @staticmethod
     def complete_process(log_id):
         try:
-            log = BackupLog.objects.get(id=log_id)
+            tracker = get_progress_tracker(log_id)
         except BackupLog.DoesNotExist:
             logger.error(f"BackupLog with ID {log_id} not found")
             return None
-        
-        log.status = 'completed'
-        
-        progress_sum = 0
-        step_count = 0
-        
-        for step_key, step_data in log.steps_data.items():
-            step_count += 1
-            if step_data.get('status') == 'completed':
-                progress_sum += 100
-            elif step_data.get('status') == 'processing':
-                step_data['status'] = 'completed'
-                step_data['progress_percent'] = 100
-                progress_sum += 100
-            elif step_data.get('status') == 'failed':
-                pass
-            else:
-                step_data['status'] = 'completed'
-                step_data['progress_percent'] = 100
-                progress_sum += 100
-        
-        if step_count:
-            log.progress_percentage = min(100, progress_sum / step_count)
-        else:
-            log.progress_percentage = 0
-            
-        log.save()
-        logger.debug(f"Process completed with overall progress {log.progress_percentage}%")
-        return log
-
-def calculate_overall_progress(log):
-    if not log.steps_data or not log.total_steps:
-        return 0.0
-    
-    completed_count = 0
-    processing_contribution = 0.0
-    step_weight = 1.0 / log.total_steps
-    
-    for i in range(1, log.total_steps + 1):
-        step_key = f'step_{i}'
-        if step_key not in log.steps_data:
-            continue
-        
-        step = log.steps_data[step_key]
-        status = step.get('status')
-        
-        if status == 'completed':
-            completed_count += 1
-        elif status == 'processing':
-            progress_percent = step.get('progress_percent', 0)
-            processing_contribution += (progress_percent / 100.0) * step_weight
-        elif status == 'failed':
-            pass
-        
-    base_percentage = completed_count * step_weight * 100.0
-    
-    total_percentage = base_percentage + (processing_contribution * 100.0)
-    
-    return min(total_percentage, 100.0)
\ No newline at end of file
+        with tracker._lock:
+            for step_data in tracker.steps_data.values():
+                if isinstance(step_data, dict) and step_data.get('status') in ('pending', 'processing'):
+                    step_data['status'] = 'completed'
+                    step_data['progress_percent'] = 100
+            tracker.finish('completed')
+        release_progress_tracker(log_id)
+        return tracker
@@ -1,3 +1,4 @@
+import glob
 import hashlib
 import os
 import os.path
@@ -6,7 +7,6 @@ import zipfile
 import shutil
 import time
 import uuid
-import threading
 import logging
 import io
 import subprocess
@@ -21,7 +21,10 @@ from django.utils import timezone
 from rest_framework import serializers
 from django.core.files.storage import default_storage
 from django.conf import settings
-from .models import Backup, BackupLog, Notification, ClientInstance
+from .models import Backup, BackupLog, BackupStats, Notification, ClientInstance
+from .extractors.file_index import BackupFileIndex
+from .extractors.scheduler import ExtractorScheduler
+from .ingest_queue import LeaseLost, enqueue_backup
 from .extractors import (
     ContactExtractor, 
     CallLogExtractor,
@@ -62,12 +65,65 @@ from .extractors import (
     AndroidFileExtractor,
     AndroidMessageExtractor,
 )
+from .memory_budget import get_memory_accountant
+from .progress_manager import release_progress_tracker
 from .utils.notification import send_notification
 
 from .utils.android_helper import prepare_android_backup
+from .utils.archive import ArchiveManifest, extract_members, select_members
+from .utils.ios_decrypt import IOSBackupSelection, decrypt_ios_backup
 
 logger = logging.getLogger('dashboard')
 
+BACKUP_EXTRACTORS = {
+    'xiaomi': [
+        ('proxy', XiaomiDecryptionProxy),
+        ('metadata', XiaomiMetadataExtractor),
+        ('contacts', XiaomiContactExtractor),
+        ('messages', XiaomiMessageExtractor),
+        ('apps', XiaomiAppExtractor),
+        ('wifi', XiaomiWifiExtractor),
+        ('files', XiaomiFileExtractor),
+        ('browser', XiaomiBrowserExtractor),
+        ('alarms', XiaomiAlarmExtractor),
+        ('notes', XiaomiNoteExtractor),
+    ],
+    'ios': [
+        ('proxy', IOSDecryptionProxy),
+        ('contacts', IOSContactExtractor),
+        ('messages', IOSMessageExtractor),
+        ('calendar', IOSCalendarExtractor),
+        ('notes', IOSNoteExtractor),
+        ('homescreen', IOSHomeScreenExtractor),
+        ('files', IOSFileExtractor),
+        ('wallpapers', IOSWallpaperExtractor),
+        ('notifications', IOSNotificationExtractor),
+        ('safari', IOSSafariExtractor),
+        ('reminders', IOSReminderExtractor),
+        ('bluetooth', IOSBluetoothExtractor),
+    ],
+    'samsung': [
+        ('decrypt', DecryptionProxy),
+        ('contacts', ContactExtractor),
+        ('call_logs', CallLogExtractor),
+        ('messages', MessageExtractor),
+        ('apps', AppExtractor),
+        ('bluetooth', BluetoothExtractor),
+        ('wifi', WifiExtractor),
+        ('files', FileExtractor),
+        ('browser', BrowserExtractor),
+        ('alarms', AlarmExtractor),
+        ('world_clocks', WorldClockExtractor),
+        ('homescreen', HomeScreenExtractor),
+        ('wallpapers', WallpaperExtractor),
+    ],
+    'android': [
+        ('messages', AndroidMessageExtractor),
+        ('apps', AndroidAppExtractor),
+        ('files', AndroidFileExtractor),
+    ],
+}
+
 QUAD = struct.Struct('>Q')
 ZERO_IV = b'\0' * 16
 WRAP_PASSCODE = 2
@@ -188,15 +244,41 @@ class BackupUploadSerializer(serializers.ModelSerializer):
             raise serializers.ValidationError("File must be a ZIP archive.")
         return value
 
-    def _extract_zip_safely(self, zip_path: Path, extract_dir: Path, log=None) -> bool:
+    def _archive_manifest(self, backup_type: Optional[str]) -> Optional[ArchiveManifest]:
+        if not getattr(settings, 'BACKUP_SELECTIVE_EXTRACTION', True):
+            return None
+        extractor_classes = BACKUP_EXTRACTORS.get(backup_type)
+        if not extractor_classes:
+            return None
+        return ArchiveManifest.from_extractors(cls for _, cls in extractor_classes)
+
+    def _extract_zip_safely(self, zip_path: Path, extract_dir: Path, log=None, backup_type: Optional[str] = None) -> bool:
         logger.info(f"Starting extraction of {zip_path} to {extract_dir}")
         step_number, step_name = 4, 'extract_zip'
         try:
+            manifest = self._archive_manifest(backup_type)
             with zipfile.ZipFile(zip_path, 'r') as zip_ref:
-                total_files = len(zip_ref.infolist())
+                members, skipped = select_members(zip_ref, manifest)
+                total_files = len(members)
+                if manifest is not None:
+                    logger.info(f"Selected {total_files} archive members for {backup_type} extractors, skipping {skipped}.")
                 if log:
                     log.update_step(step_number, step_name, f"Extracting {total_files} files from archive...", 10)
-                zip_ref.extractall(extract_dir)
+
+                last_reported = 10
+
+                def report(written, done_bytes, total_bytes):
+                    nonlocal last_reported
+                    percent = 10 + int(89 * done_bytes / total_bytes) if total_bytes else 99
+                    if log and percent - last_reported >= 5:
+                        last_reported = percent
+                        log.update_step(step_number, step_name, f"Extracted {written}/{total_files} files...", percent)
+
+                extract_members(
+                    zip_ref, members, extract_dir,
+                    chunk_size=getattr(settings, 'BACKUP_EXTRACT_CHUNK_SIZE', 1024 * 1024),
+                    progress=report,
+                )
             if log:
                 log.update_step(step_number, step_name, "ZIP extraction complete.", 100, 'completed')
             logger.info("Extraction completed successfully.")
@@ -210,6 +292,8 @@ class BackupUploadSerializer(serializers.ModelSerializer):
     
     def _safe_cleanup(self, directory_str: str):
         directory = Path(directory_str)
+        for sidecar in directory.parent.glob(f"{glob.escape(directory.name)}.*.json"):
+            sidecar.unlink(missing_ok=True)
         if not directory.exists():
             return
         logger.info(f"Attempting to clean up directory: {directory_str}")
@@ -218,6 +302,12 @@ class BackupUploadSerializer(serializers.ModelSerializer):
         except Exception as e:
             logger.warning(f"Cleanup failed for {directory}: {str(e)}")
 
+    def _refresh_stats(self, backup_id):
+        try:
+            BackupStats.refresh(backup_id)
+        except Exception as e:
+            logger.warning(f"Could not refresh stats for backup {backup_id}: {e}")
+
     def _decrypt_ios_backup(self, backup_path_str: str, output_dir_str: str, password: str, log=None) -> Optional[str]:
         logger.info("Starting iOS backup decryption process using iphone_backup_decrypt.")
         step_number, step_name = 5, 'decrypt_ios_backup'
@@ -225,8 +315,6 @@ class BackupUploadSerializer(serializers.ModelSerializer):
             log.update_step(step_number, step_name, "Initializing iOS decryption...", 0)
 
         try:
-            from iphone_backup_decrypt import EncryptedBackup
-            
             backup_path = Path(backup_path_str)
             output_dir = Path(output_dir_str)
             
@@ -237,22 +325,32 @@ class BackupUploadSerializer(serializers.ModelSerializer):
             if log:
                 log.update_step(step_number, step_name, "Unlocking backup with password...", 10)
             
-            backup = EncryptedBackup(backup_directory=str(backup_path), passphrase=password)
-            
-            logger.info("Backup unlocked successfully. Extracting files...")
-            if log:
-                log.update_step(step_number, step_name, "Extracting decrypted files...", 30)
-            
-            backup.extract_files(
-                domain_like='%',
-                output_folder=str(decrypted_files_root),
-                preserve_folders=True,
-                domain_subfolders=True
+            selection = None
+            if getattr(settings, 'IOS_SELECTIVE_DECRYPTION', True):
+                selection = IOSBackupSelection.from_extractors(
+                    [extractor_class for _, extractor_class in BACKUP_EXTRACTORS['ios']],
+                    include_media=getattr(settings, 'IOS_DECRYPT_MEDIA', True),
+                )
+            logger.info(f"iOS decryption selection: {selection or 'all files'}")
+
+            last_percent = [-1]
+
+            def report(done, total):
+                percent = 30 + int((done / total) * 65) if total else 95
+                if log and percent != last_percent[0]:
+                    last_percent[0] = percent
+                    log.update_step(step_number, step_name, f"Decrypting files ({done}/{total})...", percent)
+
+            file_count, skipped_count = decrypt_ios_backup(
+                backup_path,
+                decrypted_files_root,
+                password,
+                selection=selection,
+                workers=getattr(settings, 'IOS_DECRYPT_WORKERS', None),
+                progress=report,
             )
             
-            file_count = sum(1 for _ in decrypted_files_root.rglob('*') if _.is_file())
-            
-            logger.info(f"Decryption complete. {file_count} files extracted to {decrypted_files_root}")
+            logger.info(f"Decryption complete. {file_count} files extracted to {decrypted_files_root}, {skipped_count} skipped")
             if log:
                 log.update_step(step_number, step_name, f"Decryption complete: {file_count} files extracted.", 100, 'completed')
             
@@ -265,78 +363,24 @@ class BackupUploadSerializer(serializers.ModelSerializer):
                 log.update_step(step_number, step_name, msg, 0, 'failed')
             return None
     
-    def _process_backup(self, extract_dir, backup_id, backup_type, log=None):
+    def _process_backup(self, extract_dir, backup_id, backup_type, log=None, file_index=None):
         logger.info(f"Starting data extraction for {backup_type} backup ID: {backup_id}")
-        stats = {}
-
-        if backup_type == 'xiaomi':
-
-            extractors = [
-                ('proxy', XiaomiDecryptionProxy(str(extract_dir), backup_id)),
-                ('metadata', XiaomiMetadataExtractor(str(extract_dir), backup_id)),    
-                ('contacts', XiaomiContactExtractor(str(extract_dir), backup_id)),      
-                ('messages', XiaomiMessageExtractor(str(extract_dir), backup_id)),     
-                ('apps', XiaomiAppExtractor(str(extract_dir), backup_id)),             
-                ('wifi', XiaomiWifiExtractor(str(extract_dir), backup_id)),            
-                ('files', XiaomiFileExtractor(str(extract_dir), backup_id)),            
-                ('browser', XiaomiBrowserExtractor(str(extract_dir), backup_id)), 
-                ('alarms', XiaomiAlarmExtractor(str(extract_dir), backup_id)),          
-                ('notes', XiaomiNoteExtractor(str(extract_dir), backup_id)),            
-            ]
-            
-        elif backup_type == 'ios':
-            extractors = [
-                ('proxy', IOSDecryptionProxy(str(extract_dir), backup_id)),
-                ('contacts', IOSContactExtractor(str(extract_dir), backup_id)),       
-                ('messages', IOSMessageExtractor(str(extract_dir), backup_id)),        
-                ('calendar', IOSCalendarExtractor(str(extract_dir), backup_id)),     
-                ('notes', IOSNoteExtractor(str(extract_dir), backup_id)),              
-                ('homescreen', IOSHomeScreenExtractor(str(extract_dir), backup_id)),    
-                ('files', IOSFileExtractor(str(extract_dir), backup_id)),               
-                ('wallpapers', IOSWallpaperExtractor(str(extract_dir), backup_id)),    
-                ('notifications', IOSNotificationExtractor(str(extract_dir), backup_id)),
-                ('safari', IOSSafariExtractor(str(extract_dir), backup_id)),         
-                ('reminders', IOSReminderExtractor(str(extract_dir), backup_id)),
-                ('bluetooth', IOSBluetoothExtractor(str(extract_dir), backup_id))
-            ]
-
-        # elif backup_type == 'android':
-        #     extractors = [
-        #         ('proxy', AndroidDecryptionProxy(str(extract_dir), backup_id)),
-        #         ('apps', AndroidAppExtractor(str(extract_dir), backup_id)),
-        #         ('files', AndroidFileExtractor(str(extract_dir), backup_id)),
-        #         ('messages', AndroidMessageExtractor(str(extract_dir), backup_id)),
-        #     ]
-            
-        elif backup_type == 'samsung': 
-            extractors = [
-                ('decrypt', DecryptionProxy(extract_dir, backup_id)),
-                ('contacts', ContactExtractor(extract_dir, backup_id)),
-                ('call_logs', CallLogExtractor(extract_dir, backup_id)),
-                ('messages', MessageExtractor(extract_dir, backup_id)),
-                ('apps', AppExtractor(extract_dir, backup_id)),
-                ('bluetooth', BluetoothExtractor(extract_dir, backup_id)),
-                ('wifi', WifiExtractor(extract_dir, backup_id)),
-                ('files', FileExtractor(extract_dir, backup_id)),
-                ('browser', BrowserExtractor(extract_dir, backup_id)),
-                ('alarms', AlarmExtractor(extract_dir, backup_id)),
-                ('world_clocks', WorldClockExtractor(extract_dir, backup_id)),
-                ('homescreen', HomeScreenExtractor(extract_dir, backup_id)),
-                ('wallpapers', WallpaperExtractor(extract_dir, backup_id)),
-            ]
-
-        else:
+        if file_index is None or file_index.relative(extract_dir) is None:
+            file_index = BackupFileIndex(extract_dir)
+
+        extractor_classes = BACKUP_EXTRACTORS.get(backup_type)
+        if extractor_classes is None:
             raise ValueError(f"Unsupported backup type: {backup_type}")
-            
-        for name, extractor in extractors:
-            try:
-                count = extractor.extract()
-                stats[name] = {'count': count}
-                logger.info(f"Extracted {count} {name} for backup {backup_id}")
-            except Exception as e:
-                logger.error(f"Error extracting {name} for backup {backup_id}: {str(e)}", exc_info=True)
-                stats[name] = {'error': str(e)}
-        return stats
+
+        extractors = [
+            (name, extractor_class(str(extract_dir), backup_id, file_index=file_index))
+            for name, extractor_class in extractor_classes
+        ]
+        archive_manifest = self._archive_manifest(backup_type)
+        for _, extractor in extractors:
+            extractor.archive_manifest = archive_manifest
+
+        return ExtractorScheduler(extractors, backup_id, log=log, file_index=file_index).run()
 
     def _repair_contacts_db(self, decrypted_root_path: Path) -> bool:
         contact_db_path = decrypted_root_path / "HomeDomain" / "Library/AddressBook/AddressBook.sqlitedb"
@@ -378,12 +422,18 @@ class BackupUploadSerializer(serializers.ModelSerializer):
             logger.error(f"An unexpected error occurred during DB repair: {e}")
             return False
 
-    def _process_backup_async(self, backup_instance, extract_dir_path: Path, temp_zip_path: Path, log=None):
+    def _ensure_lease(self, lease_lost, backup_id):
+        if lease_lost is not None and lease_lost.is_set():
+            raise LeaseLost(f"Ingest lease for backup {backup_id} was lost to another worker")
+
+    def _process_backup_async(self, backup_instance, extract_dir_path: Path, temp_zip_path: Path, log=None, lease_lost=None):
         logger.info(f"Starting async processing for backup ID: {backup_instance.id}")
         
         backup_id = backup_instance.id
         decrypted_root_path = None
         organized_android_dir = None
+        error = None
+        lost = False
 
         try:
             Backup.objects.filter(pk=backup_id).update(status='processing')
@@ -391,10 +441,12 @@ class BackupUploadSerializer(serializers.ModelSerializer):
 
             extract_dir_path.mkdir(parents=True, exist_ok=True)
 
-            if not self._extract_zip_safely(temp_zip_path, extract_dir_path, log):
+            if not self._extract_zip_safely(temp_zip_path, extract_dir_path, log, backup_type=backup_instance.device_brand):
                 raise Exception("Failed to extract the ZIP archive. The file may be corrupt.")
+            self._ensure_lease(lease_lost, backup_id)
 
             source_data_root = extract_dir_path
+            file_index = None
             backup_type = backup_instance.device_brand
             
             if backup_type == 'android':
@@ -452,32 +504,52 @@ class BackupUploadSerializer(serializers.ModelSerializer):
 
                     logger.info("Unencrypted iOS backup detected.")
                     source_data_root = ios_backup_folder
+                    file_index = temp_extractor.file_index
 
-            self._process_backup(source_data_root, backup_id, backup_type, log)
+            self._ensure_lease(lease_lost, backup_id)
+            self._process_backup(source_data_root, backup_id, backup_type, log, file_index=file_index)
+            self._ensure_lease(lease_lost, backup_id)
+            self._refresh_stats(backup_id)
             
             Backup.objects.filter(pk=backup_id).update(status='completed')
             if log: log.mark_complete()
             send_notification(user=backup_instance.user, title="Backup Processed Successfully", message=f"Your backup '{backup_instance.name}' is now ready.")
 
         except Exception as e:
+            if lease_lost is not None and lease_lost.is_set():
+                lost = True
+                logger.warning(f"Abandoning backup {backup_id} without cleanup, its ingest lease was lost: {e}")
+                raise LeaseLost(str(e)) from e
 
+            error = str(e)
             logger.error(f"Critical error during backup processing for ID {backup_id}: {str(e)}", exc_info=True)
+            self._refresh_stats(backup_id)
             Backup.objects.filter(pk=backup_id).update(status='failed')
             if log: log.mark_failed(str(e))
             send_notification(user=backup_instance.user, title="Backup Processing Failed", message=f"An error occurred while processing '{backup_instance.name}'.")
         finally:
-            logger.info(f"Cleaning up temporary files for backup {backup_id}")
-            self._safe_cleanup(str(extract_dir_path))
+            if log:
+                release_progress_tracker(log)
+                try:
+                    log.record_memory_usage(get_memory_accountant().usage(owner=backup_id))
+                except Exception as e:
+                    logger.warning(f"Could not record memory usage for backup {backup_id}: {e}")
+            get_memory_accountant().forget(backup_id)
+            if not lost:
+                logger.info(f"Cleaning up temporary files for backup {backup_id}")
+                self._safe_cleanup(str(extract_dir_path))
+
+                if decrypted_root_path:
+                     self._safe_cleanup(str(Path(settings.BACKUP_EXTRACT_PATH) / f"decrypted_{backup_id}"))
 
-            if decrypted_root_path:
-                 self._safe_cleanup(str(Path(settings.BACKUP_EXTRACT_PATH) / f"decrypted_{backup_id}"))
+                if organized_android_dir:
+                    self._safe_cleanup(str(organized_android_dir))
 
-            if organized_android_dir:
-                self._safe_cleanup(str(organized_android_dir))
+                if temp_zip_path.exists():
+                    try: os.remove(temp_zip_path)
+                    except OSError as err: logger.warning(f"Could not remove temp ZIP {temp_zip_path}: {err}")
 
-            if temp_zip_path.exists():
-                try: os.remove(temp_zip_path)
-                except OSError as err: logger.warning(f"Could not remove temp ZIP {temp_zip_path}: {err}")
+        return error
 
     def create(self, validated_data):
         request = self.context.get('request', None)
@@ -506,11 +578,7 @@ class BackupUploadSerializer(serializers.ModelSerializer):
         
         extract_dir = Path(settings.BACKUP_EXTRACT_PATH) / f"extracted_{backup_instance.id}"
 
-        threading.Thread(
-            target=self._process_backup_async, 
-            args=(backup_instance, extract_dir, temp_zip_path, log),
-            daemon=True
-        ).start()
+        enqueue_backup(backup_instance, log, extract_dir, temp_zip_path)
         
         return backup_instance
 
@@ -519,7 +587,7 @@ class BackupLogSerializer(serializers.ModelSerializer):
     class Meta:
         model = BackupLog
         fields = ['id', 'backup', 'status', 'current_step', 'total_steps', 
-                 'progress_percentage', 'steps_data', 'created_at', 'updated_at']
+                 'progress_percentage', 'steps_data', 'extractor_timings', 'memory_usage', 'created_at', 'updated_at']
         read_only_fields = ['id', 'created_at', 'updated_at']
         
 class NotificationSerializer(serializers.ModelSerializer):
@@ -580,45 +648,48 @@ class BackupDetailSerializer(serializers.ModelSerializer):
             'calendar_count','device_brand',
         ]
 
+    def _stats(self, obj):
+        return BackupStats.for_backup(obj)
+
     def get_contacts_count(self, obj):
-        return obj.contacts.count()
+        return self._stats(obj).contacts_count
 
     def get_messages_count(self, obj):
-        return obj.messages.count()
+        return self._stats(obj).messages_count
 
     def get_call_logs_count(self, obj):
-        return obj.call_logs.count()
+        return self._stats(obj).call_logs_count
 
     def get_apps_count(self, obj):
-        return obj.apk_lists.count()
+        return self._stats(obj).apps_count
 
     def get_files_count(self, obj):
-        return obj.files.count()
+        return self._stats(obj).files_count
 
     def get_wifi_networks_count(self, obj):
-        return obj.wifi_networks.count()
+        return self._stats(obj).wifi_networks_count
 
     def get_bluetooth_devices_count(self, obj):
-        return obj.bluetooth_devices.count()
+        return self._stats(obj).bluetooth_devices_count
 
     def get_alarms_count(self, obj):
-        return obj.alarms.count()
+        return self._stats(obj).alarms_count
 
     def get_home_screen_items_count(self, obj):
-        return obj.home_screen_items.count()
+        return self._stats(obj).home_screen_items_count
 
     def get_browser_count(self, obj):
-        return obj.browser_bookmarks.count() + obj.browser_histories.count() + obj.browser_downloads.count() + obj.browser_searches.count() + obj.browser_tabs.count()
+        return self._stats(obj).browser_count
 
     def get_wallpapers_count(self, obj):
-        return obj.wallpapers.count()
+        return self._stats(obj).wallpapers_count
     
     def get_notes_count(self, obj):
-        return obj.notes.count()
+        return self._stats(obj).notes_count
 
     def get_metadata_count(self, obj):
-        if hasattr(obj, 'metadata') and obj.metadata is not None:
+        if self._stats(obj).has_metadata:
             return 1
 
     def get_calendar_count(self, obj):
-        return obj.calendar_events.count()
\ No newline at end of file
+        return self._stats(obj).calendar_count
\ No newline at end of file
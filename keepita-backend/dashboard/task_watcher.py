@@ -0,0 +1,189 @@
+import logging
+import threading
+import time
+import uuid
+from typing import Dict, Iterable, Iterator, Optional, Tuple
+
+from django.conf import settings
+
+logger = logging.getLogger('dashboard')
+
+TERMINAL_STATUSES = ('success', 'failed')
+
+_updates = threading.Condition()
+_generation = 0
+_pushed_generation = 0
+
+def notify_task_update(pushed: bool = False):
+    global _generation, _pushed_generation
+    with _updates:
+        _generation += 1
+        if pushed:
+            _pushed_generation += 1
+        _updates.notify_all()
+
+def _current_generation() -> Tuple[int, int]:
+    with _updates:
+        return _generation, _pushed_generation
+
+def _wait_for_update(seen_generation: int, timeout: float):
+    with _updates:
+        if _generation == seen_generation and timeout > 0:
+            _updates.wait(timeout)
+
+def callback_fields() -> Dict[str, str]:
+    callback_url = getattr(settings, 'SELF_HOSTED_CALLBACK_URL', '')
+    return {'callback_url': callback_url} if callback_url else {}
+
+def unwrap_task_status(response_json: Optional[Dict]) -> Dict:
+    result = response_json or {}
+    if isinstance(result.get('data'), dict):
+        result = result['data']
+    if isinstance(result.get('data'), dict):
+        inner = result['data']
+        if 'status' in inner or 'download_url' in inner or 'task_id' in inner:
+            result = inner
+    return result
+
+def record_task_update(task_id, task_status: str, result=None):
+    from .models import AsyncTask
+
+    AsyncTask.objects.update_or_create(
+        id=task_id,
+        defaults={'status': task_status, 'result_data': result},
+    )
+    notify_task_update(pushed=True)
+
+def _as_uuid(task_id) -> Optional[uuid.UUID]:
+    try:
+        return uuid.UUID(str(task_id))
+    except (TypeError, ValueError):
+        return None
+
+class _WatchedTask:
+
+    def __init__(self, task_id, now: float, interval: float):
+        self.task_id = task_id
+        self.started = now
+        self.interval = interval
+        self.next_check = now + interval
+        self.future = None
+
+class TaskWatcher:
+
+    def __init__(self, task_ids: Iterable = (), client=None, timeout: float = None,
+                 initial_interval: float = None, max_interval: float = None, backoff: float = None):
+        self.client = client
+        self.timeout = timeout or getattr(settings, 'TASK_WATCH_TIMEOUT', 600)
+        self.initial_interval = initial_interval or getattr(settings, 'TASK_WATCH_INITIAL_INTERVAL', 0.5)
+        self.max_interval = max_interval or getattr(settings, 'TASK_WATCH_MAX_INTERVAL', 10)
+        self.backoff = backoff or getattr(settings, 'TASK_WATCH_BACKOFF', 1.6)
+        self.callback_check_interval = getattr(settings, 'TASK_WATCH_CALLBACK_CHECK_INTERVAL', 1)
+        self._tasks: Dict[str, _WatchedTask] = {}
+        self._seen = set()
+        for task_id in task_ids:
+            self.add(task_id)
+
+    def add(self, task_id) -> bool:
+        if not task_id or str(task_id) in self._seen:
+            return False
+        task_id = str(task_id)
+        self._seen.add(task_id)
+        self._tasks[task_id] = _WatchedTask(task_id, time.monotonic(), self.initial_interval)
+        return True
+
+    def __len__(self):
+        return len(self._tasks)
+
+    def _get_client(self):
+        if self.client is None:
+            from .main_server_client import get_main_server_client
+            self.client = get_main_server_client()
+        return self.client
+
+    def _fetch_status(self, task_id: str) -> Dict:
+        return self._get_client().get_task_status(task_id)
+
+    def _resolve(self, task_id: str, result: Dict) -> Tuple[bool, Optional[Dict]]:
+        task_status = result.get('status')
+        if task_status == 'success':
+            logger.info(f"Task {task_id} completed successfully.")
+            return True, result.get('result', result)
+        if task_status == 'failed':
+            error = (result.get('result') or {}).get('error', 'Unknown error')
+            logger.error(f"Task {task_id} failed on the main server: {error}")
+            return True, None
+        return False, None
+
+    def _collect_pushed(self, finished: Dict):
+        ids = {_as_uuid(task_id): task_id for task_id in self._tasks if task_id not in finished}
+        ids.pop(None, None)
+        if not ids:
+            return
+        try:
+            from .models import AsyncTask
+
+            rows = AsyncTask.objects.filter(id__in=list(ids), status__in=TERMINAL_STATUSES)
+            for row in rows.values('id', 'status', 'result_data'):
+                task_id = ids[row['id']]
+                resolved, result = self._resolve(task_id, {'status': row['status'], 'result': row['result_data']})
+                if resolved:
+                    logger.debug(f"Task {task_id} completion delivered by callback.")
+                    finished[task_id] = result
+        except Exception as e:
+            logger.debug(f"Could not check pushed task results: {e}")
+
+    def _collect_polled(self, task: _WatchedTask, now: float, finished: Dict):
+        try:
+            response_json = task.future.result()
+        except Exception as e:
+            logger.debug(f"Volatile connection while polling {task.task_id}: {e}")
+            response_json = None
+        task.future = None
+
+        resolved, result = self._resolve(task.task_id, unwrap_task_status(response_json))
+        if resolved:
+            finished[task.task_id] = result
+            return
+        task.interval = min(task.interval * self.backoff, self.max_interval)
+        task.next_check = now + task.interval
+
+    def __iter__(self) -> Iterator[Tuple[str, Optional[Dict]]]:
+        last_callback_check = 0.0
+        last_pushed = None
+        while self._tasks:
+            generation, pushed = _current_generation()
+            now = time.monotonic()
+            finished = {}
+
+            if pushed != last_pushed or now - last_callback_check >= self.callback_check_interval:
+                self._collect_pushed(finished)
+                last_callback_check = now
+                last_pushed = pushed
+
+            for task in list(self._tasks.values()):
+                if task.task_id in finished:
+                    continue
+                if task.future is not None:
+                    if task.future.done():
+                        self._collect_polled(task, now, finished)
+                    continue
+                if now - task.started >= self.timeout:
+                    logger.error(f"Polling for task {task.task_id} timed out.")
+                    finished[task.task_id] = None
+                elif task.next_check <= now:
+                    task.future = self._get_client().submit(self._fetch_status, task.task_id)
+                    task.future.add_done_callback(lambda _: notify_task_update())
+
+            for task_id, result in finished.items():
+                self._tasks.pop(task_id, None)
+                yield task_id, result
+
+            if finished or not self._tasks:
+                continue
+
+            wake_at = min(
+                [task.next_check for task in self._tasks.values() if task.future is None]
+                + [last_callback_check + self.callback_check_interval]
+            )
+            _wait_for_update(generation, wake_at - time.monotonic())
@@ -1,2 +1,268 @@
-from django.test import TestCase
+import json
+import tempfile
+import threading
+import time
+from email.parser import BytesParser
+from email.policy import default
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from pathlib import Path
+from unittest import mock
 
+from django.contrib.auth import get_user_model
+from django.db import connection
+from django.test import SimpleTestCase, TestCase, override_settings
+from django.utils import timezone
+
+from config.pagination import KeysetPagination
+
+from . import main_server_client
+from .extractors.file_index import BackupFileIndex
+from .main_server_client import MainServerClient, get_main_server_client
+from .message_search import fts_available, search_messages
+from .models import Backup, BrowserHistory, CallLog, ChatThread, Contact, File, Message, Note
+
+
+class FakeMainServer:
+
+    def __init__(self, delay=0.2, fail_first=0):
+        self.delay = delay
+        self.fail_first = fail_first
+        self.in_flight = 0
+        self.max_in_flight = 0
+        self.requests = []
+        self.bodies = []
+        self._lock = threading.Lock()
+        server = self
+
+        class Handler(BaseHTTPRequestHandler):
+            def do_POST(self):
+                length = int(self.headers.get('Content-Length', 0))
+                with server._lock:
+                    server.bodies.append((self.headers.get('Content-Type'), self.rfile.read(length)))
+                    if server.fail_first:
+                        server.fail_first -= 1
+                        self.send_response(503)
+                        self.send_header('Content-Length', '0')
+                        self.end_headers()
+                        return
+                    server.in_flight += 1
+                    server.max_in_flight = max(server.max_in_flight, server.in_flight)
+                    server.requests.append((self.path, self.headers.get('X-API-KEY')))
+                time.sleep(server.delay)
+                with server._lock:
+                    server.in_flight -= 1
+                if self.path.endswith('/file-info/'):
+                    payload = {'status': True, 'data': {'needs_decryption': True, 'decryption_type': 'ssm'}, 'message': None}
+                else:
+                    payload = {'data': {'success': True, 'data_type': 'contacts', 'data': [], 'count': 0}}
+                body = json.dumps(payload).encode()
+                self.send_response(200)
+                self.send_header('Content-Type', 'application/json')
+                self.send_header('Content-Length', str(len(body)))
+                self.end_headers()
+                self.wfile.write(body)
+
+            def log_message(self, *args):
+                pass
+
+        self.httpd = ThreadingHTTPServer(('127.0.0.1', 0), Handler)
+        self.url = f"http://127.0.0.1:{self.httpd.server_address[1]}"
+        self.thread = threading.Thread(target=self.httpd.serve_forever, daemon=True)
+
+    def __enter__(self):
+        self.thread.start()
+        return self
+
+    def __exit__(self, *exc):
+        self.httpd.shutdown()
+        self.httpd.server_close()
+
+
+class MainServerClientConcurrencyTests(SimpleTestCase):
+
+    def test_concurrent_calls_are_bounded(self):
+        with FakeMainServer(delay=0.2) as server:
+            client = MainServerClient(base_url=server.url, api_key='test-key', max_concurrency=3)
+            started = time.monotonic()
+            results = list(client.map_concurrent(
+                lambda name: client.process_file(b'payload', name, device_brand='xiaomi'),
+                [f'file_{i}.bak' for i in range(9)],
+            ))
+            elapsed = time.monotonic() - started
+
+        self.assertEqual(len(results), 9)
+        self.assertTrue(all(result['success'] for _, result in results))
+        self.assertEqual(server.max_in_flight, 3)
+        self.assertLess(elapsed, 9 * 0.2)
+        self.assertEqual({key for _, key in server.requests}, {'test-key'})
+
+    def test_direct_calls_share_the_in_flight_limit(self):
+        with FakeMainServer(delay=0.1) as server:
+            client = MainServerClient(base_url=server.url, api_key='test-key', max_concurrency=2)
+            outcomes = {}
+
+            def fetch(name):
+                try:
+                    outcomes[name] = client.get_file_decryption_info(name)
+                except Exception as e:
+                    outcomes[name] = e
+
+            threads = [threading.Thread(target=fetch, args=(f'file_{i}.bak',)) for i in range(6)]
+            for thread in threads:
+                thread.start()
+            for thread in threads:
+                thread.join()
+
+        self.assertEqual(len(server.requests), 6)
+        self.assertEqual(server.max_in_flight, 2)
+        self.assertEqual(len(outcomes), 6)
+        for outcome in outcomes.values():
+            self.assertEqual(outcome, {'needs_decryption': True, 'decryption_type': 'ssm'})
+
+    @override_settings(MAIN_SERVER_URL='http://127.0.0.1:9', MAIN_SERVER_API_KEY='shared-key')
+    def test_shared_client_is_reused(self):
+        main_server_client._shared_client = None
+        first = get_main_server_client()
+        self.assertIs(get_main_server_client(), first)
+
+        with override_settings(MAIN_SERVER_API_KEY='rotated-key'):
+            self.assertIsNot(get_main_server_client(), first)
+        main_server_client._shared_client = None
+
+    def test_post_file_streams_the_file_on_every_attempt(self):
+        with tempfile.TemporaryDirectory() as tmp:
+            path = Path(tmp) / 'sms_restore.bk'
+            content = bytes(range(256)) * 1024
+            path.write_bytes(content)
+            with FakeMainServer(delay=0, fail_first=1) as server:
+                client = MainServerClient(base_url=server.url, api_key='test-key')
+                client.retry_delay = 0
+                with mock.patch.object(Path, 'read_bytes', side_effect=AssertionError('file read into memory')):
+                    result = client.post_file('decrypt/', path, data={'decryption_type': 'ssm', 'skip': None})
+
+        self.assertTrue(result['data']['success'])
+        self.assertEqual(len(server.bodies), 2)
+        for content_type, body in server.bodies:
+            message = BytesParser(policy=default).parsebytes(
+                f'Content-Type: {content_type}\r\n\r\n'.encode() + body
+            )
+            parts = {part.get_param('name', header='content-disposition'): part for part in message.iter_parts()}
+            self.assertEqual(set(parts), {'decryption_type', 'file'})
+            self.assertEqual(parts['decryption_type'].get_content(), 'ssm')
+            self.assertEqual(parts['file'].get_filename(), 'sms_restore.bk')
+            self.assertEqual(parts['file'].get_content(), content)
+
+
+class BackupFileIndexTests(SimpleTestCase):
+
+    def test_double_star_matches_any_depth(self):
+        with tempfile.TemporaryDirectory() as root:
+            root = Path(root)
+            expected = []
+            for rel in ('', 'a', 'a/b', 'a/b/c'):
+                path = root / 'backup' / 'SBROWSER' / 'SBROWSER_ext' / rel / 'History.db'
+                path.parent.mkdir(parents=True, exist_ok=True)
+                path.touch()
+                expected.append(path)
+            (root / 'backup' / 'OTHER').mkdir()
+            (root / 'backup' / 'OTHER' / 'History.db').touch()
+
+            index = BackupFileIndex(root, persist=False)
+            pattern = 'SBROWSER/SBROWSER_ext/**/History.db'
+            self.assertEqual(sorted(index.rglob(pattern)), sorted(expected))
+            self.assertEqual(sorted(index.rglob(pattern)), sorted(root.rglob(pattern)))
+            self.assertEqual(sorted(index.glob(f'backup/{pattern}')), sorted(expected))
+
+
+class ListQueryIndexTests(TestCase):
+
+    @classmethod
+    def setUpTestData(cls):
+        cls.user = get_user_model().objects.create_user(username='indexes', password='secret')
+        cls.backup = Backup.objects.create(name='Phone', model_name='Phone', size=1, file='backup.zip', user=cls.user)
+        cls.thread = ChatThread.objects.create(backup=cls.backup, address='+100')
+
+    def assertUsesIndex(self, queryset, index_name):
+        sql, params = queryset.query.sql_with_params()
+        with connection.cursor() as cursor:
+            cursor.execute(f'EXPLAIN QUERY PLAN {sql}', params)
+            plan = '\n'.join(str(row[-1]) for row in cursor.fetchall())
+        self.assertIn(f'INDEX {index_name}', plan)
+        self.assertNotIn('TEMP B-TREE FOR ORDER BY', plan)
+        return plan
+
+    def test_list_queries_use_composite_indexes(self):
+        if connection.vendor != 'sqlite':
+            self.skipTest('EXPLAIN QUERY PLAN output is SQLite specific')
+
+        scoped = {'backup__user_id': self.user.pk, 'backup_id': self.backup.pk}
+        self.assertUsesIndex(
+            Message.objects.filter(backup_id=self.backup.pk, chat_thread=self.thread).order_by('-date'),
+            'message_backup_thread_date_idx',
+        )
+        self.assertUsesIndex(CallLog.objects.filter(**scoped).order_by('-date'), 'calllog_backup_date_idx')
+        self.assertUsesIndex(CallLog.objects.filter(backup_id=self.backup.pk, type='MISSED').order_by(), 'calllog_backup_type_idx')
+        self.assertUsesIndex(
+            BrowserHistory.objects.filter(**scoped).order_by('-last_visit_time'),
+            'history_backup_visit_idx',
+        )
+        self.assertUsesIndex(
+            File.objects.filter(category='image', **scoped).order_by('-created_date'),
+            'file_backup_category_idx',
+        )
+        self.assertUsesIndex(Contact.objects.filter(**scoped).order_by('name'), 'contact_backup_name_idx')
+        self.assertUsesIndex(Note.objects.filter(**scoped), 'note_backup_creation_idx')
+
+    def test_keyset_cursor_seeks_into_index(self):
+        if connection.vendor != 'sqlite':
+            self.skipTest('EXPLAIN QUERY PLAN output is SQLite specific')
+
+        paginator = KeysetPagination()
+        paginator.field, paginator.descending, paginator.nullable = 'date', True, True
+        queryset = Message.objects.filter(backup_id=self.backup.pk, chat_thread_id=self.thread.pk)
+        seek, nulls = paginator.keyset_segments(queryset, (timezone.now(), 100))
+        plan = self.assertUsesIndex(seek, 'message_backup_thread_date_idx')
+        self.assertIn('date<?', plan)
+        plan = self.assertUsesIndex(nulls, 'message_backup_thread_date_idx')
+        self.assertIn('date=?', plan)
+
+
+class MessageSearchTests(TestCase):
+
+    @classmethod
+    def setUpTestData(cls):
+        user = get_user_model().objects.create_user(username='search', password='secret')
+        cls.backup = Backup.objects.create(name='Phone', model_name='Phone', size=1, file='backup.zip', user=user)
+        cls.thread = ChatThread.objects.create(backup=cls.backup, address='+100')
+        cls.other = ChatThread.objects.create(backup=cls.backup, address='+200')
+        Message.objects.bulk_create([
+            Message(backup=cls.backup, chat_thread=cls.thread, body='Dinner tonight at the usual place?'),
+            Message(backup=cls.backup, chat_thread=cls.thread, body='dinner dinner dinner, I am starving'),
+            Message(backup=cls.backup, chat_thread=cls.thread, body='See you tomorrow'),
+            Message(backup=cls.backup, chat_thread=cls.other, body='Dinner is cancelled'),
+        ])
+
+    def search(self, query):
+        queryset = Message.objects.filter(backup=self.backup, chat_thread=self.thread)
+        return search_messages(queryset, self.backup.pk, self.thread.pk, query)
+
+    def test_fts_search_ranks_and_highlights_within_thread(self):
+        if not fts_available():
+            self.skipTest('SQLite build lacks FTS5')
+
+        results, engine = self.search('DINNER')
+        self.assertEqual(engine, 'fts')
+        self.assertEqual(len(results), 2)
+        self.assertTrue(results[0]['body'].startswith('dinner dinner'))
+        self.assertIn('<mark>Dinner</mark>', results[1]['highlighted_body'])
+        self.assertIn('<mark>', results[0]['snippet'])
+
+        Message.objects.filter(body__startswith='dinner dinner').delete()
+        results, _ = self.search('dinner')
+        self.assertEqual([result['body'] for result in results], ['Dinner tonight at the usual place?'])
+
+    def test_search_falls_back_without_fts(self):
+        with mock.patch('dashboard.message_search.fts_available', return_value=False):
+            results, engine = self.search('TOMORROW')
+        self.assertEqual(engine, 'like')
+        self.assertEqual(results[0]['highlighted_body'], 'See you <mark>tomorrow</mark>')
@@ -24,8 +24,10 @@ urlpatterns = [
     path('backups/<int:backup_pk>/browser/', include('dashboard.browser.urls')),
     path('backups/<int:backup_pk>/calendarevent/', include('dashboard.calendarevent.urls')),
     path('backups/progress/<uuid:pk>/', views.BackupProgressView.as_view(), name='backup-progress'),
+    path('backups/progress/<uuid:pk>/stream/', views.BackupProgressStreamView.as_view(), name='backup-progress-stream'),
     path('status/', views.DashboardView.as_view(), name='dashboard-stats'),
     path('backups/statistics', views.BackupstatView.as_view(), name='dashboard-summary'),
     path('files/<int:pk>/download/', views.FileDownloadView.as_view(), name='file-download'),
     path('register-client/', views.RegisterClientInstanceView.as_view(), name='register-client'),
+    path('decryption-callback/', views.DecryptionCallbackView.as_view(), name='decryption-callback'),
 ]
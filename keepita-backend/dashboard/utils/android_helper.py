@@ -1,10 +1,12 @@
+import io
 import logging
-import tempfile
 import mimetypes
-from pathlib import Path
+import os
+from pathlib import Path, PurePosixPath
 import shutil
 import zlib
 import tarfile
+from typing import Iterator
 
 logger = logging.getLogger('dashboard.utils')
 
@@ -32,26 +34,36 @@ def _categorize_file(file_path: Path) -> str:
 
     return "others"
 
-def _extract_tar_from_ab_stream(ab_file_path: str, output_tar_path: Path):
+AB_HEADER_SIZE = 24
+AB_CHUNK_SIZE = 1024 * 1024
 
-    CHUNK_SIZE = 1024 * 1024  
+def _extract_tar_from_ab_stream(ab_file_path: str, chunk_size: int = AB_CHUNK_SIZE) -> Iterator[bytes]:
 
     decompressor = zlib.decompressobj()
-    
+
     logger.info("Starting stream-based extraction of .ab file...")
     try:
-        with open(ab_file_path, 'rb') as ab_file, open(output_tar_path, 'wb') as tar_file:
-
-            ab_file.seek(24)
-            
-            while chunk := ab_file.read(CHUNK_SIZE):
-                decompressed_chunk = decompressor.decompress(chunk)
-                tar_file.write(decompressed_chunk)
-            
-            remaining_data = decompressor.flush()
-            tar_file.write(remaining_data)
-        
-        logger.info(f"Successfully extracted TAR data from {ab_file_path} to {output_tar_path}")
+        with open(ab_file_path, 'rb') as ab_file:
+
+            ab_file.seek(AB_HEADER_SIZE)
+
+            pending = b''
+            while True:
+                if not pending:
+                    if decompressor.eof:
+                        break
+                    pending = ab_file.read(chunk_size)
+                    if not pending:
+                        remaining_data = decompressor.flush()
+                        if remaining_data:
+                            yield remaining_data
+                        break
+                decompressed_chunk = decompressor.decompress(pending, chunk_size)
+                pending = decompressor.unconsumed_tail
+                if decompressed_chunk:
+                    yield decompressed_chunk
+
+        logger.info(f"Finished streaming TAR data from {ab_file_path}")
     except zlib.error as e:
         logger.error(f"Zlib decompression error during streaming extraction: {e}. The backup file might be corrupt or have an unexpected format.", exc_info=True)
         raise
@@ -59,57 +71,67 @@ def _extract_tar_from_ab_stream(ab_file_path: str, output_tar_path: Path):
         logger.error(f"Error during streaming extraction from .ab file: {e}", exc_info=True)
         raise
 
-def _extract_tar_to_temp(tar_path: Path) -> Path:
+class _ChunkStream(io.RawIOBase):
 
-    temp_dir = Path(tempfile.mkdtemp())
-    try:
-        with tarfile.open(tar_path, 'r') as tar:
-            tar.extractall(path=temp_dir)
-        logger.info(f"Extracted tar contents to: {temp_dir}")
-        return temp_dir
-    except Exception as e:
-        logger.error(f"Failed to extract archive {tar_path}: {e}")
-        if temp_dir.exists():
-            shutil.rmtree(temp_dir)
-        raise
+    def __init__(self, chunks: Iterator[bytes]):
+        self._chunks = chunks
+        self._buffer = b''
+
+    def readable(self):
+        return True
+
+    def readinto(self, b) -> int:
+        while not self._buffer:
+            self._buffer = next(self._chunks, b'')
+            if not self._buffer:
+                return 0
+        size = min(len(b), len(self._buffer))
+        b[:size] = self._buffer[:size]
+        self._buffer = self._buffer[size:]
+        return size
+
+def _unique_destination(category_dir: Path, name: str) -> Path:
+    destination = category_dir / name
+    counter = 1
+    while destination.exists():
+        destination = category_dir / f"{Path(name).stem}_{counter}{Path(name).suffix}"
+        counter += 1
+    return destination
 
 def prepare_android_backup(ab_file_path: str, output_dir: Path):
 
-    logger.info(f"Starting preparation of Android backup file with pure Python method: {ab_file_path}")
-    tar_path = None
-    extracted_raw_dir = None
-    
-    try:
-        tar_path = Path(tempfile.mktemp(suffix=".tar"))
-        _extract_tar_from_ab_stream(ab_file_path, tar_path)
-
-        extracted_raw_dir = _extract_tar_to_temp(tar_path)
-        
-        if not output_dir.exists():
-            output_dir.mkdir(parents=True)
-            
-        stats = {cat: 0 for cat in MEDIA_CATEGORIES.keys()}
-        stats["others"] = 0
-            
-        for file_path in extracted_raw_dir.rglob("*"):
-            if not file_path.is_file():
+    logger.info(f"Starting streaming preparation of Android backup file: {ab_file_path}")
+    output_dir = Path(output_dir)
+    output_dir.mkdir(parents=True, exist_ok=True)
+
+    stats = {cat: 0 for cat in MEDIA_CATEGORIES.keys()}
+    stats["others"] = 0
+    for category in stats:
+        (output_dir / category).mkdir(exist_ok=True)
+
+    stream = io.BufferedReader(_ChunkStream(_extract_tar_from_ab_stream(ab_file_path)), buffer_size=AB_CHUNK_SIZE)
+    with tarfile.open(fileobj=stream, mode='r|') as tar:
+        for member in tar:
+            if not member.isfile():
                 continue
-            
-            category = _categorize_file(file_path)
-            category_dir = output_dir / category
-            category_dir.mkdir(exist_ok=True)
-            
+
+            name = PurePosixPath(member.name.replace('\\', '/')).name
+            if name in ('', '.', '..'):
+                logger.warning(f"Skipping unsafe member name in Android backup: {member.name}")
+                continue
+
+            category = _categorize_file(Path(name))
+            destination = _unique_destination(output_dir / category, name)
+
             try:
-                shutil.copy(file_path, category_dir / file_path.name)
+                source = tar.extractfile(member)
+                with open(destination, 'wb') as target:
+                    shutil.copyfileobj(source, target, AB_CHUNK_SIZE)
+                os.utime(destination, times=(member.mtime, member.mtime))
                 stats[category] += 1
             except Exception as e:
-                logger.error(f"Failed to copy {file_path.name} to {category_dir}: {e}")
-        
-        logger.info(f"Organized files into categories within {output_dir}. Stats: {stats}")
-
-    finally:
-        if tar_path and tar_path.exists():
-            tar_path.unlink()
-        if extracted_raw_dir and extracted_raw_dir.exists():
-            shutil.rmtree(extracted_raw_dir)
-        logger.info("Cleanup of temporary Android files complete.")
\ No newline at end of file
+                logger.error(f"Failed to write {member.name} to {destination.parent}: {e}")
+                if destination.exists():
+                    destination.unlink()
+
+    logger.info(f"Organized files into categories within {output_dir}. Stats: {stats}")
@@ -0,0 +1,143 @@
+import logging
+import shutil
+import zipfile
+from collections import deque
+from fnmatch import fnmatchcase
+from pathlib import Path, PurePosixPath
+from typing import Callable, Dict, Iterable, List, Optional, Tuple
+
+logger = logging.getLogger('dashboard.utils')
+
+DEFAULT_CHUNK_SIZE = 1024 * 1024
+
+class ArchiveManifest:
+
+    def __init__(self, patterns: Iterable[str]):
+        self.patterns = tuple(sorted({p.strip('/').lower() for p in patterns if p}))
+
+    @classmethod
+    def from_extractors(cls, extractor_classes: Iterable[type]) -> Optional['ArchiveManifest']:
+        patterns = []
+        for extractor_class in extractor_classes:
+            declared = getattr(extractor_class, 'ARCHIVE_PATTERNS', None)
+            if declared is None:
+                return None
+            patterns.extend(declared)
+        return cls(patterns)
+
+    def matches(self, name: str) -> bool:
+        name = name.lower()
+        return any(fnmatchcase(name, p) or fnmatchcase(name, f"*/{p}") for p in self.patterns)
+
+    def __repr__(self):
+        return f"ArchiveManifest({list(self.patterns)})"
+
+def safe_member_path(extract_root: Path, name: str) -> Optional[Path]:
+    parts = [p for p in PurePosixPath(name.replace('\\', '/')).parts if p not in ('', '.', '/')]
+    if not parts or any(p == '..' for p in parts) or ':' in parts[0]:
+        return None
+    target = extract_root.joinpath(*parts).resolve()
+    if not target.is_relative_to(extract_root):
+        return None
+    return target
+
+def select_members(zip_ref: zipfile.ZipFile, manifest: Optional[ArchiveManifest] = None) -> Tuple[List[zipfile.ZipInfo], int]:
+    selected = []
+    skipped = 0
+    for info in zip_ref.infolist():
+        if info.is_dir():
+            continue
+        if manifest is None or manifest.matches(info.filename):
+            selected.append(info)
+        else:
+            skipped += 1
+    return selected, skipped
+
+def extract_members(zip_ref: zipfile.ZipFile, members: List[zipfile.ZipInfo], extract_dir: Path,
+                    chunk_size: int = DEFAULT_CHUNK_SIZE,
+                    progress: Optional[Callable[[int, int, int], None]] = None) -> int:
+    extract_root = Path(extract_dir).resolve()
+    total_bytes = sum(info.file_size for info in members)
+    done_bytes = 0
+    written = 0
+
+    for info in members:
+        target = safe_member_path(extract_root, info.filename)
+        if target is None:
+            logger.warning(f"Skipping unsafe archive member: {info.filename!r}")
+            continue
+
+        target.parent.mkdir(parents=True, exist_ok=True)
+        with zip_ref.open(info) as src, open(target, 'wb') as dst:
+            shutil.copyfileobj(src, dst, chunk_size)
+        written += 1
+        done_bytes += info.file_size
+        if progress:
+            progress(written, done_bytes, total_bytes)
+
+    return written
+
+def container_extract_dir(container: Path) -> Path:
+    return container.parent / f"{container.stem}_ext"
+
+def expand_containers(containers: Iterable[Path], root: Path, container_exts: Iterable[str],
+                      manifest: Optional[ArchiveManifest] = None, skip_existing: bool = False,
+                      max_depth: int = 5, chunk_size: int = DEFAULT_CHUNK_SIZE) -> Dict[str, int]:
+    root = Path(root).resolve()
+    container_exts = tuple(ext.lower() for ext in container_exts)
+    queue = deque((Path(container).resolve(), 0) for container in containers)
+    opened = set()
+    stats = {'expanded': 0, 'unwanted': 0, 'existing': 0, 'failed': 0, 'files': 0}
+
+    while queue:
+        container, depth = queue.popleft()
+        if container in opened:
+            continue
+        opened.add(container)
+
+        extract_dir = container_extract_dir(container)
+        if skip_existing and extract_dir.exists():
+            stats['existing'] += 1
+            continue
+
+        try:
+            with zipfile.ZipFile(container, 'r') as zip_ref:
+                members = []
+                for info in zip_ref.infolist():
+                    if info.is_dir():
+                        continue
+                    target = safe_member_path(extract_dir, info.filename)
+                    if target is None:
+                        logger.warning(f"Skipping unsafe member {info.filename!r} in {container.name}")
+                        continue
+                    if manifest is None or manifest.matches(target.relative_to(root).as_posix()):
+                        members.append((info, target))
+
+                if not members:
+                    logger.debug(f"No requested content in container {container.name}, skipping.")
+                    stats['unwanted'] += 1
+                    continue
+
+                for info, target in members:
+                    target.parent.mkdir(parents=True, exist_ok=True)
+                    with zip_ref.open(info) as src, open(target, 'wb') as dst:
+                        shutil.copyfileobj(src, dst, chunk_size)
+                    stats['files'] += 1
+                    if target.suffix.lower() in container_exts:
+                        if depth + 1 < max_depth:
+                            queue.append((target, depth + 1))
+                        else:
+                            logger.info(f"Reached maximum container nesting at {target}")
+        except zipfile.BadZipFile as e:
+            logger.debug(f"Could not extract {container.name} as zip: {e}")
+            stats['failed'] += 1
+            continue
+        except OSError as e:
+            logger.error(f"Failed to extract container {container}: {e}")
+            stats['failed'] += 1
+            continue
+
+        stats['expanded'] += 1
+        logger.info(f"Extracted container '{container.name}' ({len(members)} files) to '{extract_dir}'")
+
+    return stats
@@ -0,0 +1,159 @@
+import hashlib
+import logging
+import os
+import tempfile
+from collections import Counter, defaultdict
+from contextlib import contextmanager
+from pathlib import Path
+from typing import BinaryIO, Iterable, Iterator, Tuple, Union
+
+from django.conf import settings
+from django.core.files import File as DjangoFile
+from django.core.files.storage import default_storage
+from django.db import transaction
+from django.db.models import F
+
+from ..models import ApkList, Blob, Contact, File, Wallpaper
+
+logger = logging.getLogger('dashboard.utils')
+
+BLOB_PREFIX = 'blobs/'
+BLOB_CHUNK_SIZE = 1024 * 1024
+BLOB_SPOOL_SIZE = 8 * 1024 * 1024
+RELEASE_BATCH_SIZE = 500
+
+BLOB_FIELDS = (
+    (File, 'file'),
+    (Wallpaper, 'image'),
+    (Contact, 'profile_image'),
+    (ApkList, 'icon'),
+)
+
+def blob_name(digest: str, filename: str = '') -> str:
+    extension = Path(filename).suffix.lower()[:16]
+    return f"{BLOB_PREFIX}{digest[:2]}/{digest[2:4]}/{digest}{extension}"
+
+def _hash_path(path: Path, chunk_size: int) -> Tuple[str, int]:
+    digest = hashlib.sha256()
+    size = 0
+    with open(path, 'rb') as f:
+        while chunk := f.read(chunk_size):
+            digest.update(chunk)
+            size += len(chunk)
+    return digest.hexdigest(), size
+
+def _spool_stream(stream: BinaryIO, chunk_size: int) -> Tuple[str, int, BinaryIO]:
+    digest = hashlib.sha256()
+    size = 0
+    spool = tempfile.SpooledTemporaryFile(max_size=BLOB_SPOOL_SIZE)
+    while chunk := stream.read(chunk_size):
+        digest.update(chunk)
+        spool.write(chunk)
+        size += len(chunk)
+    spool.seek(0)
+    return digest.hexdigest(), size, spool
+
+def _add_reference(digest: str):
+    with transaction.atomic():
+        updated = Blob.objects.filter(sha256=digest).update(ref_count=F('ref_count') + 1)
+        if not updated:
+            return None
+        return Blob.objects.values_list('file', flat=True).get(sha256=digest)
+
+def _create_blob(digest: str, size: int, filename: str, content: BinaryIO) -> str:
+    saved_name = default_storage.save(blob_name(digest, filename), DjangoFile(content, name=filename))
+    with transaction.atomic():
+        blob, created = Blob.objects.get_or_create(
+            sha256=digest,
+            defaults={'file': saved_name, 'size': size, 'ref_count': 1},
+        )
+        if not created:
+            Blob.objects.filter(sha256=digest).update(ref_count=F('ref_count') + 1)
+    if not created:
+        logger.debug(f"Blob {digest} was stored concurrently, discarding duplicate {saved_name}")
+        default_storage.delete(saved_name)
+    return blob.file.name
+
+def store_blob(source: Union[str, Path, BinaryIO], filename: str = '') -> str:
+    chunk_size = getattr(settings, 'BACKUP_EXTRACT_CHUNK_SIZE', BLOB_CHUNK_SIZE)
+
+    if isinstance(source, (str, os.PathLike)):
+        path = Path(source)
+        filename = filename or path.name
+        digest, size = _hash_path(path, chunk_size)
+        existing = _add_reference(digest)
+        if existing is not None:
+            return existing
+        with open(path, 'rb') as content:
+            return _create_blob(digest, size, filename, content)
+
+    digest, size, spool = _spool_stream(source, chunk_size)
+    with spool:
+        existing = _add_reference(digest)
+        if existing is not None:
+            return existing
+        return _create_blob(digest, size, filename, spool)
+
+@contextmanager
+def blob_reference(source: Union[str, Path, BinaryIO], filename: str = '') -> Iterator[str]:
+    name = store_blob(source, filename)
+    try:
+        yield name
+    except BaseException:
+        release_blobs([name])
+        raise
+
+def release_blobs(names: Iterable[str]) -> int:
+    counts = Counter(name for name in names if name and name.startswith(BLOB_PREFIX))
+    if not counts:
+        return 0
+
+    by_count = defaultdict(list)
+    for name, count in counts.items():
+        by_count[count].append(name)
+
+    names = list(counts)
+    with transaction.atomic():
+        for count, grouped in by_count.items():
+            for i in range(0, len(grouped), RELEASE_BATCH_SIZE):
+                Blob.objects.filter(file__in=grouped[i:i + RELEASE_BATCH_SIZE]).update(ref_count=F('ref_count') - count)
+
+    removed = 0
+    for i in range(0, len(names), RELEASE_BATCH_SIZE):
+        orphans = Blob.objects.filter(file__in=names[i:i + RELEASE_BATCH_SIZE], ref_count__lte=0)
+        for digest, name in orphans.values_list('sha256', 'file'):
+            deleted, _ = Blob.objects.filter(sha256=digest, ref_count__lte=0).delete()
+            if not deleted:
+                continue
+            try:
+                default_storage.delete(name)
+                removed += 1
+            except Exception as e:
+                logger.warning(f"Could not delete blob {name}: {e}")
+    return removed
+
+def discard_unreferenced_blobs(names: Iterable[str]) -> int:
+    names = sorted({name for name in names if name and name.startswith(BLOB_PREFIX)})
+    removed = 0
+    for i in range(0, len(names), RELEASE_BATCH_SIZE):
+        batch = names[i:i + RELEASE_BATCH_SIZE]
+        kept = set(Blob.objects.filter(file__in=batch).values_list('file', flat=True))
+        for name in batch:
+            if name in kept:
+                continue
+            try:
+                default_storage.delete(name)
+                removed += 1
+            except Exception as e:
+                logger.warning(f"Could not delete blob {name}: {e}")
+    return removed
+
+def release_queryset_blobs(queryset, field: str) -> int:
+    names = queryset.filter(**{f'{field}__startswith': BLOB_PREFIX}).values_list(field, flat=True)
+    return release_blobs(names.iterator())
+
+def release_backup_blobs(backup_id) -> int:
+    removed = 0
+    for model, field in BLOB_FIELDS:
+        removed += release_queryset_blobs(model.objects.filter(backup_id=backup_id), field)
+    return removed
@@ -0,0 +1,130 @@
+import logging
+import os
+import sqlite3
+from concurrent.futures import ProcessPoolExecutor
+from pathlib import Path
+from typing import Callable, Iterable, Optional, Tuple
+
+from .archive import safe_member_path
+
+logger = logging.getLogger('dashboard.utils')
+
+MANIFEST_FILE_FLAG = 1
+SQLITE_SIDECAR_SUFFIXES = ('-wal', '-shm', '-journal')
+
+class IOSBackupSelection:
+
+    def __init__(self, names: Iterable[str] = (), file_ids: Iterable[str] = (),
+                 suffixes: Iterable[str] = (), domains: Iterable[str] = ()):
+        self.names = frozenset(name.lower() for name in names)
+        self.file_ids = frozenset(file_ids)
+        self.suffixes = tuple(suffix.lower() for suffix in suffixes)
+        self.domains = tuple(domains)
+
+    @classmethod
+    def from_extractors(cls, extractor_classes: Iterable[type], include_media: bool = True) -> Optional['IOSBackupSelection']:
+        names, file_ids, suffixes, domains = [], [], [], []
+        declared = False
+        for extractor_class in extractor_classes:
+            for attr, target in (('IOS_FILE_NAMES', names), ('IOS_FILE_IDS', file_ids), ('IOS_FILE_SUFFIXES', suffixes)):
+                values = getattr(extractor_class, attr, None)
+                if values is not None:
+                    declared = True
+                    target.extend(values)
+            if include_media:
+                domains.extend(getattr(extractor_class, 'IOS_MEDIA_DOMAINS', ()))
+        return cls(names, file_ids, suffixes, domains) if declared else None
+
+    def matches(self, file_id: str, domain: str, relative_path: str) -> bool:
+        if file_id in self.file_ids or domain.startswith(self.domains):
+            return True
+        name = relative_path.rsplit('/', 1)[-1].lower()
+        for sidecar in SQLITE_SIDECAR_SUFFIXES:
+            if name.endswith(sidecar):
+                name = name[:-len(sidecar)]
+                break
+        return name in self.names or name.endswith(self.suffixes)
+
+    def __repr__(self):
+        return f"IOSBackupSelection(names={len(self.names)}, file_ids={len(self.file_ids)}, suffixes={self.suffixes}, domains={self.domains})"
+
+def decrypt_backup_file(job: Tuple[str, str, bytes, Optional[float]]) -> Tuple[str, int, Optional[str]]:
+    from iphone_backup_decrypt.utils import aes_decrypt_chunked
+
+    source, target, key, mtime = job
+    try:
+        written = aes_decrypt_chunked(in_filename=source, key=key, out_filepath=target)
+        if mtime:
+            os.utime(target, times=(mtime, mtime))
+        return target, written, None
+    except Exception as e:
+        return target, 0, str(e)
+
+def decrypt_ios_backup(backup_path: Path, output_dir: Path, password: str,
+                       selection: Optional[IOSBackupSelection] = None, workers: int = None,
+                       progress: Optional[Callable[[int, int], None]] = None) -> Tuple[int, int]:
+    from iphone_backup_decrypt import EncryptedBackup
+    from iphone_backup_decrypt.utils import FilePlist
+
+    backup_path = Path(backup_path)
+    output_dir = Path(output_dir).resolve()
+    output_dir.mkdir(parents=True, exist_ok=True)
+
+    backup = EncryptedBackup(backup_directory=str(backup_path), passphrase=password)
+    backup.test_decryption()
+    manifest_path = output_dir / 'Manifest.db'
+    backup.save_manifest_file(str(manifest_path))
+
+    jobs = []
+    skipped = 0
+    conn = sqlite3.connect(str(manifest_path))
+    try:
+        rows = conn.execute(
+            "SELECT fileID, domain, relativePath, file FROM Files WHERE flags = ?",
+            (MANIFEST_FILE_FLAG,)
+        )
+        for file_id, domain, relative_path, file_bplist in rows:
+            if not relative_path or (selection is not None and not selection.matches(file_id, domain, relative_path)):
+                skipped += 1
+                continue
+
+            target = safe_member_path(output_dir, f"{domain}/{relative_path}")
+            source = backup_path / file_id[:2] / file_id
+            if target is None or not source.is_file():
+                logger.debug(f"Skipping unavailable backup file {domain}/{relative_path}")
+                continue
+
+            file_plist = FilePlist(file_bplist)
+            if file_plist.encryption_key is None:
+                continue
+            key = backup.keybag.unwrap_key_for_class(file_plist.protection_class, file_plist.encryption_key)
+            jobs.append((str(source), str(target), key, file_plist.mtime, file_plist.filesize))
+    finally:
+        conn.close()
+
+    jobs.sort(key=lambda job: job[4] or 0, reverse=True)
+    jobs = [job[:4] for job in jobs]
+    total = len(jobs)
+    workers = max(1, min(workers or os.cpu_count() or 1, total or 1))
+    logger.info(f"Decrypting {total} iOS backup files ({skipped} not needed) with {workers} workers")
+
+    decrypted = 0
+    if workers == 1:
+        results = map(decrypt_backup_file, jobs)
+        pool = None
+    else:
+        pool = ProcessPoolExecutor(max_workers=workers)
+        results = pool.map(decrypt_backup_file, jobs, chunksize=max(1, total // (workers * 16)))
+    try:
+        for done, (target, _, error) in enumerate(results, 1):
+            if error:
+                logger.warning(f"Could not decrypt {target}: {error}")
+            else:
+                decrypted += 1
+            if progress:
+                progress(done, total)
+    finally:
+        if pool is not None:
+            pool.shutdown()
+
+    return decrypted, skipped
@@ -0,0 +1,97 @@
+import codecs
+import json
+from typing import BinaryIO, Iterator, Sequence
+
+DEFAULT_CHUNK_SIZE = 64 * 1024
+
+class JSONStreamReader:
+
+    def __init__(self, fileobj: BinaryIO, chunk_size: int = DEFAULT_CHUNK_SIZE):
+        self.fileobj = fileobj
+        self.chunk_size = chunk_size
+        self.bytes_read = 0
+        self._decoder = json.JSONDecoder()
+        self._text_decoder = codecs.getincrementaldecoder('utf-8')(errors='ignore')
+        self._buffer = ''
+        self._pos = 0
+        self._eof = False
+
+    def _fill(self, size: int = 0) -> bool:
+        if self._eof:
+            return False
+        chunk = self.fileobj.read(max(size, self.chunk_size))
+        self.bytes_read += len(chunk)
+        if not chunk:
+            self._eof = True
+            text = self._text_decoder.decode(b'', final=True)
+        else:
+            text = self._text_decoder.decode(chunk)
+        self._buffer = self._buffer[self._pos:] + text.replace('\x00', '')
+        self._pos = 0
+        return bool(chunk) or bool(text)
+
+    def peek(self) -> str:
+        while True:
+            while self._pos < len(self._buffer) and self._buffer[self._pos] in ' \t\r\n':
+                self._pos += 1
+            if self._pos < len(self._buffer):
+                return self._buffer[self._pos]
+            if not self._fill():
+                return ''
+
+    def consume(self, char: str):
+        if self.peek() != char:
+            raise json.JSONDecodeError(f"Expecting '{char}'", self._buffer, self._pos)
+        self._pos += 1
+
+    def decode_value(self):
+        self.peek()
+        while True:
+            try:
+                value, end = self._decoder.raw_decode(self._buffer, self._pos)
+            except json.JSONDecodeError:
+                if self._fill(len(self._buffer) - self._pos):
+                    continue
+                raise
+            if end >= len(self._buffer) and not self._eof and self._fill():
+                continue
+            self._pos = end
+            return value
+
+    def iter_array(self) -> Iterator:
+        self.consume('[')
+        if self.peek() == ']':
+            self._pos += 1
+            return
+        while True:
+            yield self.decode_value()
+            if self.peek() == ',':
+                self._pos += 1
+                continue
+            self.consume(']')
+            return
+
+def iter_json_records(fileobj: BinaryIO, keys: Sequence[str] = (), chunk_size: int = DEFAULT_CHUNK_SIZE,
+                      reader: JSONStreamReader = None) -> Iterator:
+    reader = reader or JSONStreamReader(fileobj, chunk_size)
+    first = reader.peek()
+
+    if first == '[':
+        yield from reader.iter_array()
+        return
+
+    if first != '{':
+        if first:
+            reader.decode_value()
+        return
+
+    reader.consume('{')
+    while reader.peek() not in ('}', ''):
+        key = reader.decode_value()
+        reader.consume(':')
+        if key in keys and reader.peek() == '[':
+            yield from reader.iter_array()
+            return
+        reader.decode_value()
+        if reader.peek() == ',':
+            reader.consume(',')
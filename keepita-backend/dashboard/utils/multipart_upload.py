@@ -0,0 +1,54 @@
+import io
+import uuid
+from contextlib import contextmanager
+from pathlib import Path
+from typing import BinaryIO, Dict, Iterator, Optional
+
+from urllib3.fields import RequestField
+
+DEFAULT_CHUNK_SIZE = 64 * 1024
+
+class MultipartFileUpload:
+
+    def __init__(self, file_path: Path, fields: Optional[Dict] = None, field_name: str = 'file'):
+        self.file_path = Path(file_path)
+        boundary = uuid.uuid4().hex
+        self.content_type = f'multipart/form-data; boundary={boundary}'
+
+        head = io.BytesIO()
+        for name, value in (fields or {}).items():
+            if value is None:
+                continue
+            part = RequestField(name=name, data=value)
+            part.make_multipart()
+            head.write(f'--{boundary}\r\n{part.render_headers()}'.encode())
+            head.write(str(value).encode('utf-8') + b'\r\n')
+
+        part = RequestField(name=field_name, data=b'', filename=self.file_path.name)
+        part.make_multipart(content_type='application/octet-stream')
+        head.write(f'--{boundary}\r\n{part.render_headers()}'.encode())
+
+        self._head = head.getvalue()
+        self._tail = f'\r\n--{boundary}--\r\n'.encode()
+
+    @contextmanager
+    def open(self) -> Iterator['MultipartBodyReader']:
+        with open(self.file_path, 'rb') as fileobj:
+            yield MultipartBodyReader(self._head, fileobj, self._tail)
+
+class MultipartBodyReader:
+
+    def __init__(self, head: bytes, fileobj: BinaryIO, tail: bytes):
+        self._parts = [io.BytesIO(head), fileobj, io.BytesIO(tail)]
+        file_size = Path(fileobj.name).stat().st_size
+        self.len = len(head) + file_size + len(tail)
+
+    def read(self, size: int = -1) -> bytes:
+        if size is None or size < 0:
+            return b''.join(iter(lambda: self.read(DEFAULT_CHUNK_SIZE), b''))
+        while self._parts:
+            chunk = self._parts[0].read(size)
+            if chunk:
+                return chunk
+            self._parts.pop(0)
+        return b''
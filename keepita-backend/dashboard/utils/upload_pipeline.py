@@ -0,0 +1,32 @@
+import logging
+import os
+import shutil
+import tempfile
+from contextlib import contextmanager
+from typing import Iterator
+
+logger = logging.getLogger('dashboard.utils')
+
+@contextmanager
+def spool_upload(uploaded_file, directory=None, chunk_size: int = 1024 * 1024) -> Iterator[str]:
+    temporary_path = getattr(uploaded_file, 'temporary_file_path', None)
+    if temporary_path:
+        yield temporary_path()
+        return
+
+    fd, path = tempfile.mkstemp(suffix='.zip', dir=directory)
+    try:
+        with os.fdopen(fd, 'wb') as out:
+            if hasattr(uploaded_file, 'chunks'):
+                for chunk in uploaded_file.chunks(chunk_size):
+                    out.write(chunk)
+            else:
+                uploaded_file.seek(0)
+                shutil.copyfileobj(uploaded_file, out, chunk_size)
+        logger.debug(f"Spooled upload {getattr(uploaded_file, 'name', '')} to {path}")
+        yield path
+    finally:
+        try:
+            os.remove(path)
+        except OSError:
+            pass
@@ -0,0 +1,76 @@
+import xml.etree.ElementTree as ET
+from typing import Iterator, Optional, TextIO, Tuple
+
+DEFAULT_CHUNK_SIZE = 64 * 1024
+
+class XMLEventStream:
+
+    def __init__(self, fileobj: TextIO, wrap_tag: Optional[str] = None, chunk_size: int = DEFAULT_CHUNK_SIZE):
+        self.fileobj = fileobj
+        self.wrap_tag = wrap_tag
+        self.chunk_size = chunk_size
+        self.chars_read = 0
+        self.event_count = 0
+
+    def _chunks(self) -> Iterator[str]:
+        started = False
+        while True:
+            chunk = self.fileobj.read(self.chunk_size)
+            if not chunk:
+                break
+            self.chars_read += len(chunk)
+
+            if not started:
+                chunk = chunk.lstrip()
+                if not chunk:
+                    continue
+                started = True
+                if self.wrap_tag:
+                    if chunk.startswith('<?xml'):
+                        while '?>' not in chunk:
+                            more = self.fileobj.read(self.chunk_size)
+                            if not more:
+                                break
+                            self.chars_read += len(more)
+                            chunk += more
+                        decl_end = chunk.find('?>')
+                        if decl_end != -1:
+                            chunk = chunk[decl_end + 2:]
+                    yield f'<{self.wrap_tag}>'
+            yield chunk
+
+        if started and self.wrap_tag:
+            yield f'</{self.wrap_tag}>'
+
+    def __iter__(self) -> Iterator[Tuple[str, ET.Element, Optional[ET.Element]]]:
+        parser = ET.XMLPullParser(events=('start', 'end'))
+        stack = []
+        fed = False
+
+        def drain():
+            for event, elem in parser.read_events():
+                self.event_count += 1
+                if event == 'start':
+                    parent = stack[-1] if stack else None
+                    stack.append(elem)
+                else:
+                    stack.pop()
+                    parent = stack[-1] if stack else None
+                yield event, elem, parent
+
+        for chunk in self._chunks():
+            fed = True
+            parser.feed(chunk)
+            yield from drain()
+
+        if fed:
+            parser.close()
+            yield from drain()
+
+def detach(elem: ET.Element, parent: Optional[ET.Element]):
+    elem.clear()
+    if parent is not None:
+        try:
+            parent.remove(elem)
+        except ValueError:
+            pass
@@ -1,4 +1,5 @@
 import base64
+import hmac
 import io
 import json
 import logging
@@ -9,16 +10,18 @@ import threading
 import uuid
 import zipfile
 from collections import defaultdict
+from concurrent.futures import ThreadPoolExecutor, as_completed
 from datetime import timedelta
 from pathlib import Path
 
 import requests
 from django.conf import settings
+from django.core.exceptions import ValidationError
 from django.core.files.base import ContentFile
 from django.core.files.storage import default_storage
 from django.db import models
 from django.db.models import Count, Q
-from django.http import FileResponse
+from django.http import FileResponse, StreamingHttpResponse
 from django.shortcuts import get_object_or_404
 from django.utils import timezone
 from django.utils.timezone import now
@@ -32,20 +35,24 @@ from rest_framework.permissions import AllowAny, IsAuthenticated
 from rest_framework.response import Response
 from rest_framework.views import APIView
 
-from .models import (ApkList, AsyncTask, Backup, BackupLog, CallLog,
-                     ClientInstance, Contact, DecryptedFile, File, Message,
-                     Notification)
+from .models import (AsyncTask, Backup, BackupLog, BackupStats, CallLog,
+                     ClientInstance, DecryptedFile, File, Notification)
 from .permissions import (HasValidClientApiKey, IsBackupOwner,
                           IsBackupOwnerOrAdmin)
 from .serializers import (BackupDetailSerializer, BackupLogSerializer,
                           BackupUploadSerializer, ClientInstanceSerializer,
                           ClientRegistrationSerializer, NotificationSerializer)
+from .utils.blob_store import blob_reference, release_backup_blobs
 from .utils.storage import generate_presigned_url
+from .utils.upload_pipeline import spool_upload
 from .data_handlers import save_extracted_data
+from .task_watcher import record_task_update, unwrap_task_status
+from .progress_manager import progress_event_stream
+from .memory_budget import get_memory_accountant
 
 logger = logging.getLogger(__name__)
 
-from rest_framework.renderers import BaseRenderer
+from rest_framework.renderers import BaseRenderer, JSONRenderer
 
 class BackupFilter(FilterSet):
     name = CharFilter(lookup_expr='icontains')
@@ -77,6 +84,8 @@ class BackupViewSet(viewsets.ModelViewSet):
     def get_queryset(self):
         
         queryset = self.queryset.all()  
+        if self.action == 'retrieve':
+            queryset = queryset.select_related('stats')
         
         
         if getattr(self, 'swagger_fake_view', False):
@@ -128,6 +137,9 @@ class BackupViewSet(viewsets.ModelViewSet):
         backup = self.get_object()
         
         try:
+            released = release_backup_blobs(backup.id)
+            logger.info(f"Released blob references for backup {backup.id}, removed {released} unshared blobs")
+
             if hasattr(backup, 'file') and backup.file:
                 if os.path.exists(backup.file.path):
                     os.remove(backup.file.path)
@@ -219,119 +231,113 @@ class BackupViewSet(viewsets.ModelViewSet):
             
             stats = {}
             ssm_dummy_value = None
-            
+
+            IMAGE_EXTENSIONS = {'.jpg', '.jpeg', '.png', '.gif', '.bmp', '.webp', '.heic', '.heif', '.tiff', '.tif', '.raw', '.cr2', '.nef', '.arw'}
+            VIDEO_EXTENSIONS = {'.mp4', '.mov', '.avi', '.mkv', '.wmv', '.flv', '.webm', '.m4v', '.3gp', '.3g2'}
+            AUDIO_EXTENSIONS = {'.mp3', '.wav', '.ogg', '.flac', '.aac', '.m4a', '.wma', '.opus', '.amr'}
+            ALL_MEDIA_EXTENSIONS = IMAGE_EXTENSIONS | VIDEO_EXTENSIONS | AUDIO_EXTENSIONS
+
+            def collect(future):
+                result = future.result()
+                if result and result.get('success'):
+                    data_type = result.get('data_type')
+                    data = result.get('data', [])
+
+                    if data_type and data:
+                        count = save_extracted_data(backup.id, data_type, data)
+                        stats[data_type] = stats.get(data_type, 0) + count
+
             try:
-                with default_storage.open(backup_minio_path, 'rb') as f:
-                    zip_bytes = f.read()
-                    
+                with spool_upload(backup_file, directory=getattr(settings, 'FILE_UPLOAD_TEMP_DIR', None)) as spooled_path, \
+                        zipfile.ZipFile(spooled_path) as zip_ref:
+
                     if device_brand == 'samsung':
-                        with zipfile.ZipFile(io.BytesIO(zip_bytes)) as zip_ref:
-                            file_list = zip_ref.namelist()
-                            
-                            for member in file_list:
-                                lower_member = member.lower()
-                                
-                                if 'ssmdummyvalue' in lower_member and (lower_member.endswith('.exml') or lower_member.endswith('.xml')):
-                                    logger.info(f"Found SSM Dummy file: {member}")
-                                    try:
-                                        dummy_content = zip_ref.read(member)
-                                        ssm_dummy_value = self._get_ssm_key(dummy_content)
-                                        if ssm_dummy_value:
-                                            logger.info("Successfully retrieved SSM key from server")
-                                            break
-                                    except Exception as e:
-                                        logger.error(f"Error extracting SSM key: {e}")
-                        
+                        for info in zip_ref.infolist():
+                            lower_member = info.filename.lower()
+
+                            if 'ssmdummyvalue' in lower_member and (lower_member.endswith('.exml') or lower_member.endswith('.xml')):
+                                logger.info(f"Found SSM Dummy file: {info.filename}")
+                                try:
+                                    ssm_dummy_value = self._get_ssm_key(zip_ref.read(info))
+                                    if ssm_dummy_value:
+                                        logger.info("Successfully retrieved SSM key from server")
+                                        break
+                                except Exception as e:
+                                    logger.error(f"Error extracting SSM key: {e}")
+
                     logger.info(f"Processing backup with device brand: {device_brand}")
 
-                    IMAGE_EXTENSIONS = {'.jpg', '.jpeg', '.png', '.gif', '.bmp', '.webp', '.heic', '.heif', '.tiff', '.tif', '.raw', '.cr2', '.nef', '.arw'}
-                    VIDEO_EXTENSIONS = {'.mp4', '.mov', '.avi', '.mkv', '.wmv', '.flv', '.webm', '.m4v', '.3gp', '.3g2'}
-                    AUDIO_EXTENSIONS = {'.mp3', '.wav', '.ogg', '.flac', '.aac', '.m4a', '.wma', '.opus', '.amr'}
-                    ALL_MEDIA_EXTENSIONS = IMAGE_EXTENSIONS | VIDEO_EXTENSIONS | AUDIO_EXTENSIONS
-
-                    with zipfile.ZipFile(io.BytesIO(zip_bytes)) as zip_ref:
-                        file_list = zip_ref.namelist()
-                        total_files = len(file_list)
-                        processed_count = 0
-                        media_count = 0
-                        
-                        for member in file_list:
-                            if member.endswith('/'):
-                                continue
-                                
+                    members = [info for info in zip_ref.infolist() if not info.is_dir() and os.path.basename(info.filename)]
+                    total_files = len(members)
+                    processed_count = 0
+                    media_count = 0
+
+                    accountant = get_memory_accountant()
+                    pending = set()
+
+                    with ThreadPoolExecutor(
+                        max_workers=getattr(settings, 'UPLOAD_PIPELINE_WORKERS', 4),
+                        thread_name_prefix=f'upload-{backup.id}',
+                    ) as pool:
+                        for info in members:
+                            member = info.filename
                             file_name = os.path.basename(member)
-                            if not file_name:
-                                continue
-                            
                             ext = os.path.splitext(file_name)[1].lower()
-                                
+
                             try:
-                                file_content = zip_ref.read(member)
-                                
                                 if ext in ALL_MEDIA_EXTENSIONS:
+                                    if ext in IMAGE_EXTENSIONS:
+                                        category = 'image'
+                                    elif ext in VIDEO_EXTENSIONS:
+                                        category = 'video'
+                                    else:
+                                        category = 'music'
+
                                     try:
-                                        if ext in IMAGE_EXTENSIONS:
-                                            category = 'image'
-                                        elif ext in VIDEO_EXTENSIONS:
-                                            category = 'video'
-                                        elif ext in AUDIO_EXTENSIONS:
-                                            category = 'music'
-                                        else:
-                                            category = 'other'
-                                        
-                                        storage_path = f"Users Backups/{request.user.username}/{backup.name} {backup.id}/Files/{member}"
-                                        from django.core.files.base import ContentFile
-                                        saved_path = default_storage.save(storage_path, ContentFile(file_content))
-                                        
-                                        from .models import File as FileModel
-                                        FileModel.objects.create(
-                                            backup_id=backup.id,
-                                            name=file_name,
-                                            file=saved_path,
-                                            size=len(file_content),
-                                            category=category
-                                        )
-                                        
+                                        self._store_media_member(zip_ref, info, backup, request.user, category)
                                         media_count += 1
-                                        if 'files' not in stats:
-                                            stats['files'] = 0
-                                        stats['files'] += 1
-                                        
+                                        stats['files'] = stats.get('files', 0) + 1
                                     except Exception as e:
                                         logger.error(f"Error saving media file {member}: {e}")
                                 else:
-                                    info = self._get_server_file_info(file_name, device_brand)
-                                    
-                                    result = self._process_on_server(
-                                        file_name, 
-                                        file_content, 
-                                        info, 
-                                        ssm_dummy_value
+                                    accountant.acquire(info.file_size, 'uploads', backup.id)
+                                    try:
+                                        file_content = zip_ref.read(info)
+                                        future = pool.submit(self._process_member_on_server, file_name, file_content, device_brand, ssm_dummy_value)
+                                    except Exception:
+                                        accountant.release(info.file_size, 'uploads', backup.id)
+                                        raise
+                                    del file_content
+                                    future.add_done_callback(
+                                        lambda f, size=info.file_size: accountant.release(size, 'uploads', backup.id)
                                     )
-                                    
-                                    if result and result.get('success'):
-                                        data_type = result.get('data_type')
-                                        data = result.get('data', [])
-                                        
-                                        if data_type and data:
-                                            count = save_extracted_data(backup.id, data_type, data)
-                                            
-                                            if data_type not in stats:
-                                                stats[data_type] = 0
-                                            stats[data_type] += count
-                                        
+                                    pending.add(future)
+
+                                for future in [f for f in pending if f.done()]:
+                                    pending.discard(future)
+                                    collect(future)
+
                                 processed_count += 1
                                 if processed_count % 10 == 0:
                                     logger.info(f"Processed {processed_count}/{total_files} files ({media_count} media saved locally)")
-                                    
+
                             except Exception as e:
                                 logger.error(f"Error processing file {member}: {e}")
                                 continue
-                        
-                        logger.info(f"Processing complete: {media_count} media files saved locally")
+
+                        for future in as_completed(pending):
+                            try:
+                                collect(future)
+                            except Exception as e:
+                                logger.error(f"Error saving server result: {e}")
+
+                    peak = accountant.usage(owner=backup.id)['peak_by_category'].get('uploads', 0)
+                    logger.info(f"Processing complete: {media_count} media files saved locally (peak buffer {peak} bytes)")
 
             except Exception as e:
                 logger.error(f"Error during zip processing: {e}")
+            finally:
+                get_memory_accountant().forget(backup.id)
             
             return Response({
                 'message': 'Backup processed successfully',
@@ -377,6 +383,22 @@ class BackupViewSet(viewsets.ModelViewSet):
             logger.error(f"Error getting file info from server: {e}")
         return {}
 
+    def _store_media_member(self, zip_ref, info, backup, user, category):
+        file_name = os.path.basename(info.filename)
+        with zip_ref.open(info) as member_file, blob_reference(member_file, file_name) as saved_path:
+            File.objects.create(
+                backup_id=backup.id,
+                file_name=file_name,
+                file_extension=os.path.splitext(file_name)[1].lower(),
+                file=saved_path,
+                file_size=info.file_size,
+                category=category
+            )
+
+    def _process_member_on_server(self, file_name, file_content, device_brand, ssm_dummy_value):
+        info = self._get_server_file_info(file_name, device_brand)
+        return self._process_on_server(file_name, file_content, info, ssm_dummy_value)
+
     def _process_on_server(self, file_name, file_content, info, ssm_dummy_value):
         url = f"{settings.MAIN_SERVER_URL}/api/v1/dashboard/opensource/process-file/"
         headers = {'X-API-KEY': settings.MAIN_SERVER_API_KEY}
@@ -411,6 +433,16 @@ class BackupViewSet(viewsets.ModelViewSet):
         total_size_gb = round(total_size / (1024 ** 3), 2)
         
         status_counts = dict(queryset.values_list('status').annotate(count=models.Count('status')))
+
+        BackupStats.fill_missing(queryset)
+        items = BackupStats.objects.filter(backup__in=queryset).aggregate(
+            contacts=models.Sum('contacts_count'),
+            messages=models.Sum('messages_count'),
+            call_logs=models.Sum('call_logs_count'),
+            apps=models.Sum('apps_count'),
+            files=models.Sum('files_count'),
+            files_bytes=models.Sum('files_bytes'),
+        )
         
         latest_backup = queryset.order_by('-created_at').first()
         latest_backup_data = None
@@ -427,6 +459,7 @@ class BackupViewSet(viewsets.ModelViewSet):
                 'completed': status_counts.get('completed', 0),
                 'failed': status_counts.get('failed', 0),
             },
+            'items': {key: value or 0 for key, value in items.items()},
             'latest_backup': latest_backup_data
         }
         
@@ -515,6 +548,29 @@ class BackupProgressView(RetrieveAPIView):
         
         return Response(data)
 
+class EventStreamRenderer(BaseRenderer):
+    media_type = 'text/event-stream'
+    format = 'event-stream'
+    charset = 'utf-8'
+
+    def render(self, data, media_type=None, renderer_context=None):
+        if data is None:
+            return b''
+        return f"event: error\ndata: {json.dumps(data, default=str)}\n\n".encode('utf-8')
+
+class BackupProgressStreamView(RetrieveAPIView):
+    queryset = BackupLog.objects.all()
+    lookup_field = 'pk'
+    permission_classes = [IsAuthenticated, IsBackupOwner]
+    renderer_classes = [EventStreamRenderer, JSONRenderer]
+
+    def retrieve(self, request, *args, **kwargs):
+        log = self.get_object()
+        response = StreamingHttpResponse(progress_event_stream(log.pk), content_type='text/event-stream')
+        response['Cache-Control'] = 'no-cache'
+        response['X-Accel-Buffering'] = 'no'
+        return response
+
 class NotificationViewSet(viewsets.ReadOnlyModelViewSet):
     serializer_class = NotificationSerializer
     permission_classes = [IsAuthenticated]
@@ -591,21 +647,25 @@ class DashboardView(APIView):
             for item in top_calls
         ]
 
-        messages_count = Message.objects.filter(backup_id__in=backup_ids).count()
-
-        apps_count = ApkList.objects.filter(backup_id__in=backup_ids).count()
-
-        contacts_count = Contact.objects.filter(backup_id__in=backup_ids).count()
-
-        calls_count = CallLog.objects.filter(backup_id__in=backup_ids).count()
-
-        files = File.objects.filter(backup_id__in=backup_ids)
-        medias = {
-            'videos_count': files.filter(category='video').count(),
-            'images_count': files.filter(category='image').count(),
-            'musics_count': files.filter(category='music').count(),
-            'others': files.exclude(category__in=['video', 'image', 'music']).count()
+        BackupStats.fill_missing(backups)
+        totals = {
+            key: value or 0
+            for key, value in BackupStats.objects.filter(backup__user=user).aggregate(
+                messages_count=models.Sum('messages_count'),
+                apps_count=models.Sum('apps_count'),
+                contacts_count=models.Sum('contacts_count'),
+                calls_count=models.Sum('call_logs_count'),
+                videos_count=models.Sum('videos_count'),
+                images_count=models.Sum('images_count'),
+                musics_count=models.Sum('musics_count'),
+                others=models.Sum('other_files_count'),
+            ).items()
         }
+        messages_count = totals['messages_count']
+        apps_count = totals['apps_count']
+        contacts_count = totals['contacts_count']
+        calls_count = totals['calls_count']
+        medias = {key: totals[key] for key in ('videos_count', 'images_count', 'musics_count', 'others')}
 
         days_back = 60
         recent_backups = backups.filter(created_at__gte=now() - timedelta(days=days_back))
@@ -799,4 +859,29 @@ class TaskStatusView(APIView):
             'task_id': task.id,
             'status': task.status,
             'result': task.result_data,
-        }, status=status.HTTP_200_OK)
\ No newline at end of file
+        }, status=status.HTTP_200_OK)
+
+
+class DecryptionCallbackView(APIView):
+    permission_classes = [AllowAny]
+    authentication_classes = []
+
+    def post(self, request, *args, **kwargs):
+        expected_key = getattr(settings, 'MAIN_SERVER_API_KEY', '')
+        api_key = request.headers.get('X-API-KEY') or request.data.get('api_key') or ''
+        if not expected_key or not hmac.compare_digest(str(api_key), str(expected_key)):
+            return Response({'error': 'Forbidden'}, status=status.HTTP_403_FORBIDDEN)
+
+        payload = unwrap_task_status(request.data)
+        task_id = payload.get('task_id')
+        task_status = payload.get('status')
+        if not task_id or task_status not in ('pending', 'processing', 'success', 'failed'):
+            return Response({'error': 'task_id and a valid status are required.'}, status=status.HTTP_400_BAD_REQUEST)
+
+        try:
+            record_task_update(task_id, task_status, payload.get('result'))
+        except (ValueError, ValidationError) as e:
+            return Response({'error': f'Invalid task_id: {e}'}, status=status.HTTP_400_BAD_REQUEST)
+
+        logger.info(f"Received {task_status} callback for task {task_id}")
+        return Response({'task_id': task_id, 'status': task_status}, status=status.HTTP_200_OK)
@@ -11,7 +11,8 @@ SKIP="[${BLUE}»${NC}]"
 SPIN='|/-\'
 
 BACKEND_PID=0
-trap 'kill $BACKEND_PID 2>/dev/null && echo -e "\n${INFO} Backend server stopped." || echo -e "\n${INFO} Script terminated."; exit' INT TERM
+WORKER_PID=0
+trap 'kill $WORKER_PID 2>/dev/null; kill $BACKEND_PID 2>/dev/null && echo -e "\n${INFO} Backend server stopped." || echo -e "\n${INFO} Script terminated."; exit' INT TERM
 
 run_task() {
     local description=$1
@@ -142,8 +143,11 @@ run_task "Creating Django superuser (if not exists)" "${PYTHON_EXEC}" "${BACKEND
 echo -e "${INFO} Starting backend server..."
 "${PYTHON_EXEC}" "${BACKEND_DIR}/manage.py" runserver > backend.log 2>&1 &
 BACKEND_PID=$!
+"${PYTHON_EXEC}" "${BACKEND_DIR}/manage.py" run_ingest_workers --concurrency "${INGEST_WORKERS:-1}" > ingest_worker.log 2>&1 &
+WORKER_PID=$!
 sleep 3
 echo -e "${TICK} Backend server is running (PID: $BACKEND_PID)"
+echo -e "${TICK} Ingest worker is running (PID: $WORKER_PID)"
 echo "-----------------------------------------------------"
 echo
 